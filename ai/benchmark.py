@@ -0,0 +1,521 @@
+"""
+Benchmark - Reproducible throughput/latency benchmarks for TalentFinderAI.
+
+Measures the hot paths (parse_resume, extract_skills, match_candidate_to_job,
+find_top_candidates, summarize_profile) on synthetic resumes and job
+descriptions, and reports latency percentiles, throughput and memory
+growth per API as a table and as JSON, so runs can be compared for
+regressions. Memory is the current RSS sampled while each API runs, so
+an API's figure is not inflated by the APIs measured before it.
+
+By default every call is cold: the finder's caches (features,
+tokenizations, summaries) are cleared before each call, untimed. With
+--warm they are cleared once per API, so the warmup call fills them and
+the timed calls measure the cached path.
+
+With --stub-models, the transformer models are replaced by tiny
+deterministic stand-ins, so the harness runs offline on a CPU-only box and
+measures everything except model inference.
+
+Usage:
+    python benchmark.py --stub-models --profiles 2000 --output results.json
+    python benchmark.py --apis match_candidate_to_job,find_top_candidates --compare results.json
+    python benchmark.py --stub-models --feature-cache --warm
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from skill_matcher import load_default_taxonomy
+
+
+APIS = ("parse_resume", "extract_skills", "match_candidate_to_job", "find_top_candidates", "summarize_profile")
+
+FIRST_NAMES = ["John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Olga", "James", "Fatima", "Kenji"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Khan", "Silva", "Patel", "Ivanova", "Brown", "Ali", "Tanaka"]
+COMPANIES = ["Google", "Microsoft", "Amazon", "Lockheed Martin", "Accenture", "Stripe", "IBM", "Oracle", "Raytheon", "Deloitte"]
+LOCATIONS = ["Washington", "Austin", "Seattle", "New York", "Denver", "Boston", "London", "Toronto"]
+TITLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Engineering Manager", "Security Analyst", "Full Stack Developer"]
+FILLER = ("designed built maintained scalable services for internal and external customers improved "
+          "latency reliability and cost across teams mentored engineers led migrations owned roadmap "
+          "delivered features shipped releases collaborated with product design and operations").split()
+
+
+def generate_resume(rng: random.Random, words: int = 300) -> str:
+    """
+    Generate a synthetic resume of roughly ``words`` words.
+    
+    Args:
+        rng: Random generator (seeded for reproducibility)
+        words: Approximate length in words
+    
+    Returns:
+        Resume text with a name, experience, skills and education sections
+    """
+    skills = rng.sample(load_default_taxonomy().canonical_names, 8)
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"{rng.choice(TITLES)} based in {rng.choice(LOCATIONS)}",
+        "Experience"
+    ]
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        sentence = f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}: " + " ".join(rng.choice(FILLER) for _ in range(12)) + f" using {rng.choice(skills)}."
+        lines.append(sentence)
+        count += len(sentence.split())
+    lines.append("Skills: " + ", ".join(skills))
+    lines.append(f"Education: B.S. Computer Science, University of {rng.choice(LOCATIONS)}")
+    return "\n".join(lines)
+
+
+def generate_job(rng: random.Random, skills: int = 6) -> str:
+    """
+    Generate a synthetic job description.
+    
+    Args:
+        rng: Random generator (seeded for reproducibility)
+        skills: Number of required skills
+    
+    Returns:
+        Job description text
+    """
+    required = rng.sample(load_default_taxonomy().canonical_names, skills)
+    return (f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} in {rng.choice(LOCATIONS)}. "
+            f"Required: {', '.join(required)}. " + " ".join(rng.choice(FILLER) for _ in range(30)) + ".")
+
+
+class _StubEncoding(dict):
+    """Tokenizer output for one text or a batch, with the word_ids() accessor."""
+    
+    def __init__(self, data: Dict, word_ids: List[List[Optional[int]]]):
+        super().__init__(data)
+        self._word_ids = word_ids
+    
+    def word_ids(self, row: int = 0) -> List[Optional[int]]:
+        return self._word_ids[row]
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the subset of the HF tokenizer API used here."""
+    
+    is_fast = True
+    model_max_length = 512
+    model_input_names = ["input_ids", "attention_mask"]
+    padding_side = "right"
+    vocab_size = 30000
+    pad_token_id = 0
+    cls_token_id = 1
+    sep_token_id = 2
+    
+    def num_special_tokens_to_add(self) -> int:
+        return 2
+    
+    def token_id(self, word: str) -> int:
+        """Hashed, case-insensitive vocabulary id of a word."""
+        return 3 + int(hashlib.md5(word.lower().encode("utf-8")).hexdigest()[:8], 16) % (self.vocab_size - 3)
+    
+    def _encode(self, text: str, add_special_tokens: bool, truncation: bool, max_length: Optional[int]) -> tuple:
+        offsets = []
+        position = 0
+        for word in text.split():
+            start = text.index(word, position)
+            position = start + len(word)
+            offsets.append((start, position))
+        if truncation:
+            limit = (max_length or self.model_max_length) - (self.num_special_tokens_to_add() if add_special_tokens else 0)
+            offsets = offsets[:max(limit, 0)]
+        
+        input_ids = [self.token_id(text[start:end]) for start, end in offsets]
+        word_ids = list(range(len(offsets)))
+        if add_special_tokens:
+            input_ids = [self.cls_token_id] + input_ids + [self.sep_token_id]
+            offsets = [(0, 0)] + offsets + [(0, 0)]
+            word_ids = [None] + word_ids + [None]
+        return input_ids, offsets, word_ids
+    
+    def __call__(self, texts, add_special_tokens: bool = True, truncation: bool = False, max_length: Optional[int] = None, return_offsets_mapping: bool = False, **kwargs) -> _StubEncoding:
+        rows = [self._encode(text, add_special_tokens, truncation, max_length) for text in ([texts] if isinstance(texts, str) else texts)]
+        data = {
+            "input_ids": [input_ids for input_ids, _, _ in rows],
+            "attention_mask": [[1] * len(input_ids) for input_ids, _, _ in rows]
+        }
+        if return_offsets_mapping:
+            data["offset_mapping"] = [offsets for _, offsets, _ in rows]
+        if isinstance(texts, str):
+            data = {name: values[0] for name, values in data.items()}
+        return _StubEncoding(data, [word_ids for _, _, word_ids in rows])
+
+
+class StubNER:
+    """Stand-in for the HF NER pipeline: capitalized words become entities."""
+    
+    class _Config:
+        max_position_embeddings = 512
+    
+    class _Model:
+        pass
+    
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.model = self._Model()
+        self.model.config = self._Config()
+    
+    def _entities(self, text: str) -> List[Dict]:
+        entities = []
+        groups = ("PER", "ORG", "LOC")
+        for start, end in self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]:
+            word = text[start:end].strip(".,:;")
+            if word[:1].isupper():
+                group = groups[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % 3]
+                entities.append({"entity_group": group, "word": word, "score": 0.9, "start": start, "end": start + len(word)})
+        return entities
+    
+    def __call__(self, texts, batch_size: int = 1, **kwargs):
+        if isinstance(texts, str):
+            return self._entities(texts)
+        return [self._entities(text) for text in texts]
+
+
+class StubSentenceModel:
+    """Stand-in for SentenceTransformer: normalized hashed bag-of-words vectors."""
+    
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.tokenizer = StubTokenizer()
+        self.max_seq_length = 256
+        self.device = "cpu"
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+    
+    def _embed_ids(self, input_ids: List[int]) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in input_ids:
+            if token > self.tokenizer.sep_token_id:
+                vector[token % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _embed(self, text: str) -> np.ndarray:
+        return self._embed_ids(self.tokenizer(text, truncation=True, max_length=self.max_seq_length)["input_ids"])
+    
+    def __call__(self, features: Dict) -> Dict:
+        # Forward pass over a padded batch from the tokenization cache (padding is id 0)
+        vectors = np.stack([self._embed_ids(row) for row in features["input_ids"].tolist()])
+        return {"sentence_embedding": torch.from_numpy(vectors)}
+    
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self._embed(sentences)
+        return np.stack([self._embed(text) for text in sentences]) if len(sentences) else np.zeros((0, self.dim), dtype=np.float32)
+
+
+def install_stub_models(finder):
+    """
+    Replace a TalentFinderAI's models with the offline stand-ins.
+    
+    The summarizer is marked unavailable, so summarize_profile measures its
+    extraction-based fallback.
+    
+    Args:
+        finder: TalentFinderAI instance
+    """
+    finder.ner = StubNER()
+    finder.similarity_model = StubSentenceModel()
+    finder._models["summarizer"] = {"tokenizer": None, "model": None}
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler:
+    """
+    Samples the current RSS on a background thread while a block runs.
+    
+    ru_maxrss is the peak over the whole process lifetime, so it cannot
+    tell one API's memory from the APIs run before it; the sampled
+    current RSS can.
+    
+    Example:
+        with RssSampler() as sampler:
+            run()
+        sampler.result()   # {"rss_mb": ..., "rss_peak_delta_mb": ...}
+    """
+    
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self.end_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _sample(self):
+        current = _current_rss_mb()
+        if current is not None:
+            self.peak_mb = current if self.peak_mb is None else max(self.peak_mb, current)
+        return current
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def __enter__(self) -> "RssSampler":
+        self.start_mb = self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.end_mb = self._sample()
+    
+    def result(self) -> Dict[str, Optional[float]]:
+        """
+        RSS after the block, and how far the sampled RSS rose above its value before the block.
+        
+        Returns:
+            {"rss_mb", "rss_peak_delta_mb"}; None where RSS cannot be read
+        """
+        delta = self.peak_mb - self.start_mb if self.start_mb is not None else None
+        return {"rss_mb": self.end_mb, "rss_peak_delta_mb": delta}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(fn: Callable[[], int], repeat: int, warmup: int = 1, before_each: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Time repeated calls of fn.
+    
+    Args:
+        fn: Zero-argument callable returning the number of items it processed
+        repeat: Number of timed calls
+        warmup: Number of untimed calls first
+        before_each: Optional untimed callable run before every call of
+            fn, warmup included (e.g. clearing caches)
+    
+    Returns:
+        Latency percentiles (ms), throughput (items/s), RSS after the run
+        and the peak rise of the sampled RSS during it (warmup included)
+    """
+    with RssSampler() as sampler:
+        for _ in range(warmup):
+            if before_each is not None:
+                before_each()
+            fn()
+        
+        latencies = []
+        items = 0
+        for _ in range(repeat):
+            if before_each is not None:
+                before_each()
+            call_started = time.perf_counter()
+            items += fn()
+            latencies.append((time.perf_counter() - call_started) * 1000)
+        elapsed = sum(latencies) / 1000
+    
+    latencies.sort()
+    result = {
+        "calls": repeat,
+        "items": items,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p90_ms": _percentile(latencies, 0.90),
+        "p99_ms": _percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "items_per_sec": items / elapsed if elapsed > 0 else 0.0
+    }
+    result.update(sampler.result())
+    return result
+
+
+def run_benchmarks(finder, apis: List[str], profiles: int = 1000, resume_words: int = 300, jobs: int = 5, repeat: int = 20, top_k: int = 10, batch_size: int = 64, seed: int = 0, warm: bool = False, verbose: bool = False) -> Dict:
+    """
+    Benchmark the selected TalentFinderAI APIs on synthetic data.
+    
+    Per-item APIs (parse_resume, extract_skills, match_candidate_to_job,
+    summarize_profile) are timed per call over ``repeat`` inputs;
+    find_top_candidates is timed per job over the whole pool. The
+    finder's caches are cleared before each API, so results are not
+    warmed by a previous API, and before each call unless warm is set.
+    
+    Args:
+        finder: TalentFinderAI instance (real or stub models)
+        apis: Names from APIS
+        profiles: Candidate pool size for find_top_candidates
+        resume_words: Approximate resume length in words
+        jobs: Number of distinct job descriptions
+        repeat: Timed calls per API
+        top_k: top_k for find_top_candidates
+        batch_size: batch_size for find_top_candidates
+        seed: Seed for the synthetic data
+        warm: Keep the caches filled by the warmup and earlier calls of
+            the same API (default: every call starts cold)
+        verbose: Print progress
+    
+    Returns:
+        Dict of API name -> measurement dict (with "cache": "cold" or "warm")
+    """
+    rng = random.Random(seed)
+    pool = [generate_resume(rng, resume_words) for _ in range(profiles)]
+    job_texts = [generate_job(rng) for _ in range(jobs)]
+    
+    def cycle(items: List):
+        state = {"i": 0}
+        
+        def next_item():
+            item = items[state["i"] % len(items)]
+            state["i"] += 1
+            return item
+        return next_item
+    
+    next_resume = cycle(pool)
+    next_job = cycle(job_texts)
+    
+    cases = {
+        "parse_resume": (lambda: (finder.parse_resume(next_resume()), 1)[1], repeat),
+        "extract_skills": (lambda: (finder.extract_skills(next_resume()), 1)[1], repeat),
+        "match_candidate_to_job": (lambda: (finder.match_candidate_to_job(next_resume(), next_job()), 1)[1], repeat),
+        "find_top_candidates": (lambda: (finder.find_top_candidates(next_job(), pool, top_k=top_k, batch_size=batch_size), len(pool))[1], max(1, min(repeat, jobs))),
+        "summarize_profile": (lambda: (finder.summarize_profile(next_resume()), 1)[1], repeat)
+    }
+    
+    results = {}
+    for api in apis:
+        finder.clear_caches()
+        if verbose:
+            print(f"  Benchmarking {api}...")
+        fn, calls = cases[api]
+        results[api] = measure(fn, calls, before_each=None if warm else finder.clear_caches)
+        results[api]["cache"] = "warm" if warm else "cold"
+    return results
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """
+    Describe how each API's p50 latency and throughput moved against a baseline.
+    
+    Args:
+        current: Output of run_benchmarks (the "results" section)
+        baseline: Same structure from a previous run
+    
+    Returns:
+        One line per API present in both runs
+    """
+    lines = []
+    for api, result in current.items():
+        previous = baseline.get(api)
+        if not previous:
+            continue
+        p50_change = (result["p50_ms"] / previous["p50_ms"] - 1) * 100 if previous["p50_ms"] else 0.0
+        throughput_change = (result["items_per_sec"] / previous["items_per_sec"] - 1) * 100 if previous["items_per_sec"] else 0.0
+        line = f"  {api:<24} p50 {p50_change:+7.1f}%   throughput {throughput_change:+7.1f}%"
+        if result.get("cache") != previous.get("cache"):
+            line += f"   ({result.get('cache')} vs {previous.get('cache')} caches)"
+        lines.append(line)
+    return lines
+
+
+def _print_table(results: Dict):
+    print(f"\n{'API':<24} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'items/s':>11} {'RSS +MB':>9}")
+    for api, result in results.items():
+        print(f"{api:<24} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+              f"{result['items_per_sec']:>11.1f} {result['rss_peak_delta_mb'] or 0:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark TalentFinderAI hot paths on synthetic data.")
+    parser.add_argument("--apis", default=",".join(APIS), help=f"Comma-separated APIs to run (default: all of {', '.join(APIS)})")
+    parser.add_argument("--profiles", type=int, default=1000, help="Candidate pool size for find_top_candidates")
+    parser.add_argument("--resume-words", type=int, default=300, help="Approximate words per synthetic resume")
+    parser.add_argument("--jobs", type=int, default=5, help="Number of synthetic job descriptions")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per API")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-models", action="store_true", help="Use tiny offline stand-ins instead of the HF models")
+    parser.add_argument("--precision", default="fp32", help="Model precision (fp32 or int8)")
+    parser.add_argument("--feature-cache", action="store_true", help="Enable the candidate feature cache (only reused with --warm)")
+    parser.add_argument("--warm", action="store_true", help="Keep caches between the calls of an API (default: clear them before each call)")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previous JSON results file")
+    args = parser.parse_args(argv)
+    
+    apis = [api.strip() for api in args.apis.split(",") if api.strip()]
+    unknown = [api for api in apis if api not in APIS]
+    if unknown:
+        parser.error(f"Unknown APIs: {', '.join(unknown)}")
+    
+    from talent_finder import TalentFinderAI
+    
+    load_started = time.perf_counter()
+    finder = TalentFinderAI(feature_cache_size=10000 if args.feature_cache else 0, precision=args.precision)
+    if args.stub_models:
+        install_stub_models(finder)
+    else:
+        needed = {"parse_resume": "ner", "match_candidate_to_job": "similarity", "find_top_candidates": "similarity", "summarize_profile": "summarizer"}
+        finder.warmup(sorted({needed[api] for api in apis if api in needed}))
+    load_seconds = time.perf_counter() - load_started
+    
+    print(f"Running {len(apis)} benchmarks ({'stub' if args.stub_models else 'real'} models, model load {load_seconds:.1f}s)...")
+    results = run_benchmarks(
+        finder, apis,
+        profiles=args.profiles, resume_words=args.resume_words, jobs=args.jobs, repeat=args.repeat,
+        top_k=args.top_k, batch_size=args.batch_size, seed=args.seed, warm=args.warm, verbose=True
+    )
+    _print_table(results)
+    
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stub_models": args.stub_models,
+            "model_load_seconds": load_seconds,
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+        },
+        "results": results
+    }
+    
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nChange vs {args.compare}:")
+        for line in compare(results, baseline.get("results", {})):
+            print(line)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
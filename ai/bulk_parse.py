@@ -0,0 +1,233 @@
+"""
+Bulk Parse - Parallel resume parsing across worker processes.
+
+parse_resume is CPU-bound (tokenization plus NER inference) and runs in a
+single process. BulkParser fans resumes out to a pool of worker
+processes in chunks. Each worker builds its own TalentFinderAI on first
+use, so models load lazily and once per worker, and caps its torch thread
+count so that workers x threads does not oversubscribe the cores.
+
+Results stream back as (index, parsed) pairs, either in input order or as
+soon as each chunk finishes. At most max_in_flight chunks are submitted at
+a time, and the input iterable is consumed only as results are taken, so
+memory stays bounded for arbitrarily large imports.
+
+Usage:
+    from bulk_parse import BulkParser
+    
+    with BulkParser(workers=8) as parser:
+        for index, parsed in parser.parse(resume_texts):
+            save(index, parsed)
+    
+    python bulk_parse.py resumes.jsonl --workers 8 --output parsed.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Per-process state of a pool worker
+_worker_finder = None
+_worker_finder_kwargs = {}
+
+
+def _init_worker(finder_kwargs: Dict, torch_threads: int):
+    global _worker_finder_kwargs
+    _worker_finder_kwargs = finder_kwargs
+    
+    # Worker processes are the unit of parallelism: keep each one's
+    # intra-op pool small and stop the tokenizers from spawning their own
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def _parse_chunk(texts: List[str], batch_size: int) -> List[Dict]:
+    global _worker_finder
+    if _worker_finder is None:
+        from talent_finder import TalentFinderAI
+        _worker_finder = TalentFinderAI(**_worker_finder_kwargs)
+    return _worker_finder.parse_resumes(texts, batch_size=batch_size)
+
+
+class BulkParser:
+    """
+    Pool of worker processes that parse resumes in parallel.
+    
+    Example:
+        with BulkParser(workers=4, precision="int8") as parser:
+            parsed = [result for _, result in parser.parse(texts)]
+    """
+    
+    def __init__(self, workers: Optional[int] = None, torch_threads: Optional[int] = None, chunk_size: int = 16, batch_size: int = 8, max_in_flight: Optional[int] = None, start_method: str = "spawn", **finder_kwargs):
+        """
+        Start the worker pool. Models are loaded by each worker on its first chunk.
+        
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            torch_threads: Torch intra-op threads per worker
+                (default: CPU count / workers, at least 1)
+            chunk_size: Resumes sent to a worker per task
+            batch_size: NER batch size within a worker
+            max_in_flight: Maximum chunks submitted but not yet consumed
+                (default: 2 x workers)
+            start_method: multiprocessing start method; "spawn" avoids
+                forking a process whose torch thread pools are running
+            **finder_kwargs: Passed to TalentFinderAI in each worker
+                (e.g. precision="int8", skill_taxonomy="skills.json");
+                the feature cache is off unless feature_cache_size is given
+        """
+        cpus = os.cpu_count() or 1
+        self.workers = workers or cpus
+        self.torch_threads = torch_threads or max(1, cpus // self.workers)
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        if min(self.workers, self.torch_threads, self.chunk_size, self.batch_size, self.max_in_flight) < 1:
+            raise ValueError("workers, torch_threads, chunk_size, batch_size and max_in_flight must be at least 1")
+        
+        # Every resume is parsed once, so caching features would only cost memory
+        finder_kwargs.setdefault("feature_cache_size", 0)
+        
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(finder_kwargs, self.torch_threads)
+        )
+    
+    def __enter__(self) -> "BulkParser":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Shut the worker pool down."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+    
+    def parse(self, resume_texts: Iterable[str], ordered: bool = True) -> Iterator[Tuple[int, Dict]]:
+        """
+        Parse resumes in the worker pool.
+        
+        Args:
+            resume_texts: Resume texts; consumed lazily, chunk by chunk
+            ordered: Yield results in input order. When False, each chunk's
+                results are yielded as soon as it finishes, so one slow
+                resume does not hold back the rest.
+        
+        Yields:
+            (index, parsed) pairs, where index is the position in
+            resume_texts and parsed is the parse_resume() result
+        """
+        texts = iter(resume_texts)
+        pending = deque() if ordered else {}   # chunk start index <-> future
+        start = 0
+        
+        try:
+            while True:
+                chunk = list(itertools.islice(texts, self.chunk_size))
+                if chunk:
+                    future = self._pool.submit(_parse_chunk, chunk, self.batch_size)
+                    if ordered:
+                        pending.append((start, future))
+                    else:
+                        pending[future] = start
+                    start += len(chunk)
+                
+                # Backpressure: take results before reading more input
+                while pending and (len(pending) >= self.max_in_flight or not chunk):
+                    if ordered:
+                        chunk_start, future = pending.popleft()
+                        done = [(chunk_start, future)]
+                    else:
+                        finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                        done = [(pending.pop(future), future) for future in finished]
+                    
+                    for chunk_start, future in done:
+                        for offset, parsed in enumerate(future.result()):
+                            yield chunk_start + offset, parsed
+                
+                if not chunk:
+                    return
+        finally:
+            # Consumer stopped early or a chunk failed: drop queued work
+            for future in ([future for _, future in pending] if ordered else list(pending)):
+                future.cancel()
+
+
+def parse_resumes_parallel(resume_texts: Iterable[str], workers: Optional[int] = None, ordered: bool = True, **kwargs) -> Iterator[Tuple[int, Dict]]:
+    """
+    Parse resumes with a temporary BulkParser.
+    
+    Args:
+        resume_texts: Resume texts
+        workers: Number of worker processes (default: CPU count)
+        ordered: Yield results in input order
+        **kwargs: Other BulkParser and TalentFinderAI options
+    
+    Yields:
+        (index, parsed) pairs
+    """
+    with BulkParser(workers=workers, **kwargs) as parser:
+        yield from parser.parse(resume_texts, ordered=ordered)
+
+
+def _read_jsonl(path: str) -> Iterator[Tuple[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                yield record.get("id", line_number), record["text"]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parse a JSONL file of resumes ({\"id\", \"text\"} per line) in parallel.")
+    parser.add_argument("input", help="Input JSONL file")
+    parser.add_argument("--output", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--torch-threads", type=int, help="Torch threads per worker")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--unordered", action="store_true", help="Write results as they finish instead of in input order")
+    parser.add_argument("--precision", default="fp32", help="Model precision (fp32 or int8)")
+    args = parser.parse_args(argv)
+    
+    # The ids stay here; only the texts travel to the workers
+    ids = []
+    
+    def texts():
+        for record_id, text in _read_jsonl(args.input):
+            ids.append(record_id)
+            yield text
+    
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    count = 0
+    try:
+        with BulkParser(workers=args.workers, torch_threads=args.torch_threads, chunk_size=args.chunk_size, batch_size=args.batch_size, precision=args.precision) as bulk:
+            for index, parsed in bulk.parse(texts(), ordered=not args.unordered):
+                output.write(json.dumps({"id": ids[index], **parsed}) + "\n")
+                count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"Parsed {count} resumes in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.1f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
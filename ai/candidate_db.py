@@ -0,0 +1,510 @@
+"""
+Candidate DB - Candidate embeddings stored alongside the backend's SQLite database.
+
+The Node backend writes candidates into backend/data/talentsearch.db.
+CandidateDB builds a profile text for each candidate row (title, company,
+skills, summary), and sync_embeddings() embeds only the rows that are new
+or whose text changed since the last sync. The vectors are kept in a
+candidate_embeddings side table keyed by candidate id and model, with a
+content hash of the profile text. The backend's own tables are only read.
+
+load_candidate_index() then loads a search's pool straight from the
+database into a CandidateIndex, so stored candidates are ranked without
+running the similarity model on them. rank_search() keeps a persistent
+RankingState per search and job in a candidate_rankings table, so a
+search that gains or edits candidates is re-ranked by scoring only the
+new and changed rows. New rows are the ones above the ranking's highest
+candidate id; edits and deletions are logged by triggers on the
+candidates table into a candidate_changes side table, and each ranking
+remembers the last change it has seen.
+
+Usage:
+    from candidate_db import CandidateDB
+    
+    db = CandidateDB()   # backend/data/talentsearch.db
+    db.sync_embeddings(finder)
+    index, profiles = db.load_candidate_index(finder, search_id=12)
+    top = finder.find_top_candidates(job_description, profiles, top_k=10, index=index)
+    top = db.rank_search(finder, job_description, search_id=12, top_k=10)
+    
+    python candidate_db.py sync
+    python candidate_db.py top "Senior Java developer with Kubernetes" --search-id 12
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from candidate_index import CandidateIndex
+from feature_cache import feature_key
+from ranking_state import RankingState
+
+
+DEFAULT_DB_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "data", "talentsearch.db"))
+EMBEDDINGS_TABLE = "candidate_embeddings"
+RANKINGS_TABLE = "candidate_rankings"
+CHANGES_TABLE = "candidate_changes"
+
+# Candidate ids bound per IN (...) query, below SQLite's variable limit
+ID_BATCH_SIZE = 500
+
+# The backend has used several names for the same candidate fields
+TITLE_COLUMNS = ("title", "jobTitle")
+COMPANY_COLUMNS = ("company", "companyName", "employer")
+SUMMARY_COLUMNS = ("summary", "profileSummary")
+
+
+def _first(row: sqlite3.Row, columns: List[str]) -> str:
+    for column in columns:
+        value = row[column]
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def _skills(value) -> List[str]:
+    """The skills column holds a JSON list, or plain comma-separated text in older rows."""
+    if not value:
+        return []
+    try:
+        skills = json.loads(value)
+    except (TypeError, ValueError):
+        skills = str(value).split(",")
+    if not isinstance(skills, list):
+        skills = [skills]
+    return [str(skill).strip() for skill in skills if str(skill).strip()]
+
+
+class CandidateDB:
+    """
+    Reads candidates from the backend database and keeps their embeddings in sync.
+    
+    Example:
+        db = CandidateDB("backend/data/talentsearch.db")
+        stats = db.sync_embeddings(finder)   # {"embedded": 12, "unchanged": 261, "removed": 0}
+    """
+    
+    def __init__(self, path: str = DEFAULT_DB_PATH, timeout: float = 30.0):
+        """
+        Open the database and create the embeddings table if needed.
+        
+        Args:
+            path: SQLite database file
+            timeout: Seconds to wait for the backend's write locks
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Candidate database not found: {path}")
+        
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {EMBEDDINGS_TABLE} (
+                candidateId INTEGER NOT NULL,
+                model TEXT NOT NULL,
+                contentHash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                updatedAt TEXT DEFAULT (datetime('now')),
+                PRIMARY KEY (candidateId, model)
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {RANKINGS_TABLE} (
+                searchId INTEGER NOT NULL,
+                jobHash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                topK INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                changeSeq INTEGER NOT NULL,
+                updatedAt TEXT DEFAULT (datetime('now')),
+                PRIMARY KEY (searchId, jobHash, model, topK)
+            )
+        """)
+        
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(candidates)")}
+        self._title_columns = [column for column in TITLE_COLUMNS if column in columns]
+        self._company_columns = [column for column in COMPANY_COLUMNS if column in columns]
+        self._summary_columns = [column for column in SUMMARY_COLUMNS if column in columns]
+        self._has_skills = "skills" in columns
+        self._has_search_id = "searchId" in columns
+        
+        self._create_change_log()
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+    
+    def _create_change_log(self):
+        """
+        Log edits and deletions of candidates while any ranking is stored.
+        
+        Each entry holds the candidate's searchId before the change, so a
+        ranking can tell a candidate that left its search from one that
+        joined it. Updates of columns outside the profile text (e.g.
+        contacted) are not logged.
+        """
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidateId INTEGER NOT NULL,
+                searchId INTEGER
+            )
+        """)
+        profile_columns = self._title_columns + self._company_columns + self._summary_columns
+        if self._has_skills:
+            profile_columns.append("skills")
+        if self._has_search_id:
+            profile_columns.append("searchId")
+        old_search_id = "OLD.searchId" if self._has_search_id else "NULL"
+        
+        for name, event in ((f"{CHANGES_TABLE}_update", f"UPDATE OF {', '.join(profile_columns)}" if profile_columns else "UPDATE"),
+                            (f"{CHANGES_TABLE}_delete", "DELETE")):
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON candidates
+                WHEN EXISTS (SELECT 1 FROM {RANKINGS_TABLE})
+                BEGIN
+                    INSERT INTO {CHANGES_TABLE} (candidateId, searchId) VALUES (OLD.id, {old_search_id});
+                END
+            """)
+    
+    def profile_text(self, row: sqlite3.Row) -> str:
+        """
+        Profile text embedded for a candidate row.
+        
+        Args:
+            row: Row of the candidates table
+        
+        Returns:
+            "<title> at <company>. Skills: <skills>. <summary>", skipping empty parts
+        """
+        title = _first(row, self._title_columns)
+        company = _first(row, self._company_columns)
+        skills = _skills(row["skills"]) if self._has_skills else []
+        summary = _first(row, self._summary_columns)
+        
+        parts = []
+        if title or company:
+            parts.append(f"{title} at {company}." if title and company else f"{title or company}.")
+        if skills:
+            parts.append(f"Skills: {', '.join(skills)}.")
+        if summary:
+            parts.append(summary)
+        return " ".join(parts)
+    
+    def candidate_profiles(self, search_id: Optional[int] = None, after_id: Optional[int] = None, candidate_ids: Optional[Iterable[int]] = None) -> Dict[int, str]:
+        """
+        Profile texts of the stored candidates.
+        
+        Args:
+            search_id: Only candidates found by this search (default: all)
+            after_id: Only candidates with a higher id (ids only grow, so
+                these are the candidates added since)
+            candidate_ids: Only these candidates (ids that no longer exist
+                are left out)
+        
+        Returns:
+            {candidate id: profile text}, in id order
+        """
+        conditions, params = [], []
+        if search_id is not None:
+            if not self._has_search_id:
+                raise ValueError("The candidates table has no searchId column")
+            conditions.append("searchId = ?")
+            params.append(search_id)
+        if after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+        if candidate_ids is None:
+            return self._profiles(conditions, params)
+        
+        candidate_ids = sorted(set(candidate_ids))
+        profiles = {}
+        for start in range(0, len(candidate_ids), ID_BATCH_SIZE):
+            batch = candidate_ids[start:start + ID_BATCH_SIZE]
+            profiles.update(self._profiles(conditions + [f"id IN ({', '.join('?' * len(batch))})"], params + batch))
+        return profiles
+    
+    def _profiles(self, conditions: List[str], params: List) -> Dict[int, str]:
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.conn.execute(f"SELECT * FROM candidates{where} ORDER BY id", params)
+        return {row["id"]: self.profile_text(row) for row in rows}
+    
+    def _stored_hashes(self, model_name: str) -> Dict[int, str]:
+        rows = self.conn.execute(f"SELECT candidateId, contentHash FROM {EMBEDDINGS_TABLE} WHERE model = ?", (model_name,))
+        return {row["candidateId"]: row["contentHash"] for row in rows}
+    
+    def sync_embeddings(self, finder, search_id: Optional[int] = None, batch_size: int = 64, verbose: bool = False) -> Dict:
+        """
+        Embed candidates that are new or changed since the last sync.
+        
+        Args:
+            finder: TalentFinderAI whose similarity model embeds the profiles
+            search_id: Only sync this search's candidates (default: all,
+                which also drops embeddings of deleted candidates)
+            batch_size: Profiles embedded and written per transaction
+            verbose: Print progress
+        
+        Returns:
+            {"embedded", "unchanged", "removed"} row counts
+        """
+        model_name = finder.embedding_model_name
+        profiles = self.candidate_profiles(search_id)
+        stored = self._stored_hashes(model_name)
+        
+        hashes = {candidate_id: feature_key(text) for candidate_id, text in profiles.items()}
+        stale = [candidate_id for candidate_id, content_hash in hashes.items() if stored.get(candidate_id) != content_hash]
+        
+        for start in range(0, len(stale), batch_size):
+            batch = stale[start:start + batch_size]
+            if verbose:
+                print(f"  Embedding candidates {start+1}-{start+len(batch)}/{len(stale)}...", end='\r')
+            vectors = finder.encode([profiles[candidate_id] for candidate_id in batch], batch_size=batch_size)
+            self._write_embeddings(model_name, batch, [hashes[candidate_id] for candidate_id in batch], vectors)
+        if verbose and stale:
+            print()
+        
+        removed = 0
+        if search_id is None:
+            with self.conn:
+                removed = self.conn.execute(
+                    f"DELETE FROM {EMBEDDINGS_TABLE} WHERE model = ? AND candidateId NOT IN (SELECT id FROM candidates)",
+                    (model_name,)
+                ).rowcount
+        
+        return {"embedded": len(stale), "unchanged": len(profiles) - len(stale), "removed": removed}
+    
+    def _write_embeddings(self, model_name: str, candidate_ids: List[int], content_hashes: List[str], vectors: np.ndarray):
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {EMBEDDINGS_TABLE} (candidateId, model, contentHash, dim, vector, updatedAt) "
+                "VALUES (?, ?, ?, ?, ?, datetime('now'))",
+                [(candidate_id, model_name, content_hash, vector.shape[0], np.asarray(vector, dtype="<f4").tobytes())
+                 for candidate_id, content_hash, vector in zip(candidate_ids, content_hashes, vectors)]
+            )
+    
+    def embeddings_for(self, finder, profiles: Dict[int, str], batch_size: int = 64) -> Dict[int, np.ndarray]:
+        """
+        Embeddings of specific candidates, computing and storing only the
+        ones missing or stale in the database.
+        
+        Args:
+            finder: TalentFinderAI whose similarity model embeds the profiles
+            profiles: {candidate id: current profile text}
+            batch_size: Batch size for the model forward passes
+        
+        Returns:
+            {candidate id: float32 embedding}
+        """
+        model_name = finder.embedding_model_name
+        hashes = {candidate_id: feature_key(text) for candidate_id, text in profiles.items()}
+        ids = list(profiles)
+        
+        embeddings = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT candidateId, contentHash, dim, vector FROM {EMBEDDINGS_TABLE} "
+                f"WHERE model = ? AND candidateId IN ({', '.join('?' * len(chunk))})",
+                [model_name] + chunk
+            )
+            for row in rows:
+                if row["contentHash"] == hashes[row["candidateId"]]:
+                    embeddings[row["candidateId"]] = np.frombuffer(row["vector"], dtype="<f4", count=row["dim"]).astype(np.float32)
+        
+        missing = [candidate_id for candidate_id in ids if candidate_id not in embeddings]
+        if missing:
+            vectors = finder.encode([profiles[candidate_id] for candidate_id in missing], batch_size=batch_size)
+            self._write_embeddings(model_name, missing, [hashes[candidate_id] for candidate_id in missing], vectors)
+            embeddings.update(zip(missing, vectors))
+        return embeddings
+    
+    def load_embeddings(self, model_name: str, profiles: Dict[int, str]) -> Tuple[List[int], np.ndarray]:
+        """
+        Stored embeddings of candidates whose profile text is unchanged.
+        
+        Args:
+            model_name: TalentFinderAI.embedding_model_name
+            profiles: {candidate id: current profile text}
+        
+        Returns:
+            (candidate ids, float32 array of shape (len(ids), dim)); candidates
+            without an up-to-date embedding are left out
+        """
+        ids, vectors = [], []
+        rows = self.conn.execute(f"SELECT candidateId, contentHash, dim, vector FROM {EMBEDDINGS_TABLE} WHERE model = ?", (model_name,))
+        for row in rows:
+            text = profiles.get(row["candidateId"])
+            if text is not None and feature_key(text) == row["contentHash"]:
+                ids.append(row["candidateId"])
+                vectors.append(np.frombuffer(row["vector"], dtype="<f4", count=row["dim"]))
+        if not vectors:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return ids, np.stack(vectors).astype(np.float32, copy=False)
+    
+    def load_candidate_index(self, finder, search_id: Optional[int] = None, sync: bool = True, backend: str = "flat", **index_kwargs) -> Tuple[CandidateIndex, Dict[int, str]]:
+        """
+        Load stored candidates into a CandidateIndex for find_top_candidates.
+        
+        Args:
+            finder: TalentFinderAI the index will be searched with
+            search_id: Only this search's candidates (default: all)
+            sync: Embed new or changed candidates first. When False, only
+                candidates with an up-to-date stored embedding are indexed
+                and no inference runs at all.
+            backend: CandidateIndex backend ("flat" or "ivf")
+            **index_kwargs: Extra CandidateIndex options
+        
+        Returns:
+            (index keyed by candidate id, {candidate id: profile text}) to
+            pass as find_top_candidates(job, profiles, index=index)
+        """
+        if sync:
+            self.sync_embeddings(finder, search_id=search_id)
+        
+        profiles = self.candidate_profiles(search_id)
+        ids, vectors = self.load_embeddings(finder.embedding_model_name, profiles)
+        dim = vectors.shape[1] if len(ids) else finder.similarity_model.get_sentence_embedding_dimension()
+        
+        index = CandidateIndex(dim, backend=backend, **index_kwargs)
+        if ids:
+            index.add(ids, vectors)
+        return index, {candidate_id: profiles[candidate_id] for candidate_id in ids}
+    
+    def rank_search(self, finder, job_description, search_id: int, top_k: int = 10, rebuild: bool = False) -> List[Dict]:
+        """
+        Top candidates of a search for a job, updated incrementally.
+        
+        The ranking is persisted per (search, job, model, top_k) with the
+        last candidate_changes entry it has seen. Later calls read only the
+        candidates added to the search (ids above the ranking's highest)
+        and the ones logged as edited or deleted since, score the new and
+        edited ones and merge them into the stored top-k (see
+        TalentFinderAI.update_ranking); the rest of the pool is not read.
+        The ranking is rebuilt when a top-k member was deleted or left the
+        search, or was edited to a score below the previous k-th.
+        
+        Args:
+            finder: TalentFinderAI
+            job_description: Job description text, or a JobQuery
+            search_id: Search whose candidates are ranked
+            top_k: Number of top candidates to return
+            rebuild: Discard the stored ranking and rescore every candidate
+        
+        Returns:
+            Top candidates in the format of find_top_candidates, with
+            candidate_id being the candidates table id
+        """
+        job = finder.build_job_query(job_description) if isinstance(job_description, str) else job_description
+        model_name = finder.embedding_model_name
+        key = (search_id, feature_key(job.text), model_name, top_k)
+        
+        stored = None if rebuild else self._load_ranking(key)
+        state, seen = stored if stored is not None else (RankingState(key[1], model_name, top_k), None)
+        # Read the change log before the rows, so a change committed in
+        # between is seen again next time rather than missed
+        changes, change_seq = self._candidate_changes(seen)
+        
+        last = state.last_candidate_id
+        edited_ids = [candidate_id for candidate_id in changes if last is not None and candidate_id <= last]
+        changed = self.candidate_profiles(search_id, candidate_ids=edited_ids) if edited_ids else {}
+        was_in_search = {candidate_id for candidate_id in edited_ids if changes[candidate_id] == search_id}
+        removed = was_in_search.difference(changed)
+        if state.discard(removed):
+            state.needs_rebuild = True
+        state.pool_size += len(set(changed) - was_in_search) - len(removed)
+        
+        changed.update(self.candidate_profiles(search_id, after_id=last))
+        if changed and not state.needs_rebuild:
+            finder.update_ranking(state, job, changed, embeddings=self._ranking_embeddings(finder, changed))
+        if state.needs_rebuild:
+            state = RankingState(key[1], model_name, top_k)
+            profiles = self.candidate_profiles(search_id)
+            finder.update_ranking(state, job, profiles, embeddings=self._ranking_embeddings(finder, profiles))
+        
+        if changed or removed or change_seq != seen:
+            with self.conn:
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO {RANKINGS_TABLE} (searchId, jobHash, model, topK, state, changeSeq, updatedAt) "
+                    "VALUES (?, ?, ?, ?, ?, ?, datetime('now'))",
+                    key + (state.to_json(), change_seq)
+                )
+                # Entries every stored ranking has seen are no longer needed
+                self.conn.execute(f"DELETE FROM {CHANGES_TABLE} WHERE seq <= (SELECT MIN(changeSeq) FROM {RANKINGS_TABLE})")
+        return [dict(result) for result in state.results]
+    
+    def _candidate_changes(self, since: Optional[int]) -> Tuple[Dict[int, Optional[int]], int]:
+        """
+        Candidates edited or deleted after a change log position.
+        
+        Args:
+            since: Last change seen, or None for a ranking built from scratch
+        
+        Returns:
+            ({candidate id: its searchId before the first of those changes},
+            position of the latest change)
+        """
+        latest = self.conn.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGES_TABLE}").fetchone()[0]
+        if since is None:
+            return {}, latest
+        
+        changes = {}
+        rows = self.conn.execute(f"SELECT candidateId, searchId FROM {CHANGES_TABLE} WHERE seq > ? AND seq <= ? ORDER BY seq", (since, latest))
+        for row in rows:
+            changes.setdefault(row["candidateId"], row["searchId"])
+        return changes, max(latest, since)
+    
+    def _ranking_embeddings(self, finder, profiles: Dict[int, str]) -> Optional[Dict[int, np.ndarray]]:
+        """Stored embeddings for update_ranking; None with chunk pooling, which embeds chunks instead."""
+        if getattr(finder, "chunk_pooling", None):
+            return None
+        return self.embeddings_for(finder, profiles)
+    
+    def _load_ranking(self, key: Tuple) -> Optional[Tuple[RankingState, int]]:
+        """Stored ranking for key and the last change it has seen, or None."""
+        row = self.conn.execute(
+            f"SELECT state, changeSeq FROM {RANKINGS_TABLE} WHERE searchId = ? AND jobHash = ? AND model = ? AND topK = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        return RankingState.from_json(row["state"]), row["changeSeq"]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sync and rank candidate embeddings stored in the backend database.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite database (default: backend/data/talentsearch.db)")
+    parser.add_argument("--precision", default="fp32", help="Model precision (fp32 or int8)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    sync = commands.add_parser("sync", help="Embed new and changed candidates")
+    sync.add_argument("--search-id", type=int)
+    
+    top = commands.add_parser("top", help="Rank stored candidates for a job description")
+    top.add_argument("job", help="Job description")
+    top.add_argument("--search-id", type=int)
+    top.add_argument("--top-k", type=int, default=10)
+    top.add_argument("--no-sync", action="store_true", help="Only rank candidates that are already embedded")
+    args = parser.parse_args(argv)
+    
+    from talent_finder import TalentFinderAI
+    
+    finder = TalentFinderAI(precision=args.precision)
+    db = CandidateDB(args.db)
+    try:
+        if args.command == "sync":
+            print(json.dumps(db.sync_embeddings(finder, search_id=args.search_id, verbose=True)))
+        else:
+            index, profiles = db.load_candidate_index(finder, search_id=args.search_id, sync=not args.no_sync)
+            for result in finder.find_top_candidates(args.job, profiles, top_k=args.top_k, index=index):
+                print(f"{result['candidate_id']:>6}  {result['overall_match_score']:.3f}  {result['profile_preview']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Candidate Index - Nearest-neighbour search over candidate embeddings.
+
+Provides an in-process vector index for the MiniLM candidate embeddings
+used by TalentFinderAI, so top-k retrieval does not have to scan and sort
+the whole pool. Two backends are available:
+- "flat": exact search, one matrix-vector product over every vector
+- "ivf": approximate inverted-file search; vectors are clustered with
+  spherical k-means and only the nprobe closest clusters are scanned
+
+Scores are cosine similarities (vectors are L2-normalized on insert).
+
+Usage:
+    from candidate_index import CandidateIndex
+    
+    index = CandidateIndex(dim=384, backend="ivf")
+    index.add(candidate_ids, candidate_embeddings)
+    hits = index.search(job_embedding, k=10)   # [(candidate_id, score), ...]
+    index.save("candidates.npz")
+    index = CandidateIndex.load("candidates.npz")
+"""
+
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Rows scored against the centroids at a time when assigning clusters, so
+# the (rows x nlist) score matrix stays small for any pool size
+ASSIGN_BLOCK_ROWS = 16384
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of each row's most similar centroid, computed ASSIGN_BLOCK_ROWS rows at a time."""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        assignments[start:start + ASSIGN_BLOCK_ROWS] = np.argmax(vectors[start:start + ASSIGN_BLOCK_ROWS] @ centroids.T, axis=1)
+    return assignments
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving all-zero rows untouched."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class _InvertedList:
+    """Growable contiguous block of (id, vector) pairs with O(1) swap-removal."""
+    
+    def __init__(self, dim: int):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.size = 0
+    
+    def append(self, ids: np.ndarray, vectors: np.ndarray) -> int:
+        """Append rows and return the position of the first one."""
+        start = self.size
+        needed = start + len(ids)
+        if needed > len(self.ids):
+            capacity = max(needed, 2 * len(self.ids), 16)
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_vectors = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown_ids[:start] = self.ids[:start]
+            grown_vectors[:start] = self.vectors[:start]
+            self.ids, self.vectors = grown_ids, grown_vectors
+        self.ids[start:needed] = ids
+        self.vectors[start:needed] = vectors
+        self.size = needed
+        return start
+    
+    def remove(self, position: int) -> Optional[int]:
+        """Remove a row by moving the last row into its slot; return the moved id."""
+        last = self.size - 1
+        moved = None
+        if position != last:
+            self.ids[position] = self.ids[last]
+            self.vectors[position] = self.vectors[last]
+            moved = int(self.ids[position])
+        self.size = last
+        return moved
+
+
+class CandidateIndex:
+    """
+    Vector index over candidate embeddings with exact and approximate search.
+    
+    Supports incremental add/remove, top-k cosine search and persistence to
+    a single .npz file.
+    
+    The IVF backend keeps vectors in a flat pending list until it is trained;
+    training happens automatically once enough vectors have been added (or
+    explicitly via train()), after which new vectors go straight into their
+    nearest cluster. Once the index holds more than retrain_factor times the
+    vectors it was trained on, it is retrained, so clusters stay at about
+    sqrt(n) vectors (and nlist at about sqrt(n) unless it was fixed) as the
+    index grows incrementally.
+    
+    Example:
+        index = CandidateIndex(dim=384, backend="ivf", nprobe=16)
+        index.add([101, 102], embeddings)
+        index.remove([102])
+        index.search(job_embedding, k=5)
+    """
+    
+    BACKENDS = ("flat", "ivf")
+    
+    def __init__(self, dim: int, backend: str = "flat", nlist: Optional[int] = None, nprobe: int = 16, train_threshold: Optional[int] = None, retrain_factor: Optional[float] = 4.0):
+        """
+        Create an empty index.
+        
+        Args:
+            dim: Embedding dimension (384 for all-MiniLM-L6-v2)
+            backend: "flat" for exact search or "ivf" for approximate search
+            nlist: Number of IVF clusters; defaults to ~sqrt(n) at training time
+            nprobe: Number of IVF clusters scanned per query
+            train_threshold: Number of vectors that triggers automatic IVF
+                training; defaults to 39 per cluster (at least 1024)
+            retrain_factor: Retrain the IVF clusters once the index holds
+                this many times the vectors of the last training; None
+                disables retraining
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(self.BACKENDS)}")
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        if retrain_factor is not None and retrain_factor <= 1:
+            raise ValueError("retrain_factor must be greater than 1")
+        
+        self.dim = dim
+        self.backend = backend
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_factor = retrain_factor
+        self.trained_size = 0                    # vectors the clusters were trained on
+        self._auto_nlist = nlist is None         # nlist follows sqrt(n) at every training
+        
+        self.centroids = None                    # (nlist, dim) once trained
+        self._pending = _InvertedList(dim)       # flat storage / untrained IVF
+        self._lists: List[_InvertedList] = []    # IVF clusters once trained
+        self._locations: Dict[int, Tuple[int, int]] = {}  # id -> (list, position); list -1 is pending
+    
+    def __len__(self) -> int:
+        return len(self._locations)
+    
+    def __contains__(self, candidate_id: int) -> bool:
+        return int(candidate_id) in self._locations
+    
+    @property
+    def is_trained(self) -> bool:
+        """True once the IVF clusters exist (always False for the flat backend)."""
+        return self.centroids is not None
+    
+    def _list(self, list_no: int) -> _InvertedList:
+        return self._pending if list_no < 0 else self._lists[list_no]
+    
+    def _insert(self, list_no: int, ids: np.ndarray, vectors: np.ndarray):
+        start = self._list(list_no).append(ids, vectors)
+        for offset, candidate_id in enumerate(ids.tolist()):
+            self._locations[candidate_id] = (list_no, start + offset)
+    
+    def add(self, ids: Iterable[int], vectors: np.ndarray):
+        """
+        Add (or replace) vectors.
+        
+        Args:
+            ids: Integer candidate ids, one per vector
+            vectors: Array of shape (len(ids), dim)
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        vectors = _normalize(vectors).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if len(ids) == 0:
+            return
+        
+        # Last write wins for duplicate ids within the batch
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last)
+        ids, vectors = ids[keep], vectors[keep]
+        
+        self.remove([candidate_id for candidate_id in ids.tolist() if candidate_id in self._locations])
+        
+        if not self.is_trained:
+            self._insert(-1, ids, vectors)
+            if self.backend == "ivf" and self._pending.size >= self._auto_train_size():
+                self.train()
+            return
+        
+        self._insert_nearest(ids, vectors)
+        if self.retrain_factor is not None and len(self._locations) > self.retrain_factor * self.trained_size:
+            self.train()
+    
+    def _insert_nearest(self, ids: np.ndarray, vectors: np.ndarray):
+        """Insert normalized rows into their closest clusters, one block of rows at a time."""
+        for start in range(0, len(ids), ASSIGN_BLOCK_ROWS):
+            block_ids = ids[start:start + ASSIGN_BLOCK_ROWS]
+            block = vectors[start:start + ASSIGN_BLOCK_ROWS]
+            assignments = _nearest_centroids(block, self.centroids)
+            for list_no in np.unique(assignments).tolist():
+                mask = assignments == list_no
+                self._insert(list_no, block_ids[mask], block[mask])
+    
+    def remove(self, ids: Iterable[int]) -> int:
+        """
+        Remove vectors by id; unknown ids are ignored.
+        
+        Args:
+            ids: Candidate ids to remove
+        
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        for candidate_id in ids:
+            location = self._locations.pop(int(candidate_id), None)
+            if location is None:
+                continue
+            list_no, position = location
+            moved = self._list(list_no).remove(position)
+            if moved is not None:
+                self._locations[moved] = (list_no, position)
+            removed += 1
+        return removed
+    
+    def _auto_train_size(self) -> int:
+        if self.train_threshold is not None:
+            return self.train_threshold
+        return max(1024, 39 * (self.nlist or 1))
+    
+    def train(self, sample: Optional[np.ndarray] = None, iterations: int = 10, max_sample: int = 65536, seed: int = 0):
+        """
+        Train IVF clusters with spherical k-means and redistribute stored vectors.
+        
+        Args:
+            sample: Training vectors; defaults to the vectors already in the index
+            iterations: Number of k-means iterations
+            max_sample: Maximum number of vectors used for training
+            seed: Random seed for sampling and initialization
+        """
+        if self.backend != "ivf":
+            raise ValueError("Only the 'ivf' backend needs training")
+        
+        # Gather everything currently stored so it can be reassigned
+        stored_ids = [self._pending.ids[:self._pending.size]] + [lst.ids[:lst.size] for lst in self._lists]
+        stored_vectors = [self._pending.vectors[:self._pending.size]] + [lst.vectors[:lst.size] for lst in self._lists]
+        stored_ids = np.concatenate(stored_ids)
+        stored_vectors = np.concatenate(stored_vectors)
+        
+        sample = stored_vectors if sample is None else _normalize(sample).reshape(-1, self.dim)
+        if len(sample) == 0:
+            raise ValueError("Cannot train an IVF index without vectors")
+        
+        rng = np.random.default_rng(seed)
+        if len(sample) > max_sample:
+            sample = sample[rng.choice(len(sample), max_sample, replace=False)]
+        
+        trained_size = max(len(stored_vectors), len(sample))
+        nlist = int(math.sqrt(trained_size)) if self._auto_nlist else self.nlist
+        nlist = max(1, min(nlist, len(sample)))
+        
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = _nearest_centroids(sample, centroids)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=nlist)
+            sums = np.zeros_like(centroids)
+            occupied = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[occupied]
+            sums[occupied] = np.add.reduceat(sample[order], starts, axis=0)
+            # Re-seed empty clusters from random samples
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums)
+        
+        self.nlist = nlist
+        self.trained_size = trained_size
+        self.centroids = centroids
+        self._pending = _InvertedList(self.dim)
+        self._lists = [_InvertedList(self.dim) for _ in range(nlist)]
+        self._locations = {}
+        # Stored vectors are already normalized and unique
+        self._insert_nearest(stored_ids, stored_vectors)
+    
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find the k stored vectors most similar to a query.
+        
+        Args:
+            query: Query embedding of shape (dim,)
+            k: Number of results
+            nprobe: Override the number of IVF clusters scanned
+        
+        Returns:
+            List of (candidate_id, cosine_similarity), highest score first;
+            ties are broken by ascending id
+        """
+        query = _normalize(np.asarray(query).reshape(-1))
+        if k <= 0 or not self._locations:
+            return []
+        
+        blocks = [self._pending] if self._pending.size else []
+        if self.is_trained:
+            probe = min(nprobe or self.nprobe, len(self._lists))
+            centroid_scores = self.centroids @ query
+            nearest = np.argpartition(-centroid_scores, probe - 1)[:probe] if probe < len(self._lists) else range(len(self._lists))
+            blocks += [self._lists[list_no] for list_no in nearest if self._lists[list_no].size]
+        
+        if not blocks:
+            return []
+        
+        ids = np.concatenate([block.ids[:block.size] for block in blocks])
+        scores = np.concatenate([block.vectors[:block.size] @ query for block in blocks])
+        
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            # Include every tie at the k-th score so the tie-break is stable
+            kth = scores[candidates].min()
+            candidates = np.flatnonzero(scores >= kth)
+        else:
+            candidates = np.arange(len(scores))
+        
+        order = candidates[np.lexsort((ids[candidates], -scores[candidates]))][:k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+    
+    def save(self, path: str):
+        """
+        Save the index to a .npz file.
+        
+        Args:
+            path: Destination file path
+        """
+        blocks = [self._pending] + self._lists
+        sizes = np.array([block.size for block in blocks], dtype=np.int64)
+        ids = np.concatenate([block.ids[:block.size] for block in blocks])
+        vectors = np.concatenate([block.vectors[:block.size] for block in blocks])
+        meta = {
+            "dim": self.dim,
+            "backend": self.backend,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "train_threshold": self.train_threshold,
+            "retrain_factor": self.retrain_factor,
+            "trained_size": self.trained_size,
+            "auto_nlist": self._auto_nlist
+        }
+        arrays = {"meta": np.array(json.dumps(meta)), "sizes": sizes, "ids": ids, "vectors": vectors}
+        if self.is_trained:
+            arrays["centroids"] = self.centroids
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+    
+    @classmethod
+    def load(cls, path: str) -> "CandidateIndex":
+        """
+        Load an index saved with save().
+        
+        Args:
+            path: Path to the .npz file
+        
+        Returns:
+            CandidateIndex
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            index = cls(meta["dim"], backend=meta["backend"], nlist=meta["nlist"], nprobe=meta["nprobe"], train_threshold=meta["train_threshold"], retrain_factor=meta.get("retrain_factor", 4.0))
+            index._auto_nlist = meta.get("auto_nlist", False)
+            if "centroids" in data:
+                index.centroids = data["centroids"].astype(np.float32)
+                index._lists = [_InvertedList(index.dim) for _ in range(len(index.centroids))]
+            
+            ids, vectors = data["ids"], data["vectors"].astype(np.float32)
+            offset = 0
+            for list_no, size in enumerate(data["sizes"].tolist()):
+                if size:
+                    index._insert(list_no - 1, ids[offset:offset + size], vectors[offset:offset + size])
+                offset += size
+            # Indexes saved before retraining existed count as trained on what they hold
+            index.trained_size = meta.get("trained_size", len(index)) if index.is_trained else 0
+        return index
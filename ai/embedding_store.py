@@ -0,0 +1,400 @@
+"""
+Embedding Store - Persistent on-disk cache for sentence embeddings.
+
+Embeddings are keyed by a hash of the normalized text plus the model name
+and kept in a memory-mapped float32 matrix. Keys map to matrix rows through
+a JSON index checkpoint plus an append-only key log, so a write appends only
+its own keys instead of rewriting the whole index. The store survives
+process restarts and evicts the least recently used rows once it reaches
+its size bound.
+
+Usage:
+    from embedding_store import EmbeddingStore
+    
+    store = EmbeddingStore("~/.cache/talent_finder/embeddings", "all-MiniLM-L6-v2")
+    cached = store.get_many(texts)           # list of arrays or None
+    store.put_many(missing_texts, vectors)   # float32 array (n, dim)
+    store.close()                            # checkpoint the index
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivially different copies share a key.
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Text with runs of whitespace collapsed and ends stripped
+    """
+    return " ".join(text.split())
+
+
+def text_key(text: str, model_name: str) -> str:
+    """
+    Build the store key for a text embedded with a given model.
+    
+    Args:
+        text: Raw text
+        model_name: Name of the embedding model
+    
+    Returns:
+        Hex SHA-256 digest of the model name and normalized text
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Size-bounded, memory-mapped embedding cache that persists across runs.
+    
+    Files in the store directory:
+    - embeddings.f32: float32 matrix of shape (capacity, dim)
+    - index.json: checkpoint of the model name, dimension, capacity and
+      key -> row mapping (least recently used first)
+    - index.log: "key row" lines appended by every put_many since the
+      checkpoint, replayed on load; "- row" lines unmap a row whose
+      evicted entry is about to be overwritten
+    
+    The log is folded into a new checkpoint once it holds more lines than
+    the store has entries, and on close(), so writes cost O(batch)
+    amortized. Recency from reads alone is persisted at checkpoints.
+    
+    The matrix grows geometrically up to max_entries rows; after that the
+    least recently used entries are evicted and their rows reused.
+    Reopening with a smaller max_entries evicts down to the bound and
+    shrinks the matrix file.
+    
+    Example:
+        store = EmbeddingStore("./embeddings", "all-MiniLM-L6-v2", max_entries=50000)
+        vectors = store.get_many(["Senior Python engineer..."])
+    """
+    
+    MATRIX_FILE = "embeddings.f32"
+    INDEX_FILE = "index.json"
+    LOG_FILE = "index.log"
+    INITIAL_CAPACITY = 1024
+    
+    def __init__(self, path: str, model_name: str, max_entries: int = 100000):
+        """
+        Open (or create) an embedding store.
+        
+        Args:
+            path: Directory holding the store files
+            model_name: Embedding model the vectors come from; a store built
+                for a different model is discarded
+            max_entries: Maximum number of embeddings kept on disk
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.path = os.path.expanduser(path)
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        self._dim = None
+        self._capacity = 0
+        self._matrix = None
+        self._rows = OrderedDict()   # key -> row, least recently used first
+        self._free_rows = []
+        self._stale_rows = set()     # free rows the files may still map to an evicted key
+        self._log_lines = 0
+        
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.path, self.MATRIX_FILE)
+    
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.path, self.INDEX_FILE)
+    
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.path, self.LOG_FILE)
+    
+    def _load(self):
+        """Restore the index and map the matrix file, if present and compatible."""
+        if not os.path.exists(self._index_path):
+            self._remove_log()
+            return
+        
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            self._remove_log()
+            return
+        
+        if index.get("model_name") != self.model_name or not index.get("dim"):
+            self._remove_log()
+            return
+        
+        capacity = int(index["capacity"])
+        dim = int(index["dim"])
+        expected_size = capacity * dim * np.dtype(np.float32).itemsize
+        if not os.path.exists(self._matrix_path) or os.path.getsize(self._matrix_path) < expected_size:
+            self._remove_log()
+            return
+        
+        self._dim = dim
+        self._capacity = capacity
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, dim))
+        
+        entries = index["entries"]
+        keys_by_row = {}
+        for key, row in entries:
+            self._assign(key, int(row), keys_by_row)
+        self._replay_log(keys_by_row)
+        
+        # Rows beyond the current entries that were allocated but never used
+        # (or freed by eviction) become free slots again
+        used = set(self._rows.values())
+        self._free_rows = [row for row in range(capacity - 1, -1, -1) if row not in used]
+        
+        # Drop anything above the (possibly lowered) size bound and shrink
+        # the matrix to it
+        self._evict(len(self._rows) - self.max_entries)
+        if self._capacity > self.max_entries:
+            # Unmap the evicted keys on disk before _shrink moves entries into their rows
+            self._checkpoint()
+            self._shrink(self.max_entries)
+        if self._log_lines or len(self._rows) != len(entries) or self._capacity != capacity:
+            self._checkpoint()
+    
+    def _assign(self, key: str, row: int, keys_by_row: dict):
+        """Map key to row while loading; a row holds only its latest key."""
+        if row < 0 or row >= self._capacity:
+            return
+        previous = keys_by_row.get(row)
+        if previous is not None and previous != key:
+            del self._rows[previous]
+        old_row = self._rows.pop(key, None)
+        if old_row is not None and old_row != row:
+            keys_by_row.pop(old_row, None)
+        self._rows[key] = row
+        keys_by_row[row] = key
+    
+    def _replay_log(self, keys_by_row: dict):
+        """Apply the key log written since the checkpoint (a torn last line is ignored)."""
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                self._log_lines += 1
+                parts = line.split()
+                if len(parts) != 2 or not parts[1].isdigit():
+                    continue
+                if parts[0] == "-":
+                    key = keys_by_row.pop(int(parts[1]), None)
+                    if key is not None:
+                        del self._rows[key]
+                else:
+                    self._assign(parts[0], int(parts[1]), keys_by_row)
+    
+    def _remove_log(self):
+        try:
+            os.remove(self._log_path)
+        except FileNotFoundError:
+            pass
+    
+    def _shrink(self, capacity: int):
+        """Move entries into the first ``capacity`` rows and truncate the matrix file."""
+        free = sorted(row for row in self._free_rows if row < capacity)
+        for key, row in list(self._rows.items()):
+            if row >= capacity:
+                target = free.pop()
+                self._matrix[target] = self._matrix[row]
+                self._rows[key] = target
+        self._matrix.flush()
+        del self._matrix
+        with open(self._matrix_path, "r+b") as f:
+            f.truncate(capacity * self._dim * np.dtype(np.float32).itemsize)
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+        self._capacity = capacity
+        used = set(self._rows.values())
+        self._free_rows = [row for row in range(capacity - 1, -1, -1) if row not in used]
+    
+    def _grow(self, needed: int):
+        """Make room for at least ``needed`` more rows, growing or evicting."""
+        free = len(self._free_rows)
+        if free >= needed:
+            return
+        
+        target = min(self.max_entries, max(self.INITIAL_CAPACITY, self._capacity * 2, len(self._rows) + needed))
+        if target > self._capacity:
+            if self._matrix is not None:
+                self._matrix.flush()
+                del self._matrix
+            with open(self._matrix_path, "ab") as f:
+                f.truncate(target * self._dim * np.dtype(np.float32).itemsize)
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(target, self._dim))
+            self._free_rows = list(range(target - 1, self._capacity - 1, -1)) + self._free_rows
+            self._capacity = target
+        
+        self._evict(needed - len(self._free_rows))
+    
+    def _evict(self, count: int):
+        """Evict the ``count`` least recently used entries."""
+        for _ in range(min(count, len(self._rows))):
+            _, row = self._rows.popitem(last=False)
+            self._free_rows.append(row)
+            self._stale_rows.add(row)
+    
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings.
+        
+        Args:
+            texts: Texts to look up
+        
+        Returns:
+            List aligned with texts; each item is a float32 vector or None on a miss
+        """
+        keys = [text_key(text, self.model_name) for text in texts]
+        results = []
+        
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                
+                self.hits += 1
+                self._rows.move_to_end(key)
+                results.append(np.array(self._matrix[row]))
+        
+        return results
+    
+    def put_many(self, texts: List[str], embeddings: np.ndarray):
+        """
+        Store embeddings and persist them to disk.
+        
+        Appends the batch's keys to the key log; the full index is only
+        rewritten when the log outgrows the store.
+        
+        Args:
+            texts: Texts the embeddings were computed from
+            embeddings: Array of shape (len(texts), dim)
+        """
+        if len(texts) == 0:
+            return
+        
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(texts):
+            raise ValueError("embeddings must have shape (len(texts), dim)")
+        
+        # Only the last max_entries texts can be kept anyway
+        keys = [text_key(text, self.model_name) for text in texts]
+        new_items = {}
+        for key, vector in zip(keys, embeddings):
+            new_items[key] = vector
+        new_items = dict(list(new_items.items())[-self.max_entries:])
+        
+        with self._lock:
+            if self._dim is None:
+                self._dim = embeddings.shape[1]
+            elif embeddings.shape[1] != self._dim:
+                raise ValueError(f"Expected embeddings of dimension {self._dim}, got {embeddings.shape[1]}")
+            
+            # Pin entries being overwritten so eviction does not pick them
+            for key in new_items:
+                if key in self._rows:
+                    self._rows.move_to_end(key)
+            
+            # Stay within the bound even when free rows are left over
+            new_count = sum(1 for key in new_items if key not in self._rows)
+            self._evict(len(self._rows) + new_count - self.max_entries)
+            capacity = self._capacity
+            self._grow(new_count)
+            
+            rows = []
+            for key in new_items:
+                row = self._rows.get(key)
+                if row is None:
+                    row = self._free_rows.pop()
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+                rows.append(row)
+            
+            # Unmap reused rows on disk first: a crash while they are being
+            # overwritten must not leave an evicted key pointing at another
+            # text's vector
+            reused = [row for row in rows if row in self._stale_rows]
+            if reused:
+                self._append_log(f"- {row}\n" for row in reused)
+                self._stale_rows.difference_update(reused)
+            
+            for row, vector in zip(rows, new_items.values()):
+                self._matrix[row] = vector
+            self._matrix.flush()
+            
+            # The checkpoint records the capacity, so growth needs a new one
+            if self._capacity != capacity or self._log_lines + len(new_items) > max(len(self._rows), self.INITIAL_CAPACITY):
+                self._checkpoint()
+            else:
+                self._append_log(f"{key} {row}\n" for key, row in zip(new_items, rows))
+    
+    def _append_log(self, lines):
+        """Append lines to the key log; the file is closed before returning."""
+        lines = list(lines)
+        with open(self._log_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        self._log_lines += len(lines)
+    
+    def _checkpoint(self):
+        """Write the matrix and the full index, then drop the key log; the index is replaced atomically."""
+        if self._matrix is not None:
+            self._matrix.flush()
+        
+        index = {
+            "model_name": self.model_name,
+            "dim": self._dim,
+            "capacity": self._capacity,
+            "entries": [[key, row] for key, row in self._rows.items()]
+        }
+        
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+        self._remove_log()
+        self._log_lines = 0
+        self._stale_rows.clear()
+    
+    def close(self):
+        """Checkpoint the index (the store stays usable)."""
+        with self._lock:
+            if self._dim is not None:
+                self._checkpoint()
+    
+    def clear(self):
+        """Remove every entry from the store."""
+        with self._lock:
+            self._free_rows = list(range(self._capacity - 1, -1, -1))
+            self._rows.clear()
+            self._checkpoint()
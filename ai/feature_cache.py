@@ -0,0 +1,204 @@
+"""
+Feature Cache - In-process LRU cache of derived candidate features.
+
+The same candidate text is scored against many jobs. CandidateFeatures
+holds everything TalentFinderAI derives from a text (skills, NER entities,
+similarity embedding), filled in lazily as each feature is first needed,
+and FeatureCache keeps them in a thread-safe LRU bounded by entry count
+and approximate memory use.
+
+Usage:
+    from feature_cache import FeatureCache
+    
+    cache = FeatureCache(max_entries=10000, max_bytes=256 * 1024 * 1024)
+    features = cache.get_or_create(text)
+    if features.skills is None:
+        features.skills = extract_skills(text)
+        cache.put(features)
+    cache.stats()   # {"hits": ..., "misses": ..., "hit_rate": ..., ...}
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def feature_key(text: str) -> str:
+    """
+    Cache key for a candidate text.
+    
+    The text is hashed as-is (no whitespace normalization) because NER
+    entity offsets refer to exact character positions.
+    
+    Args:
+        text: Candidate text
+    
+    Returns:
+        Hex SHA-1 digest of the text
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CandidateFeatures:
+    """
+    Features derived from one candidate text. Any feature not computed yet is None.
+    
+    Attributes:
+        key: feature_key() of the text
+        skills: Canonical skills found in the text
+        entities: NER entity dicts for the text
+        embedding: Similarity-model embedding, shape (dim,)
+        skill_bits: The skills packed as a SkillBitset row
+        chunk_sections: Section of each chunk of the text (see sections.chunk_profile)
+        chunk_embeddings: Similarity-model embedding of each chunk, shape (chunks, dim)
+    """
+    
+    __slots__ = ("key", "skills", "entities", "embedding", "skill_bits", "chunk_sections", "chunk_embeddings")
+    
+    def __init__(self, key: str, skills: Optional[List[str]] = None, entities: Optional[List[Dict]] = None, embedding: Optional[np.ndarray] = None, skill_bits: Optional[np.ndarray] = None, chunk_sections: Optional[List[str]] = None, chunk_embeddings: Optional[np.ndarray] = None):
+        self.key = key
+        self.skills = skills
+        self.entities = entities
+        self.embedding = embedding
+        self.skill_bits = skill_bits
+        self.chunk_sections = chunk_sections
+        self.chunk_embeddings = chunk_embeddings
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the features, in bytes."""
+        size = sys.getsizeof(self.key) + 64
+        if self.embedding is not None:
+            size += self.embedding.nbytes
+        if self.skill_bits is not None:
+            size += self.skill_bits.nbytes
+        if self.chunk_embeddings is not None:
+            size += self.chunk_embeddings.nbytes + 8 * len(self.chunk_sections)
+        if self.skills is not None:
+            size += sum(sys.getsizeof(skill) for skill in self.skills)
+        if self.entities is not None:
+            for entity in self.entities:
+                size += sys.getsizeof(entity) + sum(sys.getsizeof(value) for value in entity.values())
+        return size
+
+
+class FeatureCache:
+    """
+    Thread-safe LRU of CandidateFeatures bounded by entries and bytes.
+    
+    Example:
+        cache = FeatureCache(max_entries=5000)
+        features = cache.get_or_create(profile_text)
+    """
+    
+    def __init__(self, max_entries: int = 10000, max_bytes: Optional[int] = None):
+        """
+        Create an empty cache.
+        
+        Args:
+            max_entries: Maximum number of texts kept
+            max_bytes: Optional bound on the approximate memory used
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._entries = OrderedDict()   # key -> (features, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by cached features, in bytes."""
+        return self._bytes
+    
+    def get(self, text: str) -> Optional[CandidateFeatures]:
+        """
+        Look up the features of a text.
+        
+        Args:
+            text: Candidate text
+        
+        Returns:
+            CandidateFeatures, or None on a miss
+        """
+        key = feature_key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def get_or_create(self, text: str) -> CandidateFeatures:
+        """
+        Look up the features of a text, inserting an empty entry on a miss.
+        
+        Args:
+            text: Candidate text
+        
+        Returns:
+            CandidateFeatures (fields are None until computed)
+        """
+        features = self.get(text)
+        if features is None:
+            features = CandidateFeatures(feature_key(text))
+            self.put(features)
+        return features
+    
+    def put(self, features: CandidateFeatures):
+        """
+        Insert features, or refresh their size and recency after filling
+        in more fields.
+        
+        Args:
+            features: Features to store
+        """
+        size = features.nbytes()
+        with self._lock:
+            previous = self._entries.pop(features.key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[features.key] = (features, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict:
+        """
+        Cache counters.
+        
+        Returns:
+            {"entries", "bytes", "hits", "misses", "evictions", "hit_rate"}
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
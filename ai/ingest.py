@@ -0,0 +1,465 @@
+"""
+Ingest - Streaming PDF/DOCX resume ingestion feeding parse_resumes.
+
+Resumes are uploaded by the backend into backend/uploads/resumes/.
+ResumeIngestor scans that directory and extracts the text of new files
+(PDF via pypdf, DOCX from its XML, plain text) in a pool of worker
+processes. The text is normalized (Unicode NFKC, control and zero-width
+characters dropped, whitespace collapsed) and fed to
+TalentFinderAI.parse_resumes in batches as extractions complete.
+
+Extracted text and parse results are cached in a small SQLite file keyed
+by the file's content hash, and each path's (mtime, size) is remembered
+so unchanged files are not even re-read. Re-importing an unchanged
+uploads directory therefore does no extraction, hashing or model work,
+and copies of one file within an import are extracted and parsed once.
+
+Usage:
+    from ingest import ResumeIngestor
+    
+    with ResumeIngestor(finder, workers=4) as ingestor:
+        for record in ingestor.ingest():   # backend/uploads/resumes
+            save(record["path"], record["parsed"])
+    
+    python ingest.py --output parsed.jsonl
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from feature_cache import feature_key
+
+
+_BACKEND_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+DEFAULT_UPLOAD_DIR = os.path.join(_BACKEND_DIR, "uploads", "resumes")
+DEFAULT_CACHE_PATH = os.path.join(_BACKEND_DIR, "data", "resume_ingest.db")
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Control characters (except tab and newline), soft hyphens, zero-width
+# characters and byte order marks left behind by PDF/DOCX text layers
+_INVISIBLE = re.compile(r"[\x00-\x08\x0b\x0e-\x1f\x7f\u00ad\u200b-\u200d\u2060\ufeff]")
+
+
+def _import_pypdf():
+    try:
+        import pypdf
+    except ImportError:
+        raise ImportError("PDF ingestion requires pypdf:\n  pip install pypdf")
+    return pypdf
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize extracted resume text.
+    
+    Args:
+        text: Raw text from a PDF/DOCX text layer
+    
+    Returns:
+        NFKC-normalized text (ligatures, non-breaking and full-width
+        characters folded) without invisible characters, with spaces
+        collapsed within lines and at most one blank line in a row
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n")
+    text = _INVISIBLE.sub("", text)
+    lines = [" ".join(line.split()) for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def decode_bytes(data: bytes) -> str:
+    """Decode a plain-text upload: UTF-8 (with or without BOM), else Windows-1252, else Latin-1."""
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            pass
+    return data.decode("latin-1")
+
+
+def extract_pdf(path: str) -> str:
+    """Text of every page of a PDF, pages separated by blank lines."""
+    pypdf = _import_pypdf()
+    reader = pypdf.PdfReader(path)
+    if reader.is_encrypted:
+        reader.decrypt("")   # Owner-password-only PDFs open with an empty user password
+    
+    pages = []
+    for page in reader.pages:
+        # Layout mode keeps each visual line together; the default mode
+        # puts every text run of word-processor exports on its own line
+        try:
+            pages.append(page.extract_text(extraction_mode="layout") or "")
+        except TypeError:   # pypdf < 4
+            pages.append(page.extract_text() or "")
+    return "\n\n".join(pages)
+
+
+def extract_docx(path: str) -> str:
+    """Text of a DOCX body (paragraphs and table cells), one paragraph per line."""
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD_NS}t":
+                parts.append(node.text or "")
+            elif node.tag == f"{_WORD_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def extract_text(path: str) -> str:
+    """
+    Extract and normalize the text of a resume file.
+    
+    Args:
+        path: .pdf, .docx or .txt file
+    
+    Returns:
+        Normalized text (see normalize_text)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        text = extract_pdf(path)
+    elif extension == ".docx":
+        text = extract_docx(path)
+    elif extension == ".txt":
+        with open(path, "rb") as f:
+            text = decode_bytes(f.read())
+    else:
+        raise ValueError(f"Unsupported resume format '{extension}'. Choose from: {', '.join(SUPPORTED_EXTENSIONS)}")
+    return normalize_text(text)
+
+
+def file_hash(path: str) -> str:
+    """Hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_worker(path: str) -> Tuple[Optional[str], Optional[str]]:
+    # A corrupt upload is recorded as an error instead of failing the import
+    try:
+        return extract_text(path), None
+    except ImportError:
+        raise
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class ResumeIngestor:
+    """
+    Incremental importer of an uploads directory of resume files.
+    
+    Each ingested file yields a record dict:
+    {
+        "path": str,
+        "content_hash": str,
+        "text": Optional[str],      # None if extraction failed
+        "parsed": Optional[Dict],   # parse_resume() result; None without a finder
+        "error": Optional[str],     # extraction error
+        "cached": bool              # True if no extraction or parsing was needed
+    }
+    
+    Example:
+        ingestor = ResumeIngestor(TalentFinderAI(), workers=4)
+        records = list(ingestor.ingest("backend/uploads/resumes"))
+        ingestor.last_stats   # {"files": 120, "unchanged": 118, "extracted": 2, ...}
+    """
+    
+    def __init__(self, finder=None, cache_path: str = DEFAULT_CACHE_PATH, workers: Optional[int] = None, batch_size: int = 16, ner_batch_size: int = 8, max_in_flight: Optional[int] = None, start_method: str = "spawn"):
+        """
+        Open (or create) the ingestion cache.
+        
+        Args:
+            finder: TalentFinderAI used to parse the extracted text, or None
+                to only extract
+            cache_path: SQLite file caching extracted text and parse results
+            workers: Extraction worker processes (default: CPU count)
+            batch_size: Resumes per parse_resumes call
+            ner_batch_size: NER batch size within parse_resumes
+            max_in_flight: Maximum files submitted for extraction but not
+                yet consumed (default: 4 x workers)
+            start_method: multiprocessing start method for the workers
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 4 * self.workers
+        if min(self.workers, batch_size, ner_batch_size, self.max_in_flight) < 1:
+            raise ValueError("workers, batch_size, ner_batch_size and max_in_flight must be at least 1")
+        
+        self.finder = finder
+        self.batch_size = batch_size
+        self.ner_batch_size = ner_batch_size
+        self.start_method = start_method
+        self.last_stats = {}
+        
+        # Parse results are only reused for the same NER model and taxonomy
+        self.parser_key = None
+        if finder is not None:
+            self.parser_key = feature_key(json.dumps({
+                "ner": "dslim/bert-base-NER",
+                "precision": finder.precision,
+                "skills": finder.skill_matcher.taxonomy.skills,
+                "case_sensitive_skills": finder.skill_matcher.taxonomy.exact_terms
+            }, sort_keys=True))
+        
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = cache_path
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtimeNs INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                contentHash TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                contentHash TEXT PRIMARY KEY,
+                text TEXT,
+                error TEXT,
+                parser TEXT,
+                parsed TEXT,
+                updatedAt TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        self.conn.commit()
+    
+    def __enter__(self) -> "ResumeIngestor":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        self.conn.close()
+    
+    @staticmethod
+    def scan(directory: str = DEFAULT_UPLOAD_DIR, recursive: bool = False) -> List[str]:
+        """
+        Resume files in a directory.
+        
+        Args:
+            directory: Uploads directory
+            recursive: Include subdirectories
+        
+        Returns:
+            Sorted absolute paths of files with a supported extension
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Resume directory not found: {directory}")
+        
+        if recursive:
+            paths = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+        else:
+            paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+        return sorted(os.path.abspath(path) for path in paths if path.lower().endswith(SUPPORTED_EXTENSIONS) and os.path.isfile(path))
+    
+    def ingest(self, directory: str = DEFAULT_UPLOAD_DIR, recursive: bool = False, changed_only: bool = True) -> Iterator[Dict]:
+        """
+        Extract and parse the resumes of a directory, reusing cached work.
+        
+        Records stream out as parse batches complete. Files whose path,
+        mtime and size are unchanged since the last import are skipped
+        without being read; files whose contents were seen before (e.g.
+        touched or copied) reuse the cached text and parse result. New
+        files with identical contents are extracted and parsed once, and
+        the copies yield the same record under their own path.
+        
+        Args:
+            directory: Uploads directory
+            recursive: Include subdirectories
+            changed_only: Skip unchanged files. When False, their cached
+                records are yielded too (still without any extraction or
+                parsing).
+        
+        Yields:
+            Record dicts (see class docstring)
+        """
+        stats = {"files": 0, "unchanged": 0, "extracted": 0, "parsed": 0, "failed": 0}
+        self.last_stats = stats
+        
+        to_extract = []   # (path, content hash)
+        to_parse = []     # (path, content hash, text)
+        copies = {}       # content hash queued above -> other paths with the same contents
+        for path in self.scan(directory, recursive=recursive):
+            stats["files"] += 1
+            content_hash, unchanged = self._file_hash(path)
+            if content_hash in copies:
+                copies[content_hash].append(path)
+                continue
+            document = self.conn.execute("SELECT * FROM documents WHERE contentHash = ?", (content_hash,)).fetchone()
+            
+            if document is None:
+                to_extract.append((path, content_hash))
+                copies[content_hash] = []
+            elif document["error"] is None and self.finder is not None and document["parser"] != self.parser_key:
+                to_parse.append((path, content_hash, document["text"]))
+                copies[content_hash] = []
+            else:
+                if unchanged:
+                    stats["unchanged"] += 1
+                if not (unchanged and changed_only):
+                    yield self._record(path, document, cached=True)
+        
+        records = []
+        if to_parse:
+            records.append(self._parse_batches(to_parse, stats))
+        if to_extract:
+            records.append(self._parse_batches(self._extract(to_extract, stats), stats))
+        for record in itertools.chain.from_iterable(records):
+            yield record
+            for path in copies[record["content_hash"]]:
+                if record["error"] is not None:
+                    stats["failed"] += 1
+                yield dict(record, path=path, cached=True)
+    
+    def _file_hash(self, path: str) -> Tuple[str, bool]:
+        """Content hash of a file (from the cache when mtime and size match) and whether it was unchanged."""
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT mtimeNs, size, contentHash FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row["mtimeNs"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+            return row["contentHash"], True
+        
+        content_hash = file_hash(path)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtimeNs, size, contentHash) VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, content_hash)
+            )
+        return content_hash, False
+    
+    def _extract(self, files: List[Tuple[str, str]], stats: Dict) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Extract files in the worker pool, yielding (path, hash, text) in order; failures are cached and yielded with text None."""
+        context = multiprocessing.get_context(self.start_method)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(files)), mp_context=context) as pool:
+            pending = deque()
+            remaining = iter(files)
+            try:
+                while True:
+                    # Backpressure: at most max_in_flight extractions ahead of the parser
+                    for path, content_hash in remaining:
+                        pending.append((path, content_hash, pool.submit(_extract_worker, path)))
+                        if len(pending) >= self.max_in_flight:
+                            break
+                    if not pending:
+                        return
+                    
+                    path, content_hash, future = pending.popleft()
+                    text, error = future.result()
+                    stats["extracted"] += 1
+                    with self.conn:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO documents (contentHash, text, error, parser, parsed, updatedAt) VALUES (?, ?, ?, NULL, NULL, datetime('now'))",
+                            (content_hash, text, error)
+                        )
+                    yield path, content_hash, text
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+    
+    def _parse_batches(self, documents, stats: Dict) -> Iterator[Dict]:
+        """Parse (path, hash, text) items batch_size at a time, caching the results."""
+        batch = []
+        for item in documents:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield from self._parse_batch(batch, stats)
+                batch = []
+        if batch:
+            yield from self._parse_batch(batch, stats)
+    
+    def _parse_batch(self, batch: List[Tuple[str, str, Optional[str]]], stats: Dict) -> Iterator[Dict]:
+        parseable = [(content_hash, text) for _, content_hash, text in batch if text is not None]
+        stats["failed"] += len(batch) - len(parseable)
+        
+        if self.finder is not None and parseable:
+            parsed = self.finder.parse_resumes([text for _, text in parseable], batch_size=self.ner_batch_size)
+            stats["parsed"] += len(parsed)
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE documents SET parser = ?, parsed = ?, updatedAt = datetime('now') WHERE contentHash = ?",
+                    [(self.parser_key, json.dumps(result), content_hash) for (content_hash, _), result in zip(parseable, parsed)]
+                )
+        
+        for path, content_hash, _ in batch:
+            document = self.conn.execute("SELECT * FROM documents WHERE contentHash = ?", (content_hash,)).fetchone()
+            yield self._record(path, document, cached=False)
+    
+    def _record(self, path: str, document: sqlite3.Row, cached: bool) -> Dict:
+        parsed = None
+        if self.finder is not None and document["parsed"] is not None and document["parser"] == self.parser_key:
+            parsed = json.loads(document["parsed"])
+        return {
+            "path": path,
+            "content_hash": document["contentHash"],
+            "text": document["text"],
+            "parsed": parsed,
+            "error": document["error"],
+            "cached": cached
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Extract and parse uploaded PDF/DOCX resumes, skipping unchanged files.")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_UPLOAD_DIR, help="Uploads directory (default: backend/uploads/resumes)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Ingestion cache (default: backend/data/resume_ingest.db)")
+    parser.add_argument("--output", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--workers", type=int, help="Extraction worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Resumes per parse_resumes call")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--all", action="store_true", help="Also output unchanged files (from the cache)")
+    parser.add_argument("--no-parse", action="store_true", help="Only extract text")
+    parser.add_argument("--precision", default="fp32", help="Model precision (fp32 or int8)")
+    args = parser.parse_args(argv)
+    
+    finder = None
+    if not args.no_parse:
+        from talent_finder import TalentFinderAI
+        finder = TalentFinderAI(precision=args.precision, feature_cache_size=0)
+    
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        with ResumeIngestor(finder, cache_path=args.cache, workers=args.workers, batch_size=args.batch_size) as ingestor:
+            for record in ingestor.ingest(args.directory, recursive=args.recursive, changed_only=not args.all):
+                output.write(json.dumps(record) + "\n")
+            stats = ingestor.last_stats
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"{json.dumps(stats)} in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
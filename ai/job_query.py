@@ -0,0 +1,51 @@
+"""
+Job Query - Precomputed features of a job description.
+
+A JobQuery is built once per requisition (TalentFinderAI.build_job_query)
+and passed to the matching and ranking APIs in place of the raw job
+description, so the job's embedding and required skills are computed once
+per session rather than once per candidate.
+
+Usage:
+    query = finder.build_job_query(job_description)
+    finder.match_candidate_to_job(candidate_profile, query)
+    finder.find_top_candidates(query, candidate_list, top_k=5)
+"""
+
+from typing import List
+
+import numpy as np
+
+
+class JobQuery:
+    """
+    Job description plus the features derived from it.
+    
+    Attributes:
+        text: Original job description
+        embedding: Similarity-model embedding of the text, shape (dim,)
+        required_skills: Skills extracted from the text, in order of mention
+        required_skill_set: The same skills as a frozenset
+        model_name: Similarity model the embedding came from
+    """
+    
+    def __init__(self, text: str, embedding: np.ndarray, required_skills: List[str], model_name: str):
+        """
+        Create a job query. Use TalentFinderAI.build_job_query() rather than
+        calling this directly.
+        
+        Args:
+            text: Job description
+            embedding: Embedding of the job description
+            required_skills: Skills extracted from the job description
+            model_name: Similarity model the embedding came from
+        """
+        self.text = text
+        self.embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        self.required_skills = list(required_skills)
+        self.required_skill_set = frozenset(self.required_skills)
+        self.model_name = model_name
+    
+    def __repr__(self) -> str:
+        preview = self.text[:40] + "..." if len(self.text) > 40 else self.text
+        return f"JobQuery({preview!r}, skills={self.required_skills})"
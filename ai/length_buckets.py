@@ -0,0 +1,96 @@
+"""
+Length Buckets - Length-sorted batching for padded model calls.
+
+A batched forward pass pads every item to the longest one in its batch,
+so a batch mixing a 40-token profile with a 500-token resume spends most
+of its compute on padding. bucket_batches() sorts items by token length
+and cuts the sorted order into batches, so each batch holds items of
+similar length; run_bucketed() runs a model over those batches and
+returns the outputs in the original order. An optional token budget caps
+the padded size (batch size x longest item) of each batch, so batches of
+short items can be larger than batches of long ones.
+
+TalentFinderAI runs every batched NER, similarity and summarization call
+through run_bucketed().
+
+Usage:
+    from length_buckets import run_bucketed
+    
+    lengths = [len(ids) for ids in tokenizer(texts)["input_ids"]]
+    outputs = run_bucketed(texts, model_fn, lengths, batch_size=32)   # in texts order
+"""
+
+from typing import Callable, List, Optional, Sequence
+
+
+def bucket_batches(lengths: Sequence[int], batch_size: int, max_tokens: Optional[int] = None) -> List[List[int]]:
+    """
+    Group item indices into batches of similar length.
+    
+    Args:
+        lengths: Token length of each item
+        batch_size: Most items per batch
+        max_tokens: Optional budget of padded tokens per batch
+            (len(batch) x longest length); a single item longer than the
+            budget still gets a batch of its own
+    
+    Returns:
+        Batches of indices into lengths, longest items first; ties keep
+        their input order
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if max_tokens is not None and max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches = []
+    batch = []
+    for i in order:
+        # Longest first, so the first item of a batch sets its padded length
+        if batch and (len(batch) >= batch_size or (max_tokens is not None and (len(batch) + 1) * lengths[batch[0]] > max_tokens)):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def run_bucketed(items: Sequence, run_batch: Callable[[List], Sequence], lengths: Sequence[int], batch_size: int, max_tokens: Optional[int] = None) -> List:
+    """
+    Run a batch function over length-bucketed batches.
+    
+    Args:
+        items: Inputs
+        run_batch: Function mapping a list of inputs to one output per input
+        lengths: Token length of each item
+        batch_size: Most items per run_batch call
+        max_tokens: Optional padded-token budget per call (see bucket_batches)
+    
+    Returns:
+        List of outputs, in the same order as items
+    """
+    if len(lengths) != len(items):
+        raise ValueError("lengths must have one entry per item")
+    
+    outputs = [None] * len(items)
+    for batch in bucket_batches(lengths, batch_size, max_tokens):
+        for i, output in zip(batch, run_batch([items[i] for i in batch])):
+            outputs[i] = output
+    return outputs
+
+
+def padding_efficiency(lengths: Sequence[int], batches: List[List[int]]) -> float:
+    """
+    Share of the padded tokens of a batching that are real tokens.
+    
+    Args:
+        lengths: Token length of each item
+        batches: Batches of indices into lengths
+    
+    Returns:
+        Real tokens / padded tokens (1.0 means no padding)
+    """
+    padded = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches if batch)
+    return sum(lengths) / padded if padded else 1.0
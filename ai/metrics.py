@@ -0,0 +1,471 @@
+"""
+Metrics - Hot-path instrumentation for TalentFinderAI.
+
+Metrics records three kinds of measurements and hands each one, as an
+event dict, to its sinks:
+- timers: durations with an optional item count, e.g. one per public
+  method call ("method", nested calls labelled with their parent), one
+  per batched model call ("model_call") and the model forward passes
+  inside it ("forward"), so pre/post-processing time is model_call
+  minus forward time and throughput is items / seconds
+- observations: values such as batch sizes (count, sum, min, max)
+- gauges: point-in-time values such as cache hit rates, pulled from
+  registered collectors whenever a snapshot is taken
+
+Sinks:
+- InMemorySink: aggregates events; snapshot() returns the aggregates and
+  render_prometheus() the same aggregates in the Prometheus text format
+- PrometheusSink: an InMemorySink with its own metric name prefix
+- JsonLogSink: writes every event as one JSON line to a logger or stream
+
+Usage:
+    from metrics import InMemorySink, JsonLogSink, Metrics
+    
+    finder = TalentFinderAI(metrics=Metrics(sinks=[InMemorySink(), JsonLogSink()]))
+    finder.parse_resumes(texts)
+    finder.metrics.snapshot()            # {"timers": {...}, "observations": {...}, "gauges": {...}}
+    finder.metrics.render_prometheus()   # "# TYPE talent_finder_method_seconds summary\\n..."
+"""
+
+import abc
+import functools
+import json
+import logging
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+PROMETHEUS_PREFIX = "talent_finder"
+
+# (name, labels, value) tuples returned by a collector
+Gauge = Tuple[str, Dict[str, str], float]
+
+
+def _series(name: str, labels: Dict[str, str]) -> str:
+    """Series key like 'forward{model="ner"}' (labels sorted)."""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+class MetricsSink(abc.ABC):
+    """Receives every measurement event of a Metrics instance."""
+    
+    @abc.abstractmethod
+    def emit(self, event: Dict):
+        """Handle one event dict ({"type", "name", "labels", "ts", ...})."""
+
+
+class InMemorySink(MetricsSink):
+    """
+    Aggregates events per series in memory.
+    
+    Example:
+        sink = InMemorySink()
+        metrics = Metrics(sinks=[sink])
+        sink.snapshot()["timers"]['method{method="encode"}']   # {"count": 3, "seconds": ...}
+    """
+    
+    def __init__(self):
+        self._timers = {}
+        self._observations = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+    
+    def emit(self, event: Dict):
+        key = (event["name"], tuple(sorted(event["labels"].items())))
+        with self._lock:
+            if event["type"] == "timer":
+                timer = self._timers.setdefault(key, {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "items": 0})
+                timer["count"] += 1
+                timer["seconds"] += event["seconds"]
+                timer["max_seconds"] = max(timer["max_seconds"], event["seconds"])
+                timer["items"] += event.get("items") or 0
+            elif event["type"] == "observation":
+                value = event["value"]
+                observation = self._observations.setdefault(key, {"count": 0, "sum": 0.0, "min": value, "max": value})
+                observation["count"] += 1
+                observation["sum"] += value
+                observation["min"] = min(observation["min"], value)
+                observation["max"] = max(observation["max"], value)
+            else:
+                self._gauges[key] = event["value"]
+    
+    def snapshot(self) -> Dict:
+        """
+        Current aggregates.
+        
+        Returns:
+            {
+                "timers": {series: {"count", "seconds", "max_seconds", "items", "items_per_second"}},
+                "observations": {series: {"count", "sum", "min", "max", "mean"}},
+                "gauges": {series: value}
+            }
+            where series is the name with its labels, e.g. 'forward{model="ner"}'
+        """
+        timers, observations, gauges = self._items()
+        for timer in timers.values():
+            timer["items_per_second"] = timer["items"] / timer["seconds"] if timer["seconds"] else 0.0
+        for observation in observations.values():
+            observation["mean"] = observation["sum"] / observation["count"]
+        return {
+            "timers": {_series(name, dict(labels)): value for (name, labels), value in timers.items()},
+            "observations": {_series(name, dict(labels)): value for (name, labels), value in observations.items()},
+            "gauges": {_series(name, dict(labels)): value for (name, labels), value in gauges.items()}
+        }
+    
+    def render_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """
+        Current aggregates in the Prometheus text format (version 0.0.4).
+        
+        Timers become summaries <prefix>_<name>_seconds (sum and count) plus
+        an <prefix>_<name>_items_total counter, observations become
+        summaries <prefix>_<name>, and gauges become gauges <prefix>_<name>.
+        
+        Args:
+            prefix: Prefix of every metric name
+        
+        Returns:
+            Exposition text, ending with a newline
+        """
+        timers, observations, gauges = self._items()
+        lines = []
+        
+        def metric(name: str) -> str:
+            return re.sub(r"[^a-zA-Z0-9_:]", "_", f"{prefix}_{name}")
+        
+        def entries(aggregates: Dict, name: str) -> List[Tuple[Dict, object]]:
+            return sorted(((dict(labels), value) for (key, labels), value in aggregates.items() if key == name), key=lambda entry: sorted(entry[0].items()))
+        
+        for name in sorted({name for name, _ in timers}):
+            seconds, items = metric(f"{name}_seconds"), metric(f"{name}_items_total")
+            lines.append(f"# TYPE {seconds} summary")
+            for labels, timer in entries(timers, name):
+                lines.append(f"{_series(seconds + '_sum', labels)} {timer['seconds']!r}")
+                lines.append(f"{_series(seconds + '_count', labels)} {timer['count']}")
+            lines.append(f"# TYPE {items} counter")
+            lines.extend(f"{_series(items, labels)} {timer['items']}" for labels, timer in entries(timers, name))
+        
+        for name in sorted({name for name, _ in observations}):
+            summary = metric(name)
+            lines.append(f"# TYPE {summary} summary")
+            for labels, observation in entries(observations, name):
+                lines.append(f"{_series(summary + '_sum', labels)} {float(observation['sum'])!r}")
+                lines.append(f"{_series(summary + '_count', labels)} {observation['count']}")
+        
+        for name in sorted({name for name, _ in gauges}):
+            gauge = metric(name)
+            lines.append(f"# TYPE {gauge} gauge")
+            lines.extend(f"{_series(gauge, labels)} {float(value)!r}" for labels, value in entries(gauges, name))
+        
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        """Drop every aggregate."""
+        with self._lock:
+            self._timers.clear()
+            self._observations.clear()
+            self._gauges.clear()
+    
+    def _items(self):
+        with self._lock:
+            timers = {key: dict(value) for key, value in self._timers.items()}
+            observations = {key: dict(value) for key, value in self._observations.items()}
+            return timers, observations, dict(self._gauges)
+
+
+class PrometheusSink(InMemorySink):
+    """
+    An InMemorySink with its own Prometheus metric name prefix.
+    
+    Every InMemorySink renders the Prometheus text format; this one
+    renders with its prefix, also through Metrics.render_prometheus().
+    """
+    
+    def __init__(self, prefix: str = PROMETHEUS_PREFIX):
+        super().__init__()
+        self.prefix = prefix
+    
+    def render(self) -> str:
+        """Current aggregates in the Prometheus text format, with this sink's prefix."""
+        return self.render_prometheus(self.prefix)
+
+
+class JsonLogSink(MetricsSink):
+    """
+    Writes each event as one JSON line.
+    
+    Example:
+        JsonLogSink()                   # logging.getLogger("talent_finder.metrics"), INFO
+        JsonLogSink(stream=sys.stderr)  # plain lines on a stream
+    """
+    
+    def __init__(self, logger: Optional[logging.Logger] = None, stream=None, level: int = logging.INFO):
+        """
+        Args:
+            logger: Logger to write to (default: "talent_finder.metrics")
+            stream: Write to this file-like object instead of a logger
+            level: Log level of the records
+        """
+        self.logger = logger or logging.getLogger("talent_finder.metrics")
+        self.stream = stream
+        self.level = level
+        self._lock = threading.Lock()
+    
+    def emit(self, event: Dict):
+        line = json.dumps(event, default=str)
+        if self.stream is None:
+            self.logger.log(self.level, line)
+        else:
+            with self._lock:
+                self.stream.write(line + "\n")
+                self.stream.flush()
+
+
+class Metrics:
+    """
+    Measurement front end: records timers, observations and gauges and fans them out to sinks.
+    
+    Example:
+        metrics = Metrics()
+        with metrics.timer("forward", items=len(batch), model="ner"):
+            run(batch)
+        metrics.snapshot()
+    """
+    
+    def __init__(self, sinks: Optional[List[MetricsSink]] = None, enabled: bool = True):
+        """
+        Args:
+            sinks: Where events go (default: one InMemorySink)
+            enabled: When False, measurements are skipped entirely
+        """
+        self.sinks = list(sinks) if sinks is not None else [InMemorySink()]
+        self.enabled = enabled
+        self._collectors = []   # (collector or weak reference to a bound method, labels)
+        self._collectors_lock = threading.Lock()
+    
+    def add_sink(self, sink: MetricsSink):
+        self.sinks.append(sink)
+    
+    def add_collector(self, collector: Callable[[], List[Gauge]], **labels):
+        """
+        Register a function returning (name, labels, value) gauges, called on every collect().
+        
+        Bound methods are held weakly, so an object collecting its own
+        gauges into a shared Metrics drops out once it is garbage.
+        
+        Args:
+            collector: Function returning a list of gauges
+            **labels: Labels added to every gauge of this collector, to keep
+                the gauges of several collectors apart (e.g. finder="1")
+        """
+        reference = weakref.WeakMethod(collector) if hasattr(collector, "__self__") else collector
+        with self._collectors_lock:
+            self._collectors.append((reference, labels))
+    
+    def remove_collector(self, collector: Callable[[], List[Gauge]]):
+        """Unregister a collector added with add_collector()."""
+        with self._collectors_lock:
+            self._collectors = [(reference, labels) for reference, labels in self._collectors if self._resolve(reference) != collector]
+    
+    @staticmethod
+    def _resolve(reference) -> Optional[Callable]:
+        return reference() if isinstance(reference, weakref.WeakMethod) else reference
+    
+    def _emit(self, event: Dict):
+        for sink in self.sinks:
+            sink.emit(event)
+    
+    @contextmanager
+    def timer(self, name: str, items: Optional[int] = None, **labels):
+        """
+        Time a block.
+        
+        Args:
+            name: Timer name (e.g. "method", "forward")
+            items: Items processed by the block, for throughput
+            **labels: Series labels (e.g. method="encode")
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, items, **labels)
+    
+    def record(self, name: str, seconds: float, items: Optional[int] = None, **labels):
+        """Record a duration measured elsewhere (see timer())."""
+        if self.enabled:
+            self._emit({"type": "timer", "name": name, "labels": labels, "seconds": seconds, "items": items, "ts": time.time()})
+    
+    def observe(self, name: str, value: float, **labels):
+        """Record one value of a distribution (e.g. a batch size)."""
+        if self.enabled:
+            self._emit({"type": "observation", "name": name, "labels": labels, "value": value, "ts": time.time()})
+    
+    def gauge(self, name: str, value: float, **labels):
+        """Set a gauge."""
+        if self.enabled:
+            self._emit({"type": "gauge", "name": name, "labels": labels, "value": value, "ts": time.time()})
+    
+    def collect(self):
+        """Pull every collector's gauges into the sinks."""
+        if not self.enabled:
+            return
+        with self._collectors_lock:
+            self._collectors = [(reference, labels) for reference, labels in self._collectors if self._resolve(reference) is not None]
+            collectors = [(self._resolve(reference), labels) for reference, labels in self._collectors]
+        for collector, collector_labels in collectors:
+            if collector is None:
+                continue
+            for name, labels, value in collector():
+                self.gauge(name, value, **{**labels, **collector_labels})
+    
+    def snapshot(self) -> Dict:
+        """
+        Collect gauges, then return the first in-memory sink's aggregates.
+        
+        Returns:
+            InMemorySink.snapshot() format, or {} without an in-memory sink
+        """
+        self.collect()
+        for sink in self.sinks:
+            if isinstance(sink, InMemorySink):
+                return sink.snapshot()
+        return {}
+    
+    def render_prometheus(self) -> str:
+        """
+        Collect gauges, then render the first in-memory sink's aggregates in the Prometheus text format.
+        
+        Returns:
+            Exposition text ("" without an in-memory sink); a PrometheusSink
+            renders with its own prefix
+        """
+        self.collect()
+        for sink in self.sinks:
+            if isinstance(sink, PrometheusSink):
+                return sink.render()
+            if isinstance(sink, InMemorySink):
+                return sink.render_prometheus()
+        return ""
+
+
+class ForwardTimer:
+    """
+    Forward hooks on a torch module that add up its forward-pass time per thread.
+    
+    Besides the top-level module, the encoder and decoder of an
+    encoder-decoder model are hooked: generate() runs the encoder directly
+    rather than through the model's forward, and then calls the model
+    once per decoding step. Only the outermost hooked call in progress is
+    timed, so a forward pass that runs a hooked submodule is not counted
+    twice.
+    
+    Example:
+        forward = ForwardTimer(model)
+        with forward.measure() as measured:
+            pipeline(texts)
+        measured.seconds   # time spent inside the model's forward passes
+        forward.remove()   # detach the hooks
+    """
+    
+    def __init__(self, module):
+        self.module = module
+        self._local = threading.local()
+        
+        self.modules = [module]
+        for getter in ("get_encoder", "get_decoder"):
+            part = getattr(module, getter, None)
+            part = part() if callable(part) else None
+            if part is not None and hasattr(part, "register_forward_hook") and all(part is not hooked for hooked in self.modules):
+                self.modules.append(part)
+        self._handles = []
+        for hooked in self.modules:
+            self._handles.append(hooked.register_forward_pre_hook(self._started))
+            self._handles.append(hooked.register_forward_hook(self._finished))
+    
+    def remove(self):
+        """Detach the hooks; later measurements of this timer read 0."""
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+    
+    def _started(self, module, inputs):
+        depth = getattr(self._local, "depth", 0)
+        if not depth:
+            self._local.started = time.perf_counter()
+        self._local.depth = depth + 1
+    
+    def _finished(self, module, inputs, output):
+        self._local.depth -= 1
+        measured = getattr(self._local, "measured", None)
+        if measured is not None and not self._local.depth:
+            measured.seconds += time.perf_counter() - self._local.started
+    
+    @contextmanager
+    def measure(self):
+        """Yield an object whose seconds attribute adds up the forward passes run in the block on this thread."""
+        measured = _Measured()
+        # A forward pass that raised never ran its post hook
+        self._local.depth = 0
+        self._local.measured = measured
+        try:
+            yield measured
+        finally:
+            self._local.measured = None
+
+
+class _Measured:
+    __slots__ = ("seconds",)
+    
+    def __init__(self):
+        self.seconds = 0.0
+
+
+# Names of the timed() calls in progress on the current thread, outermost first
+_timed_calls = threading.local()
+
+
+def timed(items: Optional[Callable[..., Optional[int]]] = None):
+    """
+    Decorator timing a TalentFinderAI method as timer "method" with method=<name>.
+    
+    A timed method called by another one on the same thread (parse_resume
+    -> parse_resumes) is recorded too, with parent=<calling method>. The
+    series without a parent label add up to the time spent in the public
+    API; nested series break it down without counting it twice.
+    
+    Args:
+        items: Optional function of the call's arguments returning the
+            number of items processed (e.g. lambda texts, *args, **kwargs: len(texts))
+    """
+    def decorator(method):
+        name = method.__name__
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if not metrics.enabled:
+                return method(self, *args, **kwargs)
+            stack = getattr(_timed_calls, "stack", None)
+            if stack is None:
+                stack = _timed_calls.stack = []
+            
+            labels = {"method": name}
+            if stack:
+                labels["parent"] = stack[-1]
+            stack.append(name)
+            try:
+                with metrics.timer("method", items=items(*args, **kwargs) if items else None, **labels):
+                    return method(self, *args, **kwargs)
+            finally:
+                stack.pop()
+        return wrapper
+    return decorator
@@ -0,0 +1,314 @@
+"""
+Micro Batch - Coalesce concurrent requests into batched model calls.
+
+Model calls are much cheaper per item in a batch than one at a time, but
+callers (HTTP handlers, worker threads, asyncio tasks) arrive one request
+at a time. Both batchers here collect requests for up to max_wait_ms, or
+until max_batch items are waiting, run one batched call, and hand each
+caller back its own slice of the results. When a batched call raises,
+each caller's items are retried on their own, so one bad request fails
+only its own caller:
+
+- MicroBatcher serves blocking callers on any number of threads from one
+  scheduler thread (used in front of the similarity model).
+- AsyncMicroBatcher serves awaits on an event loop and runs the batched
+  call on an executor, so the loop is never blocked by the model.
+
+Usage:
+    from micro_batch import AsyncMicroBatcher, MicroBatcher
+    
+    batcher = MicroBatcher(model.encode, max_batch=32, max_wait_ms=5)
+    embeddings = batcher.run(["Python developer"])   # from any thread
+    
+    batcher = AsyncMicroBatcher(finder.parse_resumes, executor, max_batch=16, max_wait_ms=5)
+    parsed = await batcher.submit(resume_text)
+"""
+
+import asyncio
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, List, Optional
+
+
+class _Request:
+    """Items submitted together by one caller, and the future for their results."""
+    
+    __slots__ = ("items", "future")
+    
+    def __init__(self, items: List):
+        self.items = items
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    Batches list-in, list-out calls made concurrently from many threads.
+    
+    Example:
+        batcher = MicroBatcher(lambda texts: model.encode(texts), max_batch=64, max_wait_ms=2)
+        embeddings = batcher.run(texts)
+    """
+    
+    def __init__(self, batch_fn: Callable[[List], Any], max_batch: int = 32, max_wait_ms: float = 5.0, name: str = "micro-batcher"):
+        """
+        Create a batcher. The scheduler thread starts on the first request.
+        
+        Args:
+            batch_fn: Function mapping a list of items to results of the
+                same length and order (a list or an array); results are
+                sliced back to each caller
+            max_batch: Run a batch as soon as this many items are waiting
+            max_wait_ms: Longest the first request of a batch waits for others
+            name: Scheduler thread name
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        
+        # Each scheduler thread gets its own queue, so close() can stop one
+        # while the next request starts a fresh one
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of items per batch run so far."""
+        return self.items / self.batches if self.batches else 0.0
+    
+    def submit(self, items: List) -> Future:
+        """
+        Queue items for the next batch.
+        
+        Args:
+            items: Inputs to batch_fn
+        
+        Returns:
+            Future resolving to batch_fn's results for these items
+            (usable from asyncio through asyncio.wrap_future)
+        """
+        request = _Request(list(items))
+        with self._lock:
+            if self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._serve, args=(self._queue,), name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put(request)
+        return request.future
+    
+    def run(self, items: List) -> Any:
+        """
+        Get batch_fn's results for items, batched with concurrent callers.
+        
+        A request of max_batch items or more is already a full batch and
+        runs directly on the calling thread.
+        
+        Args:
+            items: Inputs to batch_fn
+        
+        Returns:
+            batch_fn's results for the items
+        """
+        if len(items) >= self.max_batch:
+            return self.batch_fn(list(items))
+        return self.submit(items).result()
+    
+    def close(self):
+        """Stop the scheduler thread after the queued requests are served."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+    
+    def _serve(self, requests: queue.Queue):
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            
+            batch = [request]
+            size = len(request.items)
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.items)
+            
+            self._run(batch, size)
+            if stop:
+                return
+    
+    def _run(self, batch: List[_Request], size: int):
+        self.batches += 1
+        self.items += size
+        try:
+            results = self.batch_fn([item for request in batch for item in request.items])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            # Retry each caller alone so only the failing ones see an error
+            for request, (result, error) in zip(batch, _run_each(self.batch_fn, [request.items for request in batch])):
+                if error is None:
+                    request.future.set_result(result)
+                else:
+                    request.future.set_exception(error)
+            return
+        
+        offset = 0
+        for request in batch:
+            request.future.set_result(results[offset:offset + len(request.items)])
+            offset += len(request.items)
+
+
+def _run_each(batch_fn: Callable[[List], Any], groups: List[List]) -> List[tuple]:
+    """Run batch_fn on each group separately; one (results, None) or (None, exception) per group."""
+    outcomes = []
+    for items in groups:
+        try:
+            outcomes.append((batch_fn(items), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+class _LoopQueue:
+    """Items waiting for the next batch on one event loop."""
+    
+    def __init__(self):
+        self.items = []
+        self.futures = []
+        self.timer = None
+
+
+class AsyncMicroBatcher:
+    """
+    Batches concurrent awaits of a list-in, list-out function.
+    
+    Example:
+        batcher = AsyncMicroBatcher(lambda texts: model.encode(texts), executor)
+        embedding = await batcher.submit("Python developer")
+    """
+    
+    def __init__(self, batch_fn: Callable[[List], List], executor: Optional[Executor] = None, max_batch: int = 32, max_wait_ms: float = 5.0):
+        """
+        Create a batcher.
+        
+        Args:
+            batch_fn: Function mapping a list of items to a list of results
+                of the same length, in the same order
+            executor: Executor batch_fn runs on (default: the loop's default executor)
+            max_batch: Run a batch as soon as this many items are waiting
+            max_wait_ms: Longest an item waits for others to join its batch
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        
+        # Futures belong to one event loop, so each loop batches separately
+        self._queues = weakref.WeakKeyDictionary()
+        # The event loop only keeps weak references to tasks
+        self._tasks = set()
+    
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of items per batch run so far."""
+        return self.items / self.batches if self.batches else 0.0
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Add an item to the next batch and wait for its result.
+        
+        Args:
+            item: One input to batch_fn
+        
+        Returns:
+            batch_fn's result for the item
+        
+        Raises:
+            Whatever batch_fn raised for this item; when a batch fails, its
+            items are retried one at a time, so other items' errors are
+            not shared
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = _LoopQueue()
+        
+        future = loop.create_future()
+        queue.items.append(item)
+        queue.futures.append(future)
+        
+        if len(queue.items) >= self.max_batch:
+            self._flush(loop, queue)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.max_wait, self._flush, loop, queue)
+        
+        return await future
+    
+    def _flush(self, loop: asyncio.AbstractEventLoop, queue: _LoopQueue):
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        items, futures = queue.items, queue.futures
+        queue.items, queue.futures = [], []
+        if items:
+            task = loop.create_task(self._run(loop, items, futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, loop: asyncio.AbstractEventLoop, items: List, futures: List[asyncio.Future]):
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await loop.run_in_executor(self.executor, self.batch_fn, items)
+        except Exception as e:
+            if len(items) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(e)
+                return
+            outcomes = await loop.run_in_executor(self.executor, _run_each, self.batch_fn, [[item] for item in items])
+            for future, (result, error) in zip(futures, outcomes):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(result[0])
+                else:
+                    future.set_exception(error)
+            return
+        
+        for future, result in zip(futures, results):
+            # A caller may have been cancelled while its batch ran
+            if not future.done():
+                future.set_result(result)
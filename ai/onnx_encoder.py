@@ -0,0 +1,295 @@
+"""
+ONNX Encoder - ONNX Runtime CPU backend for sentence-transformers models.
+
+Exports a SentenceTransformer (transformer + pooling + optional
+normalization) to a single ONNX graph and runs it with ONNX Runtime's
+graph optimizations. The exported graph, ORT's optimized graph and the
+tokenizer are cached on disk, so later processes start without loading
+PyTorch weights at all.
+
+OnnxSentenceEncoder implements the part of the SentenceTransformer API
+TalentFinderAI uses (encode, get_sentence_embedding_dimension), and export
+checks that its embeddings match the PyTorch model's before the graph is
+cached. With precision="int8", a dynamically quantized copy of the graph
+is written next to it and served instead.
+
+Usage:
+    from onnx_encoder import OnnxSentenceEncoder
+    
+    encoder = OnnxSentenceEncoder.load_or_export("all-MiniLM-L6-v2", "~/.cache/talent_finder/onnx")
+    embeddings = encoder.encode(["Senior Python engineer", "Data scientist"])
+
+Requires:
+    pip install onnxruntime onnx
+"""
+
+import inspect
+import json
+import os
+import re
+from typing import List, Optional, Union
+
+import numpy as np
+
+
+METADATA_FILE = "encoder.json"
+MODEL_FILE = "model.onnx"
+OPTIMIZED_MODEL_FILE = "model.optimized.onnx"
+INT8_MODEL_FILE = "model.int8.onnx"
+INT8_OPTIMIZED_MODEL_FILE = "model.int8.optimized.onnx"
+
+EQUIVALENCE_SAMPLES = [
+    "Senior Python engineer with AWS, Docker and Kubernetes experience.",
+    "Registered nurse",
+    "Led a team of 12 building data pipelines in Spark and SQL for a Fortune 500 retailer; "
+    "mentored junior engineers and owned the migration from on-prem Hadoop to GCP."
+]
+
+
+def _import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError:
+        raise ImportError("The ONNX embedding backend requires onnxruntime:\n  pip install onnxruntime onnx")
+    return onnxruntime
+
+
+def cache_path(cache_dir: str, model_name: str) -> str:
+    """
+    Directory holding the cached export of a model.
+    
+    Args:
+        cache_dir: Root cache directory
+        model_name: SentenceTransformer model name or path
+    
+    Returns:
+        Per-model cache directory
+    """
+    return os.path.join(os.path.expanduser(cache_dir), re.sub(r"[^A-Za-z0-9._-]+", "_", model_name))
+
+
+def quantize_export(model_dir: str):
+    """
+    Write a dynamically int8-quantized copy of an exported graph.
+    
+    Args:
+        model_dir: Directory written by OnnxSentenceEncoder.export()
+    """
+    _import_onnxruntime()
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(os.path.join(model_dir, MODEL_FILE), os.path.join(model_dir, INT8_MODEL_FILE), weight_type=QuantType.QInt8)
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence embedding model served by ONNX Runtime.
+    
+    Example:
+        encoder = OnnxSentenceEncoder.load_or_export("all-MiniLM-L6-v2", "./onnx-cache")
+        encoder.encode("Python developer").shape   # (384,)
+    """
+    
+    def __init__(self, model_dir: str, intra_op_threads: Optional[int] = None, precision: str = "fp32"):
+        """
+        Load a cached export.
+        
+        Args:
+            model_dir: Directory written by export()
+            intra_op_threads: ONNX Runtime intra-op thread count (default: ORT's choice)
+            precision: "fp32", or "int8" for the graph written by quantize_export()
+        """
+        onnxruntime = _import_onnxruntime()
+        from transformers import AutoTokenizer
+        
+        with open(os.path.join(model_dir, METADATA_FILE), "r", encoding="utf-8") as f:
+            self.metadata = json.load(f)
+        
+        self.model_dir = model_dir
+        self.precision = precision
+        self.max_seq_length = self.metadata["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        
+        if precision == "int8":
+            model_path, optimized_path = os.path.join(model_dir, INT8_MODEL_FILE), os.path.join(model_dir, INT8_OPTIMIZED_MODEL_FILE)
+        else:
+            model_path, optimized_path = os.path.join(model_dir, MODEL_FILE), os.path.join(model_dir, OPTIMIZED_MODEL_FILE)
+        
+        if not os.path.exists(optimized_path):
+            # Cache the hardware-independent graph optimizations (fusions,
+            # constant folding); layout optimizations are applied per machine
+            # when the session below is created
+            offline = onnxruntime.SessionOptions()
+            offline.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            offline.optimized_model_filepath = optimized_path
+            onnxruntime.InferenceSession(model_path, offline, providers=["CPUExecutionProvider"])
+        
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        
+        self.session = onnxruntime.InferenceSession(optimized_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = [graph_input.name for graph_input in self.session.get_inputs()]
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.metadata["dim"]
+    
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """
+        Embed sentences.
+        
+        Args:
+            sentences: A sentence or list of sentences
+            batch_size: Sentences per ONNX Runtime run
+        
+        Returns:
+            float32 array of shape (dim,) for one sentence or (n, dim) for a list
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        
+        # Longest first, like SentenceTransformer, so batches pad less
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.tokenizer(
+                [texts[i] for i in batch],
+                padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np"
+            )
+            embeddings[batch] = self.embed(features)
+        
+        return embeddings[0] if single else embeddings
+    
+    def embed(self, features) -> np.ndarray:
+        """
+        Embed an already tokenized and padded batch.
+        
+        Args:
+            features: Tokenizer output with input_ids, attention_mask (and
+                token_type_ids) arrays of shape (batch, length)
+        
+        Returns:
+            float32 array of shape (batch, dim)
+        """
+        feeds = {name: np.asarray(features[name], dtype=np.int64) for name in self._input_names}
+        return self.session.run(["sentence_embedding"], feeds)[0]
+    
+    @classmethod
+    def export(cls, model, model_dir: str, opset_version: int = 14, atol: float = 1e-4):
+        """
+        Export a SentenceTransformer to an ONNX graph and verify it.
+        
+        Args:
+            model: Loaded SentenceTransformer (Transformer, Pooling[, Normalize])
+            model_dir: Directory to write the graph, tokenizer and metadata to
+            opset_version: ONNX opset
+            atol: Maximum absolute difference allowed between PyTorch and
+                ONNX Runtime embeddings on a sample set
+        
+        Raises:
+            ValueError: If the model's pooling is unsupported or the exported
+                graph's embeddings do not match the PyTorch model's
+        """
+        import torch
+        
+        transformer, pooling = model[0], model[1]
+        if pooling.pooling_mode_mean_tokens:
+            pooling_mode = "mean"
+        elif pooling.pooling_mode_cls_token:
+            pooling_mode = "cls"
+        else:
+            raise ValueError("Only mean and CLS pooling can be exported to ONNX")
+        normalize = any(type(module).__name__ == "Normalize" for module in list(model)[2:])
+        
+        class _SentenceEmbedding(torch.nn.Module):
+            def __init__(self, auto_model):
+                super().__init__()
+                self.auto_model = auto_model
+            
+            def forward(self, input_ids, attention_mask, token_type_ids=None):
+                inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+                if token_type_ids is not None:
+                    inputs["token_type_ids"] = token_type_ids
+                hidden = self.auto_model(**inputs)[0]
+                if pooling_mode == "cls":
+                    embedding = hidden[:, 0]
+                else:
+                    mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+                    embedding = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+                if normalize:
+                    embedding = torch.nn.functional.normalize(embedding, p=2, dim=1)
+                return embedding
+        
+        os.makedirs(model_dir, exist_ok=True)
+        tokenizer = transformer.tokenizer
+        sample = tokenizer(EQUIVALENCE_SAMPLES[:2], padding=True, return_tensors="pt")
+        input_names = ["input_ids", "attention_mask"] + (["token_type_ids"] if "token_type_ids" in sample else [])
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["sentence_embedding"] = {0: "batch"}
+        
+        # Newer torch defaults to the dynamo exporter; keep the TorchScript one
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_kwargs["dynamo"] = False
+        
+        wrapper = _SentenceEmbedding(transformer.auto_model).eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper,
+                tuple(sample[name] for name in input_names),
+                os.path.join(model_dir, MODEL_FILE),
+                input_names=input_names,
+                output_names=["sentence_embedding"],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset_version,
+                **export_kwargs
+            )
+        
+        tokenizer.save_pretrained(model_dir)
+        metadata = {
+            "max_seq_length": transformer.max_seq_length,
+            "dim": model.get_sentence_embedding_dimension(),
+            "pooling": pooling_mode,
+            "normalize": normalize
+        }
+        with open(os.path.join(model_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        
+        encoder = cls(model_dir)
+        expected = np.asarray(model.encode(EQUIVALENCE_SAMPLES), dtype=np.float32)
+        difference = float(np.abs(encoder.encode(EQUIVALENCE_SAMPLES) - expected).max())
+        if difference > atol:
+            os.remove(os.path.join(model_dir, METADATA_FILE))
+            raise ValueError(f"ONNX export differs from the PyTorch model by {difference:.2e} (> {atol:.0e})")
+        return encoder
+    
+    @classmethod
+    def load_or_export(cls, model_name: str, cache_dir: str, intra_op_threads: Optional[int] = None, verbose: bool = False, precision: str = "fp32") -> "OnnxSentenceEncoder":
+        """
+        Load the cached ONNX export of a model, exporting it first if needed.
+        
+        Args:
+            model_name: SentenceTransformer model name or path
+            cache_dir: Root cache directory
+            intra_op_threads: ONNX Runtime intra-op thread count
+            verbose: Print export progress
+            precision: "fp32", or "int8" to quantize the exported graph
+        
+        Returns:
+            OnnxSentenceEncoder
+        """
+        _import_onnxruntime()
+        model_dir = cache_path(cache_dir, model_name)
+        if not os.path.exists(os.path.join(model_dir, METADATA_FILE)):
+            from sentence_transformers import SentenceTransformer
+            
+            if verbose:
+                print(f"  Exporting {model_name} to ONNX ({model_dir})...")
+            cls.export(SentenceTransformer(model_name, device="cpu"), model_dir)
+        if precision == "int8" and not os.path.exists(os.path.join(model_dir, INT8_MODEL_FILE)):
+            if verbose:
+                print(f"  Quantizing {model_name} ONNX graph to int8...")
+            quantize_export(model_dir)
+        return cls(model_dir, intra_op_threads=intra_op_threads, precision=precision)
@@ -0,0 +1,175 @@
+"""
+Quantization - Dynamic int8 quantization and accuracy checks.
+
+TalentFinderAI(precision="int8") replaces the nn.Linear layers of the NER,
+similarity and summarization models with dynamically quantized int8
+versions: weights are stored as int8 and activations are quantized on the
+fly, which cuts model memory roughly 4x for the linear layers and speeds
+up CPU inference. Embeddings and scores change slightly, so
+compare_precisions() measures how far the int8 models drift from fp32 on a
+sample set (embedding cosine, top-k overlap, rank correlation, NER and
+summary agreement).
+
+Usage:
+    python quantization.py --profiles 200 --jobs 5
+    
+    from quantization import compare_precisions
+    report = compare_precisions(TalentFinderAI(), TalentFinderAI(precision="int8"), profiles, jobs)
+"""
+
+import argparse
+import json
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+PRECISIONS = ("fp32", "int8")
+
+
+def quantize_dynamic(model):
+    """
+    Dynamically quantize the linear layers of a PyTorch model to int8.
+    
+    Args:
+        model: torch.nn.Module (e.g. a SentenceTransformer or HF model)
+    
+    Returns:
+        Quantized model in eval mode
+    """
+    import torch
+    
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[np.argsort(values, kind="stable")] = np.arange(len(values))
+    return ranks
+
+
+def _spearman(a: np.ndarray, b: np.ndarray) -> float:
+    if len(a) < 2:
+        return 1.0
+    ra, rb = _ranks(a), _ranks(b)
+    ra -= ra.mean()
+    rb -= rb.mean()
+    denominator = float(np.sqrt((ra * ra).sum() * (rb * rb).sum()))
+    return float((ra * rb).sum() / denominator) if denominator else 1.0
+
+
+def _entity_f1(reference: List[Dict], candidate: List[Dict]) -> float:
+    expected = {(entity["entity_group"], entity["start"], entity["end"]) for entity in reference}
+    found = {(entity["entity_group"], entity["start"], entity["end"]) for entity in candidate}
+    if not expected and not found:
+        return 1.0
+    return 2 * len(expected & found) / (len(expected) + len(found))
+
+
+def compare_precisions(reference, quantized, profiles: List[str], jobs: List[str], top_k: int = 10, entities: bool = True, summaries: int = 0) -> Dict:
+    """
+    Compare a quantized TalentFinderAI against a full-precision one.
+    
+    Args:
+        reference: fp32 TalentFinderAI
+        quantized: TalentFinderAI built with precision="int8"
+        profiles: Sample candidate profiles
+        jobs: Sample job descriptions; each ranks all profiles
+        top_k: Cutoff for the top-k overlap
+        entities: Also compare NER entities on the profiles
+        summaries: Number of profiles to also compare summaries on
+    
+    Returns:
+        Dict with "embedding_cosine" (mean/min), "score_abs_diff" (mean/max),
+        "top_k_overlap" and "spearman" (mean/min over jobs), and, when
+        requested, "entity_f1" and "summary_exact_match"
+    """
+    if not profiles or not jobs:
+        raise ValueError("profiles and jobs must not be empty")
+    
+    expected = reference.encode(profiles)
+    found = quantized.encode(profiles)
+    cosine = (expected * found).sum(axis=1) / (np.linalg.norm(expected, axis=1) * np.linalg.norm(found, axis=1))
+    
+    k = min(top_k, len(profiles))
+    overlaps, correlations, score_diffs = [], [], []
+    for job in jobs:
+        expected_scores = np.array([result["overall_match_score"] for result in reference.score_candidates(job, profiles)])
+        found_scores = np.array([result["overall_match_score"] for result in quantized.score_candidates(job, profiles)])
+        expected_top = set(np.argsort(-expected_scores, kind="stable")[:k].tolist())
+        found_top = set(np.argsort(-found_scores, kind="stable")[:k].tolist())
+        overlaps.append(len(expected_top & found_top) / k)
+        correlations.append(_spearman(expected_scores, found_scores))
+        score_diffs.append(np.abs(expected_scores - found_scores))
+    score_diffs = np.concatenate(score_diffs)
+    
+    report = {
+        "profiles": len(profiles),
+        "jobs": len(jobs),
+        "top_k": k,
+        "embedding_cosine": {"mean": float(cosine.mean()), "min": float(cosine.min())},
+        "score_abs_diff": {"mean": float(score_diffs.mean()), "max": float(score_diffs.max())},
+        "top_k_overlap": {"mean": float(np.mean(overlaps)), "min": float(np.min(overlaps))},
+        "spearman": {"mean": float(np.mean(correlations)), "min": float(np.min(correlations))}
+    }
+    
+    if entities:
+        scores = [_entity_f1(a, b) for a, b in zip(reference.extract_entities(profiles), quantized.extract_entities(profiles))]
+        report["entity_f1"] = {"mean": float(np.mean(scores)), "min": float(np.min(scores))}
+    
+    if summaries:
+        sample = profiles[:summaries]
+        matches = [a == b for a, b in zip(reference.summarize_profiles(sample), quantized.summarize_profiles(sample))]
+        report["summary_exact_match"] = sum(matches) / len(matches)
+    
+    return report
+
+
+def _print_report(report: Dict):
+    print(f"\nint8 vs fp32 on {report['profiles']} profiles x {report['jobs']} jobs:")
+    for name in ("embedding_cosine", "score_abs_diff", "top_k_overlap", "spearman", "entity_f1"):
+        if name in report:
+            values = report[name]
+            label = f"top-{report['top_k']} overlap" if name == "top_k_overlap" else name
+            print(f"  {label:<20} " + "   ".join(f"{key} {value:.4f}" for key, value in values.items()))
+    if "summary_exact_match" in report:
+        print(f"  {'summary_exact_match':<20} {report['summary_exact_match']:.4f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Check int8 TalentFinderAI models against fp32 on synthetic data.")
+    parser.add_argument("--profiles", type=int, default=200, help="Number of synthetic candidate profiles")
+    parser.add_argument("--resume-words", type=int, default=300, help="Approximate words per synthetic resume")
+    parser.add_argument("--jobs", type=int, default=5, help="Number of synthetic job descriptions")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--summaries", type=int, default=0, help="Number of profiles to compare summaries on")
+    parser.add_argument("--no-entities", action="store_true", help="Skip the NER comparison")
+    parser.add_argument("--embedding-backend", default="torch", help="Similarity model backend (torch or onnx)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+    
+    from benchmark import generate_job, generate_resume
+    from talent_finder import TalentFinderAI
+    
+    rng = random.Random(args.seed)
+    profiles = [generate_resume(rng, args.resume_words) for _ in range(args.profiles)]
+    jobs = [generate_job(rng) for _ in range(args.jobs)]
+    
+    # Feature caches off: both finders must compute everything themselves
+    reference = TalentFinderAI(feature_cache_size=0, embedding_backend=args.embedding_backend)
+    quantized = TalentFinderAI(feature_cache_size=0, embedding_backend=args.embedding_backend, precision="int8")
+    
+    report = compare_precisions(reference, quantized, profiles, jobs, top_k=args.top_k, entities=not args.no_entities, summaries=args.summaries)
+    _print_report(report)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
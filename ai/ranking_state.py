@@ -0,0 +1,125 @@
+"""
+Ranking State - Incrementally maintained top-k ranking of a growing pool.
+
+Searches mostly gain candidates, so a job's ranking does not need to be
+recomputed from scratch: RankingState keeps the current top-k results,
+the score watermark (the k-th best score; anything at or below it cannot
+enter the ranking) and the highest candidate id already scored. Each
+update scores only the candidates added or edited since, builds full
+match results only for those that beat the watermark, and merges them in,
+so the cost is O(changed candidates) regardless of the pool size.
+
+An edit that lowers a top-k member below the previous k-th score leaves
+a gap that only the unscored rest of the pool can fill; the state is
+then marked needs_rebuild and must be rebuilt from the whole pool.
+
+States serialize to JSON and are persisted per search and job by
+CandidateDB.rank_search().
+
+Usage:
+    state = RankingState(job_key, finder.embedding_model_name, top_k=10)
+    finder.update_ranking(state, job_query, {candidate_id: profile_text, ...})
+    state.results   # current top-k, best first
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+
+class RankingState:
+    """
+    Top-k match results of one job over a pool that only grows.
+    
+    Attributes:
+        job_key: Identifies the job the ranking is for (e.g. feature_key of its text)
+        model_name: Similarity model the scores come from
+        top_k: Ranking size
+        results: Current top-k match results (with candidate_id), best first;
+            ties are ordered by ascending candidate_id
+        last_candidate_id: Highest candidate id already scored, or None
+        pool_size: Number of candidates scored so far
+        needs_rebuild: True once results may miss candidates (a top-k member
+            was edited to a lower score or removed); rescore the whole pool
+            into a fresh state
+    """
+    
+    def __init__(self, job_key: str, model_name: str, top_k: int, results: Optional[List[Dict]] = None, last_candidate_id: Optional[int] = None, pool_size: int = 0, needs_rebuild: bool = False):
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        
+        self.job_key = job_key
+        self.model_name = model_name
+        self.top_k = top_k
+        self.results = list(results or [])
+        self.last_candidate_id = last_candidate_id
+        self.pool_size = pool_size
+        self.needs_rebuild = needs_rebuild
+    
+    @property
+    def watermark(self) -> Optional[float]:
+        """Score a new candidate must beat to enter the ranking, or None while it has fewer than top_k entries."""
+        if len(self.results) < self.top_k:
+            return None
+        return self.results[-1]["overall_match_score"]
+    
+    def admits(self, score: float, candidate_id: int) -> bool:
+        """
+        Whether a candidate with this score would enter the ranking.
+        
+        Args:
+            score: Candidate's overall_match_score
+            candidate_id: Candidate id (breaks ties, lower first)
+        
+        Returns:
+            True if the candidate belongs in the top-k
+        """
+        if len(self.results) < self.top_k:
+            return True
+        last = self.results[-1]
+        return (-score, candidate_id) < (-last["overall_match_score"], last["candidate_id"])
+    
+    def discard(self, candidate_ids: Iterable[int]) -> List[Dict]:
+        """
+        Remove candidates from the ranking (e.g. before rescoring edited ones).
+        
+        Args:
+            candidate_ids: Candidate ids; ids not in the ranking are ignored
+        
+        Returns:
+            The removed match results
+        """
+        candidate_ids = set(candidate_ids)
+        removed = [result for result in self.results if result["candidate_id"] in candidate_ids]
+        if removed:
+            self.results = [result for result in self.results if result["candidate_id"] not in candidate_ids]
+        return removed
+    
+    def merge(self, new_results: List[Dict]):
+        """
+        Merge match results of newly scored candidates into the ranking.
+        
+        Args:
+            new_results: Match results with candidate_id (only those that
+                pass admits() need to be given)
+        """
+        merged = self.results + [result for result in new_results if self.admits(result["overall_match_score"], result["candidate_id"])]
+        merged.sort(key=lambda result: (-result["overall_match_score"], result["candidate_id"]))
+        self.results = merged[:self.top_k]
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "job_key": self.job_key,
+            "model_name": self.model_name,
+            "top_k": self.top_k,
+            "results": self.results,
+            "last_candidate_id": self.last_candidate_id,
+            "pool_size": self.pool_size,
+            "needs_rebuild": self.needs_rebuild
+        })
+    
+    @classmethod
+    def from_json(cls, data: str) -> "RankingState":
+        return cls(**json.loads(data))
+    
+    def __repr__(self) -> str:
+        return f"RankingState(top_k={self.top_k}, pool_size={self.pool_size}, watermark={self.watermark}, last_candidate_id={self.last_candidate_id}, needs_rebuild={self.needs_rebuild})"
@@ -0,0 +1,136 @@
+"""
+Sections - Section-aware chunking of long resumes for embedding.
+
+all-MiniLM-L6-v2 reads at most 256 word pieces, so embedding a whole
+resume ignores everything past its first page. chunk_profile() keeps a
+profile that fits the chunk size whole; a longer one is split at its
+section headings (summary, experience, skills, education, projects), and
+long sections into chunks that fit the model, so every part of the
+resume is embedded.
+
+TalentFinderAI embeds the chunks of a pool in one batched call and pools
+the chunk similarities into a profile score (see chunk_pooling).
+
+Usage:
+    from sections import chunk_profile
+    
+    chunk_profile(resume_text)
+    # [("other", "Jane Doe, Berlin"), ("experience", "Experience\nSenior Engineer ..."),
+    #  ("experience", "..."), ("skills", "Skills:\nPython, Kubernetes, AWS")]
+"""
+
+import re
+from typing import List, Tuple
+
+
+# Lower-cased heading lines (trailing ':' ignored) that start each section
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective", "career objective", "about", "about me", "overview"),
+    "experience": ("experience", "work experience", "professional experience", "relevant experience", "employment", "employment history", "work history", "career history"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies", "technologies", "tech stack", "tools"),
+    "education": ("education", "academic background", "qualifications", "certifications", "certificates", "education and certifications", "training"),
+    "projects": ("projects", "key projects", "selected projects", "personal projects")
+}
+
+# Relative weight of each section's chunks in weighted pooling; text before
+# the first heading (name, contact details) and unknown sections are "other"
+SECTION_WEIGHTS = {
+    "experience": 3.0,
+    "skills": 2.0,
+    "summary": 1.5,
+    "projects": 1.5,
+    "education": 1.0,
+    "other": 1.0
+}
+
+# About 170-200 word pieces for resume text, inside MiniLM's 256-piece limit
+DEFAULT_CHUNK_WORDS = 128
+
+_HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_PUNCTUATION = re.compile(r"[\s:\-–—|•*#=_]+")
+
+
+def section_of(line: str) -> str:
+    """
+    Section started by a line, or "" if the line is not a heading.
+    
+    Args:
+        line: One line of a profile
+    
+    Returns:
+        Section name (a key of SECTION_HEADINGS) or ""
+    """
+    heading = _HEADING_PUNCTUATION.sub(" ", line).strip().lower()
+    if len(heading) > 40:
+        return ""
+    return _HEADING_SECTION.get(heading.replace(" & ", " and "), "")
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split a profile at its section headings.
+    
+    Args:
+        text: Profile text
+    
+    Returns:
+        (section, text) pairs in document order, each section's text
+        starting with its heading line; headings without any text after
+        them are left out
+    """
+    sections = []
+    section, lines = "other", []
+    for line in text.splitlines():
+        heading = section_of(line)
+        if heading:
+            sections.append((section, lines))
+            section, lines = heading, [line.strip()]
+        elif line.strip():
+            lines.append(line.strip())
+    sections.append((section, lines))
+    # Only the first section (text before any heading) has no heading line
+    return [(section, "\n".join(lines)) for index, (section, lines) in enumerate(sections) if len(lines) > min(index, 1)]
+
+
+def chunk_profile(text: str, max_words: int = DEFAULT_CHUNK_WORDS) -> List[Tuple[str, str]]:
+    """
+    Split a profile into section-tagged chunks of at most max_words words.
+    
+    A profile of at most max_words words is one chunk. A longer one is
+    split at its section headings (see split_sections), and sections
+    longer than max_words at line boundaries where possible; a single
+    line longer than max_words is split between words.
+    
+    Args:
+        text: Profile text
+        max_words: Most words per chunk
+    
+    Returns:
+        (section, chunk text) pairs in document order; the single chunk
+        of a short profile is ("other", text)
+    """
+    if max_words < 1:
+        raise ValueError("max_words must be at least 1")
+    if len(text.split()) <= max_words:
+        return [("other", text)]
+    
+    chunks = []
+    for section, section_text in split_sections(text):
+        current, count = [], 0
+        for line in section_text.split("\n"):
+            words = line.split()
+            while len(words) > max_words:
+                if current:
+                    chunks.append((section, "\n".join(current)))
+                    current, count = [], 0
+                chunks.append((section, " ".join(words[:max_words])))
+                words = words[max_words:]
+            if count + len(words) > max_words and current:
+                chunks.append((section, "\n".join(current)))
+                current, count = [], 0
+            if words:
+                current.append(" ".join(words))
+                count += len(words)
+        if current:
+            chunks.append((section, "\n".join(current)))
+    return chunks or [("other", text)]
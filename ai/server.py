@@ -0,0 +1,305 @@
+"""
+Server - Long-lived local HTTP/JSON inference server for TalentFinderAI.
+
+Spawning Python per request reloads every model each time. This server
+loads the models once per process and keeps them in memory; the Node
+backend (or anything else) calls it over HTTP/1.1 with keep-alive.
+
+Endpoints:
+    GET  /health          Liveness: the process is up
+    GET  /ready           Readiness: 200 once the warmed-up models are loaded, else 503
+    GET  /metrics         Timings, batch sizes and cache gauges in the Prometheus text format
+    GET  /metrics.json    The same as Metrics.snapshot() JSON
+    POST /parse           {"text": str} or {"texts": [str]}
+    POST /match           {"candidate": str, "job": str}
+                          or {"pairs": [{"candidate": str, "job": str}]}
+    POST /top-candidates  {"job": str, "candidates": [str], "top_k": int}
+    POST /summarize       {"text": str} or {"texts": [str]},
+                          optional "max_length", "deterministic"
+
+Errors are returned as {"error": message} with status 400 (bad request),
+404, 413 (body too large) or 500.
+
+Usage:
+    python server.py --port 8765 --embedding-batching
+    
+    curl -s localhost:8765/match -d '{"candidate": "Python, AWS", "job": "Python developer"}'
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from metrics import JsonLogSink
+
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 * 1024 * 1024
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class _BadRequest(Exception):
+    """Invalid request input, sent with its 4xx status; any other exception raised while serving is a 500."""
+    
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _require(body: Dict, key: str, kind):
+    value = body.get(key)
+    if not isinstance(value, kind):
+        raise _BadRequest(f"'{key}' must be a {kind.__name__}")
+    return value
+
+
+def _positive_int(body: Dict, key: str, default: int) -> int:
+    value = body.get(key, default)
+    # bool is a subclass of int, but true is not a count
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise _BadRequest(f"'{key}' must be a positive integer")
+    return value
+
+
+def _texts(body: Dict) -> Tuple[List[str], bool]:
+    """The "text" or "texts" field, and whether a single text was sent."""
+    if "texts" in body:
+        texts = _require(body, "texts", list)
+        if not all(isinstance(text, str) for text in texts):
+            raise _BadRequest("'texts' must be a list of strings")
+        return texts, False
+    return [_require(body, "text", str)], True
+
+
+class TalentFinderHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's TalentFinderAI."""
+    
+    # Keep-alive: every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
+    server_version = "TalentFinderAI"
+    
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "uptime_seconds": time.time() - self.server.started})
+        elif self.path == "/ready":
+            ready = self.server.ready.is_set()
+            status = {"ready": ready, "loaded": {name: self.server.finder.is_loaded(name) for name in self.server.finder.COMPONENTS}}
+            if self.server.load_error:
+                status["error"] = self.server.load_error
+            self._send(200 if ready else 503, status)
+        elif self.path == "/metrics":
+            self._send_bytes(200, self.server.finder.metrics.render_prometheus().encode("utf-8"), PROMETHEUS_CONTENT_TYPE)
+        elif self.path == "/metrics.json":
+            self._send(200, self.server.finder.metrics.snapshot())
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+    
+    def do_POST(self):
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self._discard_body()
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        
+        try:
+            body = self._read_json()
+            self._send(200, route(self.server.finder, body))
+        except _BadRequest as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            self.log_error("%s failed: %r", self.path, e)
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+    
+    def _content_length(self) -> int:
+        """Declared body length; a malformed one closes the connection, since the body cannot be skipped."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise _BadRequest("Invalid Content-Length")
+        return length
+    
+    def _read_json(self) -> Dict:
+        length = self._content_length()
+        if length > MAX_BODY_BYTES:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            raise _BadRequest(f"Request body larger than {MAX_BODY_BYTES} bytes", status=413)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise _BadRequest(f"Invalid JSON: {e}")
+        if not isinstance(body, dict):
+            raise _BadRequest("Request body must be a JSON object")
+        return body
+    
+    def _discard_body(self):
+        try:
+            length = self._content_length()
+        except _BadRequest:
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+        elif length:
+            self.rfile.read(length)
+    
+    def _send(self, status: int, payload: Dict):
+        self._send_bytes(status, json.dumps(payload, default=_json_default).encode("utf-8"), "application/json")
+    
+    def _send_bytes(self, status: int, data: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _parse(finder, body: Dict) -> Dict:
+    texts, single = _texts(body)
+    results = finder.parse_resumes(texts)
+    return {"result": results[0]} if single else {"results": results}
+
+
+def _match(finder, body: Dict) -> Dict:
+    if "pairs" in body:
+        pairs = _require(body, "pairs", list)
+        if not all(isinstance(pair, dict) and isinstance(pair.get("candidate"), str) and isinstance(pair.get("job"), str) for pair in pairs):
+            raise _BadRequest("'pairs' must be a list of {\"candidate\": str, \"job\": str}")
+        return {"results": finder.match_candidates_to_jobs([(pair["candidate"], pair["job"]) for pair in pairs])}
+    return {"result": finder.match_candidate_to_job(_require(body, "candidate", str), _require(body, "job", str))}
+
+
+def _top_candidates(finder, body: Dict) -> Dict:
+    candidates = _require(body, "candidates", list)
+    if not all(isinstance(candidate, str) for candidate in candidates):
+        raise _BadRequest("'candidates' must be a list of strings")
+    top_k = _positive_int(body, "top_k", 5)
+    return {"results": finder.find_top_candidates(_require(body, "job", str), candidates, top_k=top_k)}
+
+
+def _summarize(finder, body: Dict) -> Dict:
+    texts, single = _texts(body)
+    max_length = _positive_int(body, "max_length", 100)
+    deterministic = body.get("deterministic", False)
+    if not isinstance(deterministic, bool):
+        raise _BadRequest("'deterministic' must be a boolean")
+    summaries = finder.summarize_profiles(texts, max_length=max_length, deterministic=deterministic)
+    return {"result": summaries[0]} if single else {"results": summaries}
+
+
+ROUTES = {
+    "/parse": _parse,
+    "/match": _match,
+    "/top-candidates": _top_candidates,
+    "/summarize": _summarize
+}
+
+
+class TalentFinderServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server sharing one TalentFinderAI across requests.
+    
+    Example:
+        server = TalentFinderServer(("127.0.0.1", 8765), TalentFinderAI())
+        server.warmup_in_background()
+        server.serve_forever()
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, address, finder, warmup_components: Optional[List[str]] = None, verbose: bool = False):
+        """
+        Bind the server.
+        
+        Args:
+            address: (host, port)
+            finder: TalentFinderAI shared by all request threads
+            warmup_components: Components loaded before /ready reports ready
+                (default: all)
+            verbose: Log each request
+        """
+        super().__init__(address, TalentFinderHandler)
+        self.finder = finder
+        self.routes = dict(ROUTES)
+        self.warmup_components = warmup_components
+        self.verbose = verbose
+        self.started = time.time()
+        self.ready = threading.Event()
+        self.load_error = None
+    
+    def warmup_in_background(self) -> threading.Thread:
+        """Load the models on a background thread; /ready turns 200 when done."""
+        def load():
+            try:
+                self.finder.warmup(self.warmup_components)
+                self.ready.set()
+            except Exception as e:
+                self.load_error = f"{type(e).__name__}: {e}"
+        
+        thread = threading.Thread(target=load, name="talent-finder-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve TalentFinderAI over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--components", help="Comma-separated components to load before reporting ready (default: all)")
+    parser.add_argument("--precision", default="fp32", help="Model precision (fp32 or int8)")
+    parser.add_argument("--embedding-backend", default="torch", help="Similarity model backend (torch or onnx)")
+    parser.add_argument("--embedding-store", help="Directory of a persistent embedding store")
+    parser.add_argument("--embedding-batching", action="store_true", help="Micro-batch similarity-model calls across request threads")
+    parser.add_argument("--metrics-log", action="store_true", help="Also write every metrics event as a JSON line to stderr")
+    parser.add_argument("--verbose", action="store_true", help="Log model loading and every request")
+    args = parser.parse_args(argv)
+    
+    from talent_finder import TalentFinderAI
+    
+    finder = TalentFinderAI(
+        verbose=args.verbose,
+        precision=args.precision,
+        embedding_backend=args.embedding_backend,
+        embedding_store_path=args.embedding_store,
+        embedding_batching=args.embedding_batching
+    )
+    if args.metrics_log:
+        finder.metrics.add_sink(JsonLogSink(stream=sys.stderr))
+    components = [name.strip() for name in args.components.split(",")] if args.components else None
+    
+    server = TalentFinderServer((args.host, args.port), finder, warmup_components=components, verbose=args.verbose)
+    server.warmup_in_background()
+    print(f"TalentFinderAI server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        finder.close()
+
+
+if __name__ == "__main__":
+    main()
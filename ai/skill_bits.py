@@ -0,0 +1,123 @@
+"""
+Skill Bits - Packed bitset representation of skill sets.
+
+Each canonical skill of a SkillTaxonomy owns one bit (its skill_index), so
+a candidate's skills pack into a few 64-bit words and a pool of candidates
+into an (n, words) uint64 matrix. Matching a job against the whole pool is
+then one vectorized AND plus a popcount per row instead of Python set
+operations per candidate.
+
+Usage:
+    from skill_bits import SkillBitset
+    
+    bitset = SkillBitset(taxonomy)
+    pool = bitset.encode_many([["Python", "AWS"], ["Java"]])
+    job = bitset.encode(["Python", "Docker"])
+    bitset.count(pool & job)          # array([1, 0])
+    bitset.decode_many(job & ~pool)   # [["Docker"], ["Python", "Docker"]]
+"""
+
+from typing import Iterable, List
+
+import numpy as np
+
+from skill_matcher import SkillTaxonomy
+
+
+# Explicit little-endian words, so bit i of a row is byte i // 8, bit i % 8
+WORD_DTYPE = np.dtype("<u8")
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):   # numpy >= 2.0
+        return np.bitwise_count(bits)
+    return np.unpackbits(bits.view(np.uint8), axis=-1).reshape(bits.shape + (64,)).sum(axis=-1)
+
+
+class SkillBitset:
+    """
+    Encodes skill lists as rows of packed bits indexed by a taxonomy.
+    
+    Example:
+        bitset = SkillBitset(load_default_taxonomy())
+        bitset.decode(bitset.encode(["Kubernetes", "Go"]))   # taxonomy order
+    """
+    
+    def __init__(self, taxonomy: SkillTaxonomy):
+        """
+        Create an encoder for a taxonomy.
+        
+        Args:
+            taxonomy: SkillTaxonomy whose skill_index assigns the bits
+        """
+        self.taxonomy = taxonomy
+        self.skill_index = taxonomy.skill_index
+        self.names = np.array(taxonomy.canonical_names, dtype=object)
+        self.words = max(1, (len(taxonomy) + 63) // 64)
+    
+    def covers(self, skills: Iterable[str]) -> bool:
+        """Whether every skill has a bit (is a canonical name of the taxonomy)."""
+        return all(skill in self.skill_index for skill in skills)
+    
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Pack one skill list. Names outside the taxonomy are ignored.
+        
+        Args:
+            skills: Canonical skill names
+        
+        Returns:
+            uint64 array of shape (words,)
+        """
+        row = np.zeros(self.words * 64, dtype=bool)
+        indices = [self.skill_index[skill] for skill in skills if skill in self.skill_index]
+        row[indices] = True
+        return np.packbits(row, bitorder="little").view(WORD_DTYPE)
+    
+    def encode_many(self, skill_lists: List[Iterable[str]]) -> np.ndarray:
+        """
+        Pack many skill lists into a matrix.
+        
+        Args:
+            skill_lists: One list of canonical skill names per row
+        
+        Returns:
+            uint64 array of shape (len(skill_lists), words)
+        """
+        if not skill_lists:
+            return np.zeros((0, self.words), dtype=WORD_DTYPE)
+        return np.stack([self.encode(skills) for skills in skill_lists])
+    
+    def count(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Number of skills set in each row.
+        
+        Args:
+            bits: Array of shape (..., words)
+        
+        Returns:
+            int array of shape (...)
+        """
+        return _popcount(bits).sum(axis=-1, dtype=np.int64)
+    
+    def decode(self, bits: np.ndarray) -> List[str]:
+        """Skill names set in one row, in taxonomy order."""
+        return self.decode_many(bits[np.newaxis, :])[0]
+    
+    def decode_many(self, bits: np.ndarray) -> List[List[str]]:
+        """
+        Skill names set in each row of a matrix, in taxonomy order.
+        
+        Args:
+            bits: uint64 array of shape (n, words)
+        
+        Returns:
+            n lists of canonical skill names
+        """
+        if len(bits) == 0:
+            return []
+        flags = np.unpackbits(np.ascontiguousarray(bits, dtype=WORD_DTYPE).view(np.uint8), axis=1, bitorder="little")
+        rows, columns = np.nonzero(flags)
+        names = self.names[columns]
+        boundaries = np.searchsorted(rows, np.arange(1, len(bits)))
+        return [list(chunk) for chunk in np.split(names, boundaries)]
@@ -0,0 +1,237 @@
+"""
+Skill Matcher - Single-pass multi-pattern skill extraction.
+
+Skills are defined by a SkillTaxonomy that maps canonical skill names to
+their aliases/synonyms (loaded from JSON; ai/skills.json is the default).
+SkillMatcher compiles every alias into one Aho-Corasick automaton, so a
+text is scanned once regardless of how many terms the taxonomy holds.
+Matches must start and end on word boundaries, so "java" does not match
+inside "javascript" and "AI" does not match inside "maintain". Short aliases
+that are also ordinary words ("Go", "AI", "ML") are listed as case-sensitive
+({"term": "Go", "case_sensitive": true}), so "ready to go" is not a skill.
+
+Usage:
+    from skill_matcher import SkillMatcher, SkillTaxonomy
+    
+    matcher = SkillMatcher(SkillTaxonomy.from_json("skills.json"))
+    matcher.find("Built REST APIs in Python and Node.js")
+    # [{"skill": "Python", "start": 19, "end": 25, "text": "Python"},
+    #  {"skill": "Node.js", "start": 30, "end": 37, "text": "Node.js"}]
+"""
+
+import json
+import os
+from collections import deque
+from typing import Dict, List, Optional
+
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json")
+
+
+class SkillTaxonomy:
+    """
+    Canonical skill names and the aliases that refer to them.
+    
+    Example:
+        taxonomy = SkillTaxonomy({"Kubernetes": ["kubernetes", "k8s"]})
+        taxonomy.canonical_names   # ["Kubernetes"]
+    """
+    
+    def __init__(self, skills: Dict[str, List[str]]):
+        """
+        Build a taxonomy.
+        
+        Args:
+            skills: Mapping of canonical skill name -> list of aliases.
+                Aliases are matched case-insensitively, except aliases given
+                as {"term": str, "case_sensitive": true}. The canonical name
+                itself counts as a case-insensitive alias unless it is also
+                listed as a case-sensitive one.
+        """
+        self.skills = {}         # name -> lower-cased case-insensitive terms
+        self.exact_terms = {}    # name -> case-sensitive terms
+        alias_owner = {}
+        for name, aliases in skills.items():
+            terms, exact_terms = [], []
+            for alias in aliases:
+                if isinstance(alias, dict) and alias.get("case_sensitive"):
+                    exact_terms.append(str(alias.get("term", "")).strip())
+                else:
+                    terms.append((alias.get("term", "") if isinstance(alias, dict) else alias).strip().lower())
+            if name not in exact_terms:
+                terms.insert(0, name.strip().lower())
+            
+            for kind, found in (("", terms), ("case-sensitive ", exact_terms)):
+                unique = []
+                for term in found:
+                    if not term or term in unique:
+                        continue
+                    key = (kind, term)
+                    if alias_owner.get(key, name) != name:
+                        raise ValueError(f"{(kind + 'alias').capitalize()} '{term}' is used by both '{alias_owner[key]}' and '{name}'")
+                    alias_owner[key] = name
+                    unique.append(term)
+                found[:] = unique
+            self.skills[name] = terms
+            self.exact_terms[name] = exact_terms
+        
+        self.canonical_names = list(self.skills)
+        self.skill_index = {name: i for i, name in enumerate(self.canonical_names)}
+    
+    def __len__(self) -> int:
+        return len(self.canonical_names)
+    
+    @classmethod
+    def from_json(cls, path: str) -> "SkillTaxonomy":
+        """
+        Load a taxonomy from a JSON file of {canonical_name: [aliases]}.
+        
+        Args:
+            path: Path to the JSON file
+        
+        Returns:
+            SkillTaxonomy
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+_default_taxonomy = None
+
+
+def load_default_taxonomy() -> SkillTaxonomy:
+    """Load (once) the taxonomy shipped in ai/skills.json."""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = SkillTaxonomy.from_json(DEFAULT_TAXONOMY_PATH)
+    return _default_taxonomy
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every alias in a SkillTaxonomy.
+    
+    Example:
+        matcher = SkillMatcher()            # default taxonomy
+        matcher.extract("Python, AWS and k8s")
+        # ["Python", "AWS", "Kubernetes"]
+    """
+    
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None):
+        """
+        Compile the matcher.
+        
+        Args:
+            taxonomy: Skill taxonomy; defaults to ai/skills.json
+        """
+        self.taxonomy = taxonomy or load_default_taxonomy()
+        
+        # Trie over lower-cased terms as parallel lists: goto transitions,
+        # failure links and the (alias length, canonical name, exact text or
+        # None) triples that end at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[tuple]] = [[]]
+        
+        for name, terms in self.taxonomy.skills.items():
+            for term in terms:
+                self._add_term(term, name)
+            for term in self.taxonomy.exact_terms.get(name, ()):
+                self._add_term(term, name, exact=True)
+        self._build_failure_links()
+    
+    def _add_term(self, term: str, name: str, exact: bool = False):
+        state = 0
+        for char in self._lower(term):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(term), name, term if exact else None))
+    
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the failure state (suffixes)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+    
+    @staticmethod
+    def _lower(text: str) -> str:
+        """Lowercase text without changing its length, so offsets stay valid."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+    
+    def find(self, text: str, overlapping: bool = False) -> List[Dict]:
+        """
+        Find every skill mention in a single pass over the text.
+        
+        Args:
+            text: Text to scan
+            overlapping: If False (default), keep only the leftmost-longest
+                non-overlapping mentions, e.g. "deep learning" rather than
+                also reporting "learning"
+        
+        Returns:
+            List of mentions ordered by position:
+            [{"skill": str, "start": int, "end": int, "text": str}, ...]
+        """
+        lowered = self._lower(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        length = len(lowered)
+        
+        mentions = []
+        state = 0
+        for i, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            
+            end = i + 1
+            if end < length and lowered[end].isalnum():
+                continue
+            for term_length, name, exact in outputs[state]:
+                start = end - term_length
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                mentions.append({"skill": name, "start": start, "end": end, "text": text[start:end]})
+        
+        mentions.sort(key=lambda m: (m["start"], -(m["end"] - m["start"])))
+        if overlapping:
+            return mentions
+        
+        selected = []
+        covered_until = 0
+        for mention in mentions:
+            if mention["start"] >= covered_until:
+                selected.append(mention)
+                covered_until = mention["end"]
+        return selected
+    
+    def extract(self, text: str) -> List[str]:
+        """
+        Canonical names of the skills mentioned in text.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Unique canonical skill names in order of first mention
+        """
+        return list(dict.fromkeys(mention["skill"] for mention in self.find(text)))
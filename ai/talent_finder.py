@@ -11,9 +11,18 @@ This module provides AI-powered tools for:
 Usage:
     from talent_finder import TalentFinderAI
     
-    # Initialize once (models load automatically)
+    # Initialize once (each model loads on first use)
     finder = TalentFinderAI()
     
+    # Optionally load models up front, e.g. only what a matching worker needs
+    finder.warmup(components=["similarity"])
+    
+    # Optionally persist embeddings across calls and restarts
+    finder = TalentFinderAI(embedding_store_path="./embeddings")
+    
+    # Optionally run the models with int8 dynamic quantization on CPU
+    finder = TalentFinderAI(precision="int8")
+    
     # Parse a resume
     parsed = finder.parse_resume("John Smith worked at Google...")
     
@@ -22,14 +31,72 @@ Usage:
     
     # Find top candidates
     top_candidates = finder.find_top_candidates(job_description, candidate_list, top_k=5)
+    
+    # Reuse a job's embedding and skills across many calls
+    query = finder.build_job_query(job_description)
+    top_candidates = finder.find_top_candidates(query, candidate_list, top_k=5)
+    
+    # From asyncio code (concurrent calls are batched together)
+    match = await finder.amatch(candidate_profile, job_description)
+    
+    # Method and model timings, batch sizes and cache hit rates
+    finder.metrics.snapshot()
 """
 
 from transformers import pipeline
 from sentence_transformers import SentenceTransformer
 import torch
 import os
-from typing import List, Dict
-from sklearn.metrics.pairwise import cosine_similarity
+import asyncio
+import functools
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Optional, Tuple, Union
+
+from embedding_store import EmbeddingStore
+from candidate_index import CandidateIndex
+from skill_bits import SkillBitset
+from skill_matcher import SkillMatcher, SkillTaxonomy
+from job_query import JobQuery
+from feature_cache import CandidateFeatures, FeatureCache, feature_key
+from onnx_encoder import OnnxSentenceEncoder
+from quantization import PRECISIONS, quantize_dynamic
+from micro_batch import AsyncMicroBatcher, MicroBatcher
+from ranking_state import RankingState
+from sections import DEFAULT_CHUNK_WORDS, SECTION_WEIGHTS, chunk_profile
+from length_buckets import run_bucketed
+from token_cache import TokenizationCache
+from metrics import ForwardTimer, Metrics, timed
+
+
+SIMILARITY_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_BACKENDS = ("torch", "onnx")
+CHUNK_POOLINGS = ("max", "weighted")
+DEFAULT_ONNX_CACHE_DIR = os.path.join("~", ".cache", "talent_finder", "onnx")
+
+# Value of the "finder" label on each instance's cache gauges
+_finder_ids = itertools.count(1)
+
+
+def _cosine_to_job(vectors: np.ndarray, job_embedding: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each row of vectors to job_embedding.
+    
+    Each row is reduced on its own (no matrix product), so a candidate's
+    score is bit-for-bit the same whatever batch it is scored in.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    job_embedding = np.asarray(job_embedding, dtype=np.float32)
+    norms = np.sqrt((vectors * vectors).sum(axis=1))
+    job_norm = np.sqrt((job_embedding * job_embedding).sum())
+    vectors = vectors / np.where(norms == 0, 1, norms)[:, np.newaxis]
+    job_embedding = job_embedding / (job_norm if job_norm else 1)
+    return (vectors * job_embedding).sum(axis=1)
 
 
 class TalentFinderAI:
@@ -46,61 +113,381 @@ class TalentFinderAI:
         match_result = finder.match_candidate_to_job(candidate_text, job_description)
     """
     
-    def __init__(self, verbose: bool = False):
+    COMPONENTS = ("ner", "similarity", "summarizer")
+    
+    def __init__(self, verbose: bool = False, embedding_store_path: Optional[str] = None, embedding_store_size: int = 100000, skill_taxonomy: Union[str, SkillTaxonomy, None] = None, feature_cache_size: int = 10000, feature_cache_bytes: Optional[int] = 256 * 1024 * 1024, summary_cache_size: int = 1024, embedding_backend: str = "torch", onnx_cache_dir: Optional[str] = None, precision: str = "fp32", async_workers: int = 2, micro_batch_size: int = 32, micro_batch_wait_ms: float = 5.0, embedding_batching: bool = False, chunk_pooling: Optional[str] = None, chunk_words: int = DEFAULT_CHUNK_WORDS, max_batch_tokens: Optional[int] = None, token_cache_size: int = 10000, metrics: Optional[Metrics] = None):
         """
-        Initialize all AI models for talent search.
+        Initialize the talent search system.
+        
+        Models are not loaded here: each one is loaded on first use, or up
+        front with warmup(). A worker that only matches candidates never pays
+        for the NER or summarization models.
         
         Args:
             verbose: If True, print loading progress messages
+            embedding_store_path: Directory of a persistent embedding store.
+                When set, candidate and job embeddings are cached on disk and
+                reused across calls and process restarts.
+            embedding_store_size: Maximum number of embeddings kept in the store
+            skill_taxonomy: SkillTaxonomy, or path to a taxonomy JSON file,
+                used for skill extraction (defaults to ai/skills.json)
+            feature_cache_size: Maximum number of candidate texts whose derived
+                features (skills, entities, embedding) are kept in memory;
+                0 disables the cache
+            feature_cache_bytes: Approximate memory bound for the feature
+                cache, or None for no bound
+            summary_cache_size: Maximum number of deterministic summaries
+                kept in memory
+            embedding_backend: "torch" (SentenceTransformer) or "onnx"
+                (ONNX Runtime on CPU). Both produce the same embeddings.
+            onnx_cache_dir: Where the exported ONNX graph is cached
+                (default: ~/.cache/talent_finder/onnx)
+            precision: "fp32", or "int8" to dynamically quantize the linear
+                layers of every model (smaller and faster on CPU, slightly
+                different scores; see quantization.compare_precisions)
+            async_workers: Threads in the executor the async methods
+                (amatch, atop_candidates, ...) run model calls on
+            micro_batch_size: Most concurrent requests combined into one
+                model call
+            micro_batch_wait_ms: Longest a request waits for others to
+                join its batch
+            embedding_batching: Route similarity-model calls from all
+                threads through one micro-batching scheduler, so concurrent
+                single-profile matches share forward passes. Worth enabling
+                when many threads call the finder at once.
+            chunk_pooling: None to score a candidate by one embedding of the
+                whole profile (truncated by the model after ~256 word pieces),
+                or "max" / "weighted" to split profiles longer than
+                chunk_words into section-aware chunks
+                (sections.chunk_profile), embed every chunk, and pool
+                the chunk similarities by their maximum or by a mean weighted
+                by section (sections.SECTION_WEIGHTS). Applies to
+                match_candidate_to_job, match_candidates_to_jobs,
+                score_candidates and find_top_candidates without an index;
+                CandidateIndex and stored embeddings stay one per profile.
+            chunk_words: Most words per chunk when chunk_pooling is set
+            max_batch_tokens: Optional budget of padded tokens (batch size x
+                longest input) per forward pass. Every batched model call
+                sorts its inputs by token length and batches similar lengths
+                together (length_buckets.run_bucketed); the budget further
+                lets batches of short inputs grow and keeps batches of long
+                ones small.
+            token_cache_size: Maximum number of texts whose tokenization is
+                kept per model (NER, similarity, summarizer); 0 disables
+                the caches
+            metrics: Where method timings, model call and forward-pass
+                timings, batch sizes and cache gauges are recorded (default:
+                an in-memory Metrics; Metrics(enabled=False) turns
+                instrumentation off). A Metrics shared by several finders
+                keeps their cache gauges apart with a "finder" label.
         """
-        if verbose:
-            print("Loading Talent Finder AI models...")
-            print("(This may take a moment on first run)")
+        if embedding_backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding_backend '{embedding_backend}'. Choose from: {', '.join(EMBEDDING_BACKENDS)}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}'. Choose from: {', '.join(PRECISIONS)}")
+        if chunk_pooling is not None and chunk_pooling not in CHUNK_POOLINGS:
+            raise ValueError(f"Unknown chunk_pooling '{chunk_pooling}'. Choose from: {', '.join(CHUNK_POOLINGS)}")
+        if chunk_words < 1:
+            raise ValueError("chunk_words must be at least 1")
+        
+        self.verbose = verbose
+        self.embedding_backend = embedding_backend
+        self.precision = precision
+        self.chunk_pooling = chunk_pooling
+        self.chunk_words = chunk_words
+        self.max_batch_tokens = max_batch_tokens
+        
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.metrics.add_collector(self._cache_gauges, finder=str(next(_finder_ids)))
+        # Forward hooks per component, attached on the first measured call
+        self._forward_timers = {}
+        self._forward_timer_lock = threading.Lock()
+        
+        # Tokenizer outputs per model, created with the model's settings on first use
+        self.token_cache_size = token_cache_size
+        self._token_caches = {}
+        self._token_cache_lock = threading.Lock()
+        # candidate_features() fields the similarity scores are computed from
+        self._similarity_fields = {"chunks": True} if chunk_pooling else {"embedding": True}
+        self.onnx_cache_dir = onnx_cache_dir or DEFAULT_ONNX_CACHE_DIR
+        self.feature_cache = FeatureCache(feature_cache_size, feature_cache_bytes) if feature_cache_size > 0 else None
+        self.summary_cache_size = summary_cache_size
+        self._summary_cache = OrderedDict()
+        self._summary_lock = threading.Lock()
+        
+        # Async API: dedicated executor and micro-batchers, created on first use
+        self.async_workers = async_workers
+        self.micro_batch_size = micro_batch_size
+        self.micro_batch_wait_ms = micro_batch_wait_ms
+        self._executor = None
+        self._batchers = {}
+        self._async_lock = threading.Lock()
+        
+        # Small encode calls from any thread are batched together here
+        self._embedding_batcher = None
+        if embedding_batching:
+            self._embedding_batcher = MicroBatcher(self._encode_texts, max_batch=micro_batch_size, max_wait_ms=micro_batch_wait_ms, name="talent-finder-embeddings")
+        
+        if isinstance(skill_taxonomy, str):
+            skill_taxonomy = SkillTaxonomy.from_json(skill_taxonomy)
+        self.skill_matcher = SkillMatcher(skill_taxonomy)
+        self.skill_bitset = SkillBitset(self.skill_matcher.taxonomy)
+        
+        # Identifies the embedding space (store keys, JobQuery compatibility);
+        # int8 embeddings differ from fp32 ones, so they get their own
+        self.embedding_model_name = SIMILARITY_MODEL_NAME if precision == "fp32" else f"{SIMILARITY_MODEL_NAME}@{precision}"
+        
+        self.embedding_store = None
+        if embedding_store_path:
+            self.embedding_store = EmbeddingStore(embedding_store_path, self.embedding_model_name, max_entries=embedding_store_size)
+        
+        # Loaded models by component name, and one lock per component so
+        # concurrent first calls load each model exactly once
+        self._models = {}
+        self._load_locks = {name: threading.Lock() for name in self.COMPONENTS}
         
         # Clear any expired tokens
         os.environ.pop('HF_TOKEN', None)
         os.environ.pop('HUGGINGFACE_HUB_TOKEN', None)
+    
+    def warmup(self, components: Optional[List[str]] = None):
+        """
+        Load models ahead of first use.
         
-        try:
-            # 1. Named Entity Recognition (extract skills, companies, names)
-            if verbose:
-                print("  Loading NER model...")
-            self.ner = pipeline("ner", 
-                               model="dslim/bert-base-NER",
-                               aggregation_strategy="simple",
-                               token=None)
-            
-            # 2. Sentence similarity for candidate-job matching
-            if verbose:
-                print("  Loading similarity model...")
-            self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
-            
-            # 3. Text generation for summaries (optional)
+        Args:
+            components: Components to load, any of "ner", "similarity" and
+                "summarizer" (default: all of them)
+        """
+        components = list(self.COMPONENTS) if components is None else list(components)
+        unknown = [name for name in components if name not in self.COMPONENTS]
+        if unknown:
+            raise ValueError(f"Unknown components: {', '.join(unknown)}. Choose from: {', '.join(self.COMPONENTS)}")
+        
+        if self.verbose:
+            print("Loading Talent Finder AI models...")
+            print("(This may take a moment on first run)")
+        
+        for name in components:
+            self._component(name)
+        
+        if self.verbose:
+            print(f"✓ Models loaded successfully! ({', '.join(components)})")
+    
+    def is_loaded(self, component: str) -> bool:
+        """
+        Check whether a component's model has been loaded.
+        
+        Args:
+            component: "ner", "similarity" or "summarizer"
+        
+        Returns:
+            True if the model is in memory
+        """
+        return component in self._models
+    
+    def _component(self, name: str):
+        """Return a loaded component, loading it on first use (thread-safe)."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        
+        with self._load_locks[name]:
+            if name not in self._models:
+                self._models[name] = self._load_component(name)
+        return self._models[name]
+    
+    def _load_component(self, name: str):
+        """Load one component's model(s)."""
+        verbose = self.verbose
+        
+        if name == "summarizer":
+            # Text generation for summaries (optional)
             if verbose:
                 print("  Loading text generation model...")
             try:
-                from transformers import T5ForConditionalGeneration, T5Tokenizer
-                self.summarizer_tokenizer = T5Tokenizer.from_pretrained("google/flan-t5-base", token=None)
-                self.summarizer_model = T5ForConditionalGeneration.from_pretrained("google/flan-t5-base", token=None)
-                self.summarizer_model.eval()
-                self.has_summarizer = True
+                from transformers import T5ForConditionalGeneration, T5TokenizerFast
+                tokenizer = T5TokenizerFast.from_pretrained("google/flan-t5-base", token=None)
+                model = T5ForConditionalGeneration.from_pretrained("google/flan-t5-base", token=None)
+                model.eval()
+                if self.precision == "int8":
+                    model = quantize_dynamic(model)
+                return {"tokenizer": tokenizer, "model": model}
             except Exception as e:
                 if verbose:
                     print(f"  Warning: Could not load summarizer ({e})")
                     print("  Summarization will use fallback method. Install sentencepiece for full functionality.")
-                self.has_summarizer = False
-                self.summarizer_tokenizer = None
-                self.summarizer_model = None
+                return {"tokenizer": None, "model": None}
+        
+        try:
+            if name == "ner":
+                # Named Entity Recognition (extract skills, companies, names)
+                if verbose:
+                    print("  Loading NER model...")
+                ner = pipeline("ner", 
+                               model="dslim/bert-base-NER",
+                               aggregation_strategy="simple",
+                               token=None)
+                if self.precision == "int8":
+                    ner.model = quantize_dynamic(ner.model)
+                return ner
             
+            # Sentence similarity for candidate-job matching
             if verbose:
-                print("✓ All models loaded successfully!")
-                
+                print(f"  Loading similarity model ({self.embedding_backend})...")
+            if self.embedding_backend == "onnx":
+                return OnnxSentenceEncoder.load_or_export(SIMILARITY_MODEL_NAME, self.onnx_cache_dir, verbose=verbose, precision=self.precision)
+            model = SentenceTransformer(SIMILARITY_MODEL_NAME, device="cpu" if self.precision == "int8" else None)
+            if self.precision == "int8":
+                model = quantize_dynamic(model)
+            return model
+        
         except Exception as e:
             error_msg = f"\nError loading models: {e}\n\n"
             error_msg += "Make sure you have installed:\n"
             error_msg += "  pip install transformers sentence-transformers scikit-learn sentencepiece"
             raise ImportError(error_msg)
     
+    @property
+    def ner(self):
+        """NER pipeline (bert-base-NER), loaded on first use."""
+        return self._component("ner")
+    
+    @ner.setter
+    def ner(self, value):
+        self._models["ner"] = value
+        self._token_caches.pop("ner", None)
+        self._remove_forward_timer("ner")
+    
+    @property
+    def similarity_model(self) -> Union[SentenceTransformer, OnnxSentenceEncoder]:
+        """Sentence similarity model (all-MiniLM-L6-v2), loaded on first use."""
+        return self._component("similarity")
+    
+    @similarity_model.setter
+    def similarity_model(self, value):
+        self._models["similarity"] = value
+        self._token_caches.pop("similarity", None)
+        self._remove_forward_timer("similarity")
+    
+    @property
+    def summarizer_model(self):
+        """flan-t5-base model, loaded on first use (None if unavailable)."""
+        return self._component("summarizer")["model"]
+    
+    @property
+    def summarizer_tokenizer(self):
+        """flan-t5-base tokenizer, loaded on first use (None if unavailable)."""
+        return self._component("summarizer")["tokenizer"]
+    
+    def _token_cache(self, name: str) -> TokenizationCache:
+        """Tokenization cache of one component, created with its model's tokenizer settings on first use."""
+        cache = self._token_caches.get(name)
+        if cache is not None:
+            return cache
+        
+        if name == "ner":
+            # Whole texts, which _ner_windows cuts into windows
+            cache = TokenizationCache(self.ner.tokenizer, self.token_cache_size, word_ids=True, add_special_tokens=False, return_offsets_mapping=True)
+        elif name == "similarity":
+            model = self.similarity_model
+            cache = TokenizationCache(model.tokenizer, self.token_cache_size, truncation=True, max_length=model.max_seq_length)
+        else:
+            cache = TokenizationCache(self.summarizer_tokenizer, self.token_cache_size, truncation=True, max_length=512)
+        with self._token_cache_lock:
+            return self._token_caches.setdefault(name, cache)
+    
+    def token_cache_stats(self) -> Dict[str, Dict]:
+        """
+        Counters of the tokenization caches created so far.
+        
+        Returns:
+            {component name: TokenizationCache.stats()}
+        """
+        return {name: cache.stats() for name, cache in list(self._token_caches.items())}
+    
+    def clear_caches(self):
+        """
+        Drop every in-memory cache entry: candidate features, tokenizations
+        and deterministic summaries. The on-disk embedding store is kept.
+        """
+        if self.feature_cache is not None:
+            self.feature_cache.clear()
+        for cache in list(self._token_caches.values()):
+            cache.clear()
+        with self._summary_lock:
+            self._summary_cache.clear()
+    
+    def _cache_gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Metrics collector: size and hit rate of every cache."""
+        gauges = []
+        caches = [("features", self.feature_cache.stats())] if self.feature_cache is not None else []
+        caches += [(f"tokens_{name}", stats) for name, stats in self.token_cache_stats().items()]
+        if self.embedding_store is not None:
+            lookups = self.embedding_store.hits + self.embedding_store.misses
+            caches.append(("embeddings", {"entries": len(self.embedding_store), "hit_rate": self.embedding_store.hits / lookups if lookups else 0.0}))
+        for cache, stats in caches:
+            gauges.append(("cache_entries", {"cache": cache}, stats["entries"]))
+            gauges.append(("cache_hit_rate", {"cache": cache}, stats["hit_rate"]))
+        gauges.append(("cache_entries", {"cache": "summaries"}, len(self._summary_cache)))
+        return gauges
+    
+    def _forward_timer(self, component: str) -> Optional[ForwardTimer]:
+        """Forward hooks on a component's torch model (None for ONNX or a missing model)."""
+        if component == "ner":
+            module = self.ner.model
+        elif component == "similarity":
+            module = self.similarity_model
+        else:
+            module = self.summarizer_model
+        if not isinstance(module, torch.nn.Module):
+            return None
+        
+        forward = self._forward_timers.get(component)
+        if forward is None or forward.module is not module:
+            with self._forward_timer_lock:
+                forward = self._forward_timers.get(component)
+                if forward is None or forward.module is not module:
+                    if forward is not None:
+                        forward.remove()
+                    forward = self._forward_timers[component] = ForwardTimer(module)
+        return forward
+    
+    def _remove_forward_timer(self, component: str):
+        """Detach a component's forward hooks (when its model is replaced)."""
+        with self._forward_timer_lock:
+            forward = self._forward_timers.pop(component, None)
+        if forward is not None:
+            forward.remove()
+    
+    @contextmanager
+    def _model_call(self, component: str, batch_size: int):
+        """
+        Measure one batched model call.
+        
+        Records the batch size, the whole call ("model_call") and the
+        torch forward passes inside it ("forward"); the difference is the
+        call's pre/post-processing.
+        """
+        if not self.metrics.enabled:
+            yield
+            return
+        
+        self.metrics.observe("batch_size", batch_size, model=component)
+        forward = self._forward_timer(component)
+        with self.metrics.timer("model_call", items=batch_size, model=component):
+            if forward is None:
+                yield
+                return
+            with forward.measure() as measured:
+                yield
+        self.metrics.record("forward", measured.seconds, items=batch_size, model=component)
+    
+    @property
+    def has_summarizer(self) -> bool:
+        """True if the text generation model could be loaded."""
+        return self.summarizer_model is not None
+    
+    @timed(items=lambda resume_text, *args, **kwargs: 1)
     def parse_resume(self, resume_text: str, verbose: bool = False) -> Dict:
         """
         Parse resume and extract key information.
@@ -125,8 +512,204 @@ class TalentFinderAI:
             print(f"Text length: {len(resume_text)} characters")
         
         # Extract entities using NER
-        entities = self.ner(resume_text)
+        features = self.candidate_features([resume_text], skills=True, entities=True)[0]
+        
+        return self._organize_entities(features, verbose=verbose)
+    
+    @timed(items=lambda resume_texts, *args, **kwargs: len(resume_texts))
+    def parse_resumes(self, resume_texts: List[str], batch_size: int = 8, stride: int = 128, verbose: bool = False) -> List[Dict]:
+        """
+        Parse many resumes with batched NER.
+        
+        Long resumes are split into overlapping token windows so nothing past
+        the NER model's 512-token limit is lost; windows from all resumes are
+        run through the pipeline in batches and their entities are stitched
+        back per resume.
+        
+        Args:
+            resume_texts: List of full resume texts
+            batch_size: Number of windows per NER forward pass
+            stride: Number of tokens shared by consecutive windows
+            verbose: Show detailed extraction process
+        
+        Returns:
+            List of dictionaries in the format returned by parse_resume,
+            in the same order as resume_texts
+        """
+        if verbose:
+            print(f"\nParsing {len(resume_texts)} resumes...")
+        
+        all_features = self.candidate_features(resume_texts, skills=True, entities=True, ner_batch_size=batch_size, stride=stride)
+        return [self._organize_entities(features, verbose=verbose) for features in all_features]
+    
+    @timed(items=lambda texts, *args, **kwargs: len(texts))
+    def extract_entities(self, texts: List[str], batch_size: int = 8, stride: int = 128) -> List[List[Dict]]:
+        """
+        Run NER over texts of any length.
+        
+        Each text is cut into windows that fit the NER model, with ``stride``
+        tokens of overlap. Every window owns the span up to the middle of its
+        overlaps, and only entities starting in that span are kept, so an
+        entity cut by one window's edge is taken whole from its neighbour.
+        
+        Args:
+            texts: Texts to run NER on
+            batch_size: Number of windows per NER forward pass
+            stride: Number of tokens shared by consecutive windows
+        
+        Returns:
+            List (one per text) of entity dicts as produced by the NER
+            pipeline, with start/end offsets relative to the full text
+        """
+        if stride < 0:
+            raise ValueError("stride must not be negative")
+        
+        encodings = self._token_cache("ner").encode(texts) if texts else []
+        windows = []  # (text index, char start, char end, owned start, owned end, token start, token end)
+        for text_index, (text, encoding) in enumerate(zip(texts, encodings)):
+            spans = self._ner_windows(text, encoding, stride)
+            for i, (start, end, token_start, token_end) in enumerate(spans):
+                owned_start = 0 if i == 0 else (start + spans[i - 1][1]) // 2
+                owned_end = len(text) if i == len(spans) - 1 else (spans[i + 1][0] + end) // 2
+                windows.append((text_index, start, end, owned_start, owned_end, token_start, token_end))
         
+        results = [[] for _ in texts]
+        if not windows:
+            return results
+        
+        chunks = [(texts[text_index], encodings[text_index], start, end, token_start, token_end) for text_index, start, end, _, _, token_start, token_end in windows]
+        window_entities = run_bucketed(
+            chunks, self._ner_batch,
+            [token_end - token_start for *_, token_start, token_end in windows], batch_size, self.max_batch_tokens
+        )
+        
+        for (text_index, start, _, owned_start, owned_end, _, _), entities in zip(windows, window_entities):
+            for entity in entities:
+                entity = dict(entity)
+                if entity.get('start') is not None:
+                    entity['start'] += start
+                    entity['end'] += start
+                    if not owned_start <= entity['start'] < owned_end:
+                        continue
+                results[text_index].append(entity)
+        
+        return results
+    
+    def _ner_batch(self, windows: List[tuple]) -> List[List[Dict]]:
+        """
+        One NER forward pass over a length bucket of windows.
+        
+        Each window is (text, encoding, char start, char end, token start,
+        token end), with the text's entry from the NER tokenization cache.
+        The window's cached tokens get the model's special tokens and go
+        to the model as one padded batch; the pipeline's postprocess turns
+        the logits into entities with offsets relative to the window.
+        Pipelines without a torch model, or whose tokenizer cannot add
+        special tokens to ids, are called on the window text instead.
+        """
+        ner = self.ner
+        special_tokens = self._ner_special_tokens()
+        if special_tokens is None:
+            with self._model_call("ner", len(windows)):
+                return ner([text[start:end] for text, _, start, end, _, _ in windows], batch_size=len(windows))
+        
+        leading, trailing = special_tokens
+        rows = []
+        for text, encoding, start, end, token_start, token_end in windows:
+            input_ids = leading + encoding["input_ids"][token_start:token_end].tolist() + trailing
+            tokens = slice(len(leading), len(input_ids) - len(trailing))
+            offsets = np.zeros((len(input_ids), 2), dtype=np.int64)
+            offsets[tokens] = encoding["offset_mapping"][token_start:token_end] - start
+            special = np.ones(len(input_ids), dtype=np.int64)
+            special[tokens] = 0
+            rows.append((text[start:end], input_ids, offsets, special))
+        
+        width = max(len(input_ids) for _, input_ids, _, _ in rows)
+        input_ids = np.full((len(rows), width), ner.tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        for row, (_, ids, _, _) in enumerate(rows):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        features = {"input_ids": torch.from_numpy(input_ids), "attention_mask": torch.from_numpy(attention_mask)}
+        if "token_type_ids" in ner.tokenizer.model_input_names:
+            features["token_type_ids"] = torch.zeros_like(features["input_ids"])
+        
+        with self._model_call("ner", len(windows)):
+            with torch.no_grad():
+                logits = ner.model(**{name: tensor.to(ner.model.device) for name, tensor in features.items()})["logits"].float().cpu()
+            return [
+                ner.postprocess([{
+                    "logits": logits[row:row + 1, :len(ids)],
+                    "input_ids": features["input_ids"][row:row + 1, :len(ids)],
+                    "offset_mapping": torch.from_numpy(offsets)[None],
+                    "special_tokens_mask": torch.from_numpy(special)[None],
+                    "sentence": sentence,
+                    "is_last": True
+                }], **ner._postprocess_params)
+                for row, (sentence, ids, offsets, special) in enumerate(rows)
+            ]
+    
+    def _ner_special_tokens(self) -> Optional[tuple]:
+        """
+        The (leading, trailing) special token ids the NER model expects around a window.
+        
+        None when the pipeline has no torch model, or its tokenizer does not
+        add the special tokens it counts to a list of ids.
+        """
+        ner = self.ner
+        if not isinstance(ner.model, torch.nn.Module):
+            return None
+        template = ner.tokenizer.build_inputs_with_special_tokens([-1])
+        if len(template) - 1 != ner.tokenizer.num_special_tokens_to_add():
+            return None
+        split = template.index(-1)
+        return template[:split], template[split + 1:]
+    
+    def _ner_windows(self, text: str, encoding: Dict[str, np.ndarray], stride: int) -> List[tuple]:
+        """
+        Split text into (char_start, char_end, token_start, token_end) windows that fit the NER model.
+        
+        Window edges fall on word boundaries, so a window's slice of the
+        cached tokens is what its text would tokenize to. encoding is the
+        text's entry from the NER tokenization cache (offsets and word ids,
+        no special tokens).
+        """
+        tokenizer = self.ner.tokenizer
+        max_tokens = min(tokenizer.model_max_length, self.ner.model.config.max_position_embeddings)
+        max_tokens -= tokenizer.num_special_tokens_to_add()
+        # Keep windows advancing by at least half their size on small models
+        stride = min(stride, max_tokens // 2)
+        
+        offsets = encoding["offset_mapping"].tolist()
+        word_ids = encoding["word_ids"].tolist()
+        if not offsets:
+            return []
+        if len(offsets) <= max_tokens:
+            return [(0, len(text), 0, len(offsets))]
+        
+        def word_start(token: int) -> int:
+            # Move back to the first token of the word containing `token`
+            while token > 0 and word_ids[token] >= 0 and word_ids[token] == word_ids[token - 1]:
+                token -= 1
+            return token
+        
+        windows = []
+        start = 0
+        while True:
+            end = start + max_tokens
+            if end >= len(offsets):
+                windows.append((offsets[start][0], len(text), start, len(offsets)))
+                return windows
+            end = word_start(end)
+            if end <= start:
+                end = start + max_tokens  # a single word longer than a window
+            windows.append((offsets[start][0], offsets[end - 1][1], start, end))
+            next_start = word_start(end - stride)
+            start = next_start if next_start > start else end
+    
+    def _organize_entities(self, features: CandidateFeatures, verbose: bool = False) -> Dict:
+        """Group NER entities and taxonomy skills into a parse_resume result."""
+        entities = features.entities
         if verbose:
             print(f"Found {len(entities)} entities")
         
@@ -155,24 +738,8 @@ class TalentFinderAI:
             elif entity_type == 'LOC':
                 extracted["locations"].append(entity_text)
         
-        # Extract skills (common technical and soft skills)
-        skills_keywords = [
-            # Technical
-            "python", "javascript", "java", "react", "angular", "vue", "node.js",
-            "sql", "mongodb", "postgresql", "mysql", "redis",
-            "aws", "azure", "gcp", "docker", "kubernetes", "jenkins",
-            "git", "github", "gitlab", "ci/cd",
-            "machine learning", "deep learning", "ai", "tensorflow", "pytorch",
-            "html", "css", "typescript", "php", "ruby", "go", "rust",
-            # Soft skills
-            "leadership", "communication", "teamwork", "project management",
-            "agile", "scrum", "problem solving", "analytical", "creative"
-        ]
-        
-        resume_lower = resume_text.lower()
-        for skill in skills_keywords:
-            if skill in resume_lower:
-                extracted["skills"].append(skill.title())
+        # Skills from the shared taxonomy
+        extracted["skills"] = list(features.skills)
         
         # Remove duplicates
         for key in extracted:
@@ -188,30 +755,197 @@ class TalentFinderAI:
             text: Text to extract skills from
         
         Returns:
-            List of found skills
+            List of found skills (canonical taxonomy names, in order of first mention)
         """
-        skills_keywords = [
-            "python", "javascript", "java", "react", "angular", "vue", "node.js",
-            "sql", "mongodb", "postgresql", "aws", "azure", "docker", "kubernetes",
-            "machine learning", "ai", "tensorflow", "pytorch",
-            "leadership", "communication", "project management", "agile", "scrum"
-        ]
+        return self.skill_matcher.extract(text)
+    
+    def find_skill_mentions(self, text: str) -> List[Dict]:
+        """
+        Find skill mentions with their character offsets.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            List of mentions ordered by position:
+            [{"skill": str, "start": int, "end": int, "text": str}, ...]
+        """
+        return self.skill_matcher.find(text)
+    
+    @timed(items=lambda texts, *args, **kwargs: len(texts))
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed texts with the similarity model, reusing stored embeddings.
+        
+        Texts already in the embedding store are served from disk; only the
+        misses go through the model, and their embeddings are stored.
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Batch size for the model forward passes
+        
+        Returns:
+            float32 array of shape (len(texts), embedding_dim)
+        """
+        if self.embedding_store is None:
+            return self._encode_model(list(texts), batch_size)
+        
+        cached = self.embedding_store.get_many(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = self._encode_model(missing_texts, batch_size)
+            self.embedding_store.put_many(missing_texts, computed)
+            for i, vector in zip(missing, computed):
+                cached[i] = vector
+        
+        return np.stack(cached) if cached else np.zeros((0, self.similarity_model.get_sentence_embedding_dimension()), dtype=np.float32)
+    
+    def _encode_model(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Run the similarity model, through the micro-batcher when enabled."""
+        if self._embedding_batcher is not None and texts:
+            return self._embedding_batcher.run(texts)
+        return self._encode_texts(texts, batch_size)
+    
+    def _encode_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """One similarity-model call, with one forward pass per length bucket."""
+        model = self.similarity_model
+        if not texts:
+            return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+        
+        # Same preprocessing as SentenceTransformer.tokenize
+        texts = [text.strip() for text in texts]
+        if getattr(getattr(model, "_first_module", lambda: None)(), "do_lower_case", False):
+            texts = [text.lower() for text in texts]
+        
+        encodings = self._token_cache("similarity").encode(texts)
+        lengths = [len(encoding["input_ids"]) for encoding in encodings]
+        vectors = run_bucketed(encodings, self._embed_tokenized, lengths, batch_size, self.max_batch_tokens)
+        return np.asarray(np.stack(vectors), dtype=np.float32)
+    
+    def _embed_tokenized(self, encodings: List[Dict[str, np.ndarray]]) -> np.ndarray:
+        """One similarity-model forward pass over cached tokenizations."""
+        model = self.similarity_model
+        cache = self._token_cache("similarity")
+        if isinstance(model, OnnxSentenceEncoder):
+            features = cache.pad(encodings, return_tensors="np")
+            with self._model_call("similarity", len(encodings)), self.metrics.timer("forward", items=len(encodings), model="similarity"):
+                return model.embed(features)
+        
+        with self._model_call("similarity", len(encodings)):
+            features = {name: tensor.to(model.device) for name, tensor in cache.pad(encodings).items()}
+            with torch.no_grad():
+                return model(features)["sentence_embedding"].float().cpu().numpy()
+    
+    @timed(items=lambda texts, *args, **kwargs: len(texts))
+    def candidate_features(self, texts: List[str], skills: bool = False, entities: bool = False, embedding: bool = False, chunks: bool = False, batch_size: int = 32, ner_batch_size: int = 8, stride: int = 128) -> List[CandidateFeatures]:
+        """
+        Get derived features for candidate texts, computing only what is missing.
+        
+        Features come from the feature cache when enabled; the requested
+        fields that are still missing are computed in one batch per kind
+        (one encode call, one NER pass) and written back to the cache.
+        
+        Args:
+            texts: Candidate texts
+            skills: Make sure skills (and their skill_bits) are filled in
+            entities: Make sure NER entities are filled in
+            embedding: Make sure the similarity embedding is filled in
+            chunks: Make sure the chunk sections and embeddings are filled in;
+                the chunks of all texts are embedded in one encode call
+            batch_size: Batch size for the similarity model
+            ner_batch_size: Batch size for the NER pipeline
+            stride: Token overlap between NER windows (see extract_entities)
+        
+        Returns:
+            List of CandidateFeatures aligned with texts
+        """
+        if self.feature_cache is None:
+            by_key = {}
+            features = [by_key.setdefault(feature_key(text), CandidateFeatures(feature_key(text))) for text in texts]
+        else:
+            features = [self.feature_cache.get_or_create(text) for text in texts]
+        
+        # One representative text per distinct features object
+        unique = {}
+        for text, item in zip(texts, features):
+            unique.setdefault(item.key, (text, item))
+        unique = list(unique.values())
         
-        text_lower = text.lower()
-        found_skills = []
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
+        if embedding:
+            missing = [(text, item) for text, item in unique if item.embedding is None]
+            if missing:
+                vectors = self.encode([text for text, _ in missing], batch_size=batch_size)
+                for (_, item), vector in zip(missing, vectors):
+                    item.embedding = vector
         
-        return list(set(found_skills))
+        if chunks:
+            missing = [(text, item) for text, item in unique if item.chunk_embeddings is None]
+            if missing:
+                chunked = [chunk_profile(text, self.chunk_words) for text, _ in missing]
+                vectors = self.encode([chunk for profile_chunks in chunked for _, chunk in profile_chunks], batch_size=batch_size)
+                offset = 0
+                for (_, item), profile_chunks in zip(missing, chunked):
+                    item.chunk_sections = [section for section, _ in profile_chunks]
+                    item.chunk_embeddings = vectors[offset:offset + len(profile_chunks)]
+                    offset += len(profile_chunks)
+        
+        if skills:
+            for text, item in unique:
+                if item.skills is None:
+                    item.skills = self.extract_skills(text)
+                if item.skill_bits is None:
+                    item.skill_bits = self.skill_bitset.encode(item.skills)
+        
+        if entities:
+            missing = [(text, item) for text, item in unique if item.entities is None]
+            if missing:
+                found = self.extract_entities([text for text, _ in missing], batch_size=ner_batch_size, stride=stride)
+                for (_, item), item_entities in zip(missing, found):
+                    item.entities = item_entities
+        
+        if self.feature_cache is not None:
+            for _, item in unique:
+                self.feature_cache.put(item)
+        
+        return features
     
-    def match_candidate_to_job(self, candidate_profile: str, job_description: str, verbose: bool = False) -> Dict:
+    @timed(items=lambda job_description: 1)
+    def build_job_query(self, job_description: str) -> JobQuery:
+        """
+        Precompute a job description's embedding and required skills.
+        
+        Args:
+            job_description: Job requirements/description
+        
+        Returns:
+            JobQuery accepted by match_candidate_to_job, score_candidates,
+            find_top_candidates and find_top_candidates_stream
+        """
+        return JobQuery(
+            job_description,
+            self.encode([job_description])[0],
+            self.extract_skills(job_description),
+            self.embedding_model_name
+        )
+    
+    def _as_job_query(self, job: Union[str, JobQuery]) -> JobQuery:
+        """Build a JobQuery from a raw description, or validate an existing one."""
+        if not isinstance(job, JobQuery):
+            return self.build_job_query(job)
+        if job.model_name != self.embedding_model_name:
+            raise ValueError(f"JobQuery was built with '{job.model_name}', but this finder uses '{self.embedding_model_name}'")
+        return job
+    
+    @timed(items=lambda candidate_profile, *args, **kwargs: 1)
+    def match_candidate_to_job(self, candidate_profile: str, job_description: Union[str, JobQuery], verbose: bool = False) -> Dict:
         """
         Match candidate to job description and calculate match score.
         
         Args:
             candidate_profile: Candidate's resume/profile text
-            job_description: Job requirements/description
+            job_description: Job requirements/description, or a JobQuery
             verbose: Show matching details
         
         Returns:
@@ -225,54 +959,235 @@ class TalentFinderAI:
                 "required_skills": List[str]
             }
         """
+        job = self._as_job_query(job_description)
+        
         if verbose:
             print(f"\nMatching candidate to job...")
             print(f"Candidate profile length: {len(candidate_profile)} chars")
-            print(f"Job description length: {len(job_description)} chars")
+            print(f"Job description length: {len(job.text)} chars")
         
         # Get embeddings for similarity
-        candidate_embedding = self.similarity_model.encode(candidate_profile)
-        job_embedding = self.similarity_model.encode(job_description)
+        features = self.candidate_features([candidate_profile], skills=True, **self._similarity_fields)[0]
         
         # Calculate cosine similarity
-        similarity_score = cosine_similarity(
-            [candidate_embedding],
-            [job_embedding]
-        )[0][0]
+        similarity_score = self._similarity_scores([features], job.embedding)[0]
         
         # Extract skills
-        required_skills = self.extract_skills(job_description)
-        candidate_skills = self.extract_skills(candidate_profile)
+        required_skills = job.required_skills
+        candidate_skills = features.skills
         
-        # Calculate skill match
-        matched_skills = set(required_skills) & set(candidate_skills)
-        skill_match_ratio = len(matched_skills) / len(required_skills) if required_skills else 0
+        result = self._build_pool_match_results([similarity_score], required_skills, [features])[0]
         
         if verbose:
             print(f"  Overall similarity: {similarity_score:.2%}")
             print(f"  Required skills: {required_skills}")
             print(f"  Candidate skills: {candidate_skills}")
-            print(f"  Matched skills: {list(matched_skills)}")
-            print(f"  Skill match ratio: {skill_match_ratio:.2%}")
+            print(f"  Matched skills: {result['matched_skills']}")
+            print(f"  Skill match ratio: {result['skill_match_ratio']:.2%}")
+        
+        return result
+    
+    @timed(items=lambda pairs: len(pairs))
+    def match_candidates_to_jobs(self, pairs: List[Tuple[str, Union[str, JobQuery]]]) -> List[Dict]:
+        """
+        Match many (candidate profile, job) pairs with one batch per model.
+        
+        All candidate profiles, and all distinct raw job descriptions, are
+        encoded in single batches; results are the same as calling
+        match_candidate_to_job on each pair.
+        
+        Args:
+            pairs: (candidate_profile, job_description or JobQuery) pairs
+        
+        Returns:
+            List of match result dicts, in the same order as pairs
+        """
+        raw_jobs = list(dict.fromkeys(job for _, job in pairs if not isinstance(job, JobQuery)))
+        queries = {}
+        if raw_jobs:
+            for text, embedding in zip(raw_jobs, self.encode(raw_jobs)):
+                queries[text] = JobQuery(text, embedding, self.extract_skills(text), self.embedding_model_name)
+        
+        features = self.candidate_features([profile for profile, _ in pairs], skills=True, **self._similarity_fields)
+        
+        results = []
+        for (_, job), item in zip(pairs, features):
+            query = self._as_job_query(job) if isinstance(job, JobQuery) else queries[job]
+            similarity_score = self._similarity_scores([item], query.embedding)[0]
+            results.append(self._build_match_result(similarity_score, query.required_skills, item.skills))
+        return results
+    
+    def _similarity_scores(self, features: List[CandidateFeatures], job_embedding: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of each candidate to a job, pooled over chunks when chunk_pooling is set.
+        
+        Args:
+            features: Candidate features with self._similarity_fields filled in
+            job_embedding: Job embedding, shape (dim,)
+        
+        Returns:
+            float array of shape (len(features),)
+        """
+        if not features:
+            return np.zeros(0, dtype=np.float32)
+        if self.chunk_pooling is None:
+            return _cosine_to_job(np.stack([item.embedding for item in features]), job_embedding)
+        
+        # One similarity matrix over every chunk, then reduce each candidate's run of chunks
+        chunk_scores = _cosine_to_job(np.concatenate([item.chunk_embeddings for item in features]), job_embedding)
+        starts = np.cumsum([0] + [len(item.chunk_sections) for item in features[:-1]])
+        if self.chunk_pooling == "max":
+            return np.maximum.reduceat(chunk_scores, starts)
+        weights = np.array([SECTION_WEIGHTS.get(section, SECTION_WEIGHTS["other"]) for item in features for section in item.chunk_sections])
+        return np.add.reduceat(chunk_scores * weights, starts) / np.add.reduceat(weights, starts)
+    
+    def _build_match_result(self, similarity_score: float, required_skills: List[str], candidate_skills: List[str]) -> Dict:
+        """
+        Assemble the match result dict shared by single and batched scoring.
+        
+        Args:
+            similarity_score: Cosine similarity between candidate and job embeddings
+            required_skills: Skills extracted from the job description
+            candidate_skills: Skills extracted from the candidate profile
+        
+        Returns:
+            Match result dict in the format returned by match_candidate_to_job
+        """
+        return self._build_match_results([similarity_score], required_skills, [candidate_skills])[0]
+    
+    def _build_match_results(self, similarity_scores, required_skills: List[str], candidate_skills: List[List[str]], candidate_bits: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Assemble match results for many candidates against one job.
+        
+        Skills are compared as packed bitsets: one AND of the candidates'
+        bit matrix with the job's bits gives every matched set, and a
+        popcount per row gives the matched counts and ratios.
+        
+        Args:
+            similarity_scores: Cosine similarity of each candidate with the job
+            required_skills: Skills extracted from the job description
+            candidate_skills: Skills extracted from each candidate profile
+            candidate_bits: Optional (n, words) SkillBitset matrix of
+                candidate_skills (e.g. stacked CandidateFeatures.skill_bits)
         
-        return {
+        Returns:
+            Match result dicts in the format returned by match_candidate_to_job,
+            with matched_skills and missing_skills in taxonomy order
+        """
+        bitset = self.skill_bitset
+        if bitset.covers(required_skills):
+            if candidate_bits is None:
+                candidate_bits = bitset.encode_many(candidate_skills)
+            job_bits = bitset.encode(required_skills)
+            matched_bits = candidate_bits & job_bits
+            matched_counts = bitset.count(matched_bits)
+            matched_skills = bitset.decode_many(matched_bits)
+            missing_skills = bitset.decode_many(job_bits & ~candidate_bits)
+        else:
+            # Skills without a bit (e.g. a JobQuery built with another taxonomy)
+            required = set(required_skills)
+            matched_skills = [list(required & set(skills)) for skills in candidate_skills]
+            missing_skills = [list(required - set(skills)) for skills in candidate_skills]
+            matched_counts = np.array([len(matched) for matched in matched_skills])
+        
+        # Calculate skill match
+        skill_match_ratios = matched_counts / len(required_skills) if required_skills else np.zeros(len(candidate_skills))
+        
+        return [{
             "overall_match_score": float(similarity_score),
-            "skill_match_ratio": skill_match_ratio,
-            "matched_skills": list(matched_skills),
-            "missing_skills": list(set(required_skills) - set(candidate_skills)),
-            "candidate_skills": candidate_skills,
+            "skill_match_ratio": float(skill_match_ratio),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "candidate_skills": skills,
             "required_skills": required_skills
-        }
+        } for similarity_score, skill_match_ratio, matched, missing, skills in zip(similarity_scores, skill_match_ratios, matched_skills, missing_skills, candidate_skills)]
+    
+    def _build_pool_match_results(self, similarity_scores, required_skills: List[str], features: List[CandidateFeatures]) -> List[Dict]:
+        """_build_match_results for CandidateFeatures with skills (and skill_bits) filled in."""
+        if not features:
+            return []
+        candidate_bits = np.stack([item.skill_bits for item in features])
+        return self._build_match_results(similarity_scores, required_skills, [item.skills for item in features], candidate_bits)
     
-    def find_top_candidates(self, job_description: str, candidate_profiles: List[str], top_k: int = 5, verbose: bool = False) -> List[Dict]:
+    @timed(items=lambda job_description, candidate_profiles, *args, **kwargs: len(candidate_profiles))
+    def score_candidates(self, job_description: Union[str, JobQuery], candidate_profiles: List[str], batch_size: int = 64, verbose: bool = False) -> List[Dict]:
+        """
+        Score every candidate against a job in batches.
+        
+        The job description is encoded and skill-parsed once, candidate
+        profiles are encoded ``batch_size`` at a time, and the similarities
+        for each batch are computed as a single matrix operation.
+        
+        Args:
+            job_description: Job requirements/description, or a JobQuery
+            candidate_profiles: List of candidate profile texts
+            batch_size: Number of candidate profiles encoded per forward pass
+            verbose: Show batch progress
+        
+        Returns:
+            List of match result dicts (same format as match_candidate_to_job),
+            in the same order as candidate_profiles
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        job = self._as_job_query(job_description)
+        required_skills = job.required_skills
+        
+        results = []
+        total = len(candidate_profiles)
+        
+        for start in range(0, total, batch_size):
+            batch = candidate_profiles[start:start + batch_size]
+            if verbose:
+                print(f"  Processing candidates {start+1}-{start+len(batch)}/{total}...", end='\r')
+            
+            features = self.candidate_features(batch, skills=True, batch_size=batch_size, **self._similarity_fields)
+            similarity_scores = self._similarity_scores(features, job.embedding)
+            results.extend(self._build_pool_match_results(similarity_scores, required_skills, features))
+        
+        if verbose and total:
+            print()  # New line after progress
+        
+        return results
+    
+    @timed(items=lambda candidate_profiles, *args, **kwargs: len(candidate_profiles))
+    def build_candidate_index(self, candidate_profiles: List[str], backend: str = "flat", batch_size: int = 64, **index_kwargs) -> CandidateIndex:
+        """
+        Embed candidate profiles and load them into a CandidateIndex.
+        
+        Candidate ids are the positions in candidate_profiles, so the same
+        list can be passed to find_top_candidates together with the index.
+        
+        Args:
+            candidate_profiles: List of candidate profile texts
+            backend: "flat" (exact) or "ivf" (approximate)
+            batch_size: Number of candidate profiles encoded per forward pass
+            **index_kwargs: Extra CandidateIndex options (nlist, nprobe, ...)
+        
+        Returns:
+            CandidateIndex containing every profile
+        """
+        index = CandidateIndex(self.similarity_model.get_sentence_embedding_dimension(), backend=backend, **index_kwargs)
+        # Add the whole pool at once so IVF clusters are trained on all of it
+        index.add(range(len(candidate_profiles)), self.encode(candidate_profiles, batch_size=batch_size))
+        return index
+    
+    @timed(items=lambda job_description, candidate_profiles, *args, **kwargs: len(candidate_profiles))
+    def find_top_candidates(self, job_description: Union[str, JobQuery], candidate_profiles: List[str], top_k: int = 5, verbose: bool = False, batch_size: int = 64, index: Optional[CandidateIndex] = None) -> List[Dict]:
         """
         Find best matching candidates for a job.
         
         Args:
-            job_description: Job requirements
+            job_description: Job requirements, or a JobQuery
             candidate_profiles: List of candidate profile texts
             top_k: Number of top candidates to return
             verbose: Show matching process
+            batch_size: Number of candidate profiles encoded per forward pass
+            index: Optional CandidateIndex over the profiles' embeddings. When
+                given, only the index's top-k hits are scored, and
+                candidate_profiles is looked up by index id (a list indexed
+                by position or a dict keyed by id).
         
         Returns:
             List of top candidates, sorted by match score (highest first).
@@ -286,59 +1201,396 @@ class TalentFinderAI:
                 "profile_preview": str
             }
         """
+        if index is not None:
+            return self._find_top_candidates_indexed(job_description, candidate_profiles, top_k, index, verbose=verbose)
+        
         if verbose:
             print(f"\nFinding top {top_k} candidates from {len(candidate_profiles)} candidates...")
         
-        results = []
+        return self.find_top_candidates_stream(job_description, candidate_profiles, top_k=top_k, batch_size=batch_size, verbose=verbose)
+    
+    @timed()
+    def find_top_candidates_stream(self, job_description: Union[str, JobQuery], candidate_profiles: Iterable, top_k: int = 5, batch_size: int = 64, verbose: bool = False) -> List[Dict]:
+        """
+        Find best matching candidates from a stream of profiles.
         
-        for i, profile in enumerate(candidate_profiles):
-            if verbose:
-                print(f"  Processing candidate {i+1}/{len(candidate_profiles)}...", end='\r')
+        Profiles are consumed ``batch_size`` at a time and only a bounded
+        heap of the best ``top_k`` is kept, so memory stays O(top_k +
+        batch_size) however large the pool is. Skills and previews are
+        computed for the final top_k only.
+        
+        Args:
+            job_description: Job requirements, or a JobQuery
+            candidate_profiles: Any iterable (e.g. a generator over DB cursor
+                rows) of profile texts, or of (candidate_id, profile_text)
+                pairs. Plain texts get their position in the stream as id.
+            top_k: Number of top candidates to return
+            batch_size: Number of candidate profiles encoded per forward pass
+            verbose: Show progress
+        
+        Returns:
+            List of top candidates in the format returned by find_top_candidates,
+            sorted by match score (highest first; ties keep stream order)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if top_k <= 0:
+            return []
+        
+        job = self._as_job_query(job_description)
+        
+        # Min-heap of (score, -position, candidate_id, profile): the root is
+        # the weakest candidate kept, and later positions lose ties
+        heap = []
+        position = 0
+        profiles = iter(candidate_profiles)
+        
+        while True:
+            batch = list(itertools.islice(profiles, batch_size))
+            if not batch:
+                break
+            
+            ids = []
+            texts = []
+            for item in batch:
+                if isinstance(item, str):
+                    ids.append(position + len(ids))
+                    texts.append(item)
+                else:
+                    ids.append(item[0])
+                    texts.append(item[1])
             
-            match_result = self.match_candidate_to_job(profile, job_description, verbose=False)
-            match_result["candidate_id"] = i
-            match_result["profile_preview"] = profile[:150] + "..." if len(profile) > 150 else profile
-            results.append(match_result)
+            features = self.candidate_features(texts, batch_size=batch_size, **self._similarity_fields)
+            similarity_scores = self._similarity_scores(features, job.embedding)
+            for candidate_id, profile, similarity_score in zip(ids, texts, similarity_scores):
+                entry = (float(similarity_score), -position, candidate_id, profile)
+                position += 1
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+            
+            if verbose:
+                print(f"  Processed {position} candidates...", end='\r')
         
-        if verbose:
+        if verbose and position:
             print()  # New line after progress
         
-        # Sort by match score
-        results.sort(key=lambda x: x["overall_match_score"], reverse=True)
+        ranked = sorted(heap, key=lambda entry: entry[:2], reverse=True)
+        features = self.candidate_features([profile for _, _, _, profile in ranked], skills=True)
+        match_results = self._build_pool_match_results([similarity_score for similarity_score, _, _, _ in ranked], job.required_skills, features)
+        
+        results = []
+        for (_, _, candidate_id, profile), match_result in zip(ranked, match_results):
+            results.append(self._add_candidate_fields(match_result, candidate_id, profile))
+        
+        return results
+    
+    def _find_top_candidates_indexed(self, job_description: Union[str, JobQuery], candidate_profiles, top_k: int, index: CandidateIndex, verbose: bool = False) -> List[Dict]:
+        """Score only the top-k hits returned by a CandidateIndex."""
+        if verbose:
+            print(f"\nFinding top {top_k} candidates from {len(index)} indexed candidates ({index.backend})...")
+        
+        job = self._as_job_query(job_description)
+        required_skills = job.required_skills
+        
+        hits = index.search(job.embedding, k=top_k)
+        profiles = [candidate_profiles[candidate_id] for candidate_id, _ in hits]
+        features = self.candidate_features(profiles, skills=True)
+        match_results = self._build_pool_match_results([similarity_score for _, similarity_score in hits], required_skills, features)
+        
+        results = []
+        for (candidate_id, _), profile, match_result in zip(hits, profiles, match_results):
+            results.append(self._add_candidate_fields(match_result, candidate_id, profile))
+        
+        return results
+    
+    def _add_candidate_fields(self, match_result: Dict, candidate_id: int, profile: str) -> Dict:
+        """Attach candidate_id and profile_preview to a match result."""
+        match_result["candidate_id"] = candidate_id
+        match_result["profile_preview"] = profile[:150] + "..." if len(profile) > 150 else profile
+        return match_result
+    
+    @timed(items=lambda state, job_description, candidate_profiles, *args, **kwargs: len(candidate_profiles))
+    def update_ranking(self, state: RankingState, job_description: Union[str, JobQuery], candidate_profiles: Dict[int, str], embeddings: Optional[Dict[int, np.ndarray]] = None, batch_size: int = 64) -> List[Dict]:
+        """
+        Merge new and edited candidates into a persistent top-k ranking.
+        
+        Candidates with an id above state.last_candidate_id are new; given
+        candidates with a lower id are edited ones and are rescored against
+        the current k-th score, so an edit can move a candidate into or out
+        of the ranking. Match results (skills) are built only for candidates
+        that beat the ranking's watermark, so the cost grows with the given
+        candidates rather than with the whole pool.
+        
+        If an edit lowers a top-k member below the previous k-th score, the
+        best unscored candidate of the pool may belong in the ranking;
+        state.needs_rebuild is then set, and the caller must rescore the
+        whole pool into a fresh RankingState (CandidateDB.rank_search does).
+        
+        Args:
+            state: RankingState of this job, updated in place
+            job_description: Job requirements, or a JobQuery
+            candidate_profiles: {candidate id: profile text} of the new and
+                edited candidates
+            embeddings: Optional precomputed {candidate id: embedding}; the
+                similarity model runs only when this is not given. Ignored
+                with chunk_pooling, which scores each profile's chunks.
+            batch_size: Number of candidate profiles encoded per forward pass
+        
+        Returns:
+            The updated top-k (state.results), in the format of find_top_candidates
+        """
+        job = self._as_job_query(job_description)
+        if state.model_name != self.embedding_model_name:
+            raise ValueError(f"RankingState was built with '{state.model_name}', but this finder uses '{self.embedding_model_name}'")
+        
+        last = state.last_candidate_id
+        new_ids = sorted(candidate_id for candidate_id in candidate_profiles if last is None or candidate_id > last)
+        edited_ids = sorted(candidate_id for candidate_id in candidate_profiles if last is not None and candidate_id <= last)
+        if not new_ids and not edited_ids:
+            return state.results
         
-        return results[:top_k]
+        # Every candidate not given here scored at or below the current k-th entry
+        floor = state.results[-1] if len(state.results) >= state.top_k else None
+        removed = {result["candidate_id"] for result in state.discard(edited_ids)}
+        
+        ids = edited_ids + new_ids
+        texts = [candidate_profiles[candidate_id] for candidate_id in ids]
+        if self.chunk_pooling is not None:
+            similarity_scores = self._similarity_scores(self.candidate_features(texts, batch_size=batch_size, **self._similarity_fields), job.embedding)
+        else:
+            if embeddings is None:
+                vectors = self.encode(texts, batch_size=batch_size)
+            else:
+                vectors = np.stack([embeddings[candidate_id] for candidate_id in ids])
+            similarity_scores = _cosine_to_job(vectors, job.embedding)
+        
+        if floor is not None:
+            for candidate_id, score in zip(ids, similarity_scores):
+                if candidate_id in removed and (-float(score), candidate_id) > (-floor["overall_match_score"], floor["candidate_id"]):
+                    state.needs_rebuild = True
+        
+        admitted = [(candidate_id, score) for candidate_id, score in zip(ids, similarity_scores) if state.admits(float(score), candidate_id)]
+        features = self.candidate_features([candidate_profiles[candidate_id] for candidate_id, _ in admitted], skills=True)
+        match_results = self._build_pool_match_results([score for _, score in admitted], job.required_skills, features)
+        
+        new_results = []
+        for (candidate_id, _), match_result in zip(admitted, match_results):
+            new_results.append(self._add_candidate_fields(match_result, candidate_id, candidate_profiles[candidate_id]))
+        
+        state.merge(new_results)
+        if new_ids:
+            state.last_candidate_id = new_ids[-1]
+            state.pool_size += len(new_ids)
+        return state.results
     
-    def summarize_profile(self, profile_text: str, max_length: int = 100) -> str:
+    @timed(items=lambda profile_text, *args, **kwargs: 1)
+    def summarize_profile(self, profile_text: str, max_length: int = 100, deterministic: bool = False) -> str:
         """
         Generate a summary of candidate profile.
         
         Args:
             profile_text: Candidate profile/resume text
             max_length: Maximum length of summary
+            deterministic: Use greedy decoding (reproducible and cached)
+                instead of sampling
         
         Returns:
             Summary text
         """
+        return self.summarize_profiles([profile_text], batch_size=1, max_length=max_length, deterministic=deterministic)[0]
+    
+    @timed(items=lambda profile_texts, *args, **kwargs: len(profile_texts))
+    def summarize_profiles(self, profile_texts: List[str], batch_size: int = 8, max_length: int = 100, deterministic: bool = True, num_beams: int = 1) -> List[str]:
+        """
+        Generate summaries for many profiles in length-bucketed batches.
+        
+        In deterministic mode (greedy decoding, or beam search when
+        num_beams > 1) the same input always yields the same summary, so
+        results are cached by input hash and repeated profiles skip
+        generation entirely.
+        
+        Args:
+            profile_texts: Candidate profile/resume texts
+            batch_size: Number of profiles per generate() call
+            max_length: Maximum length of each summary
+            deterministic: Greedy/beam decoding if True, sampling if False
+            num_beams: Beam width for deterministic mode
+        
+        Returns:
+            List of summaries, in the same order as profile_texts
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
         if not self.has_summarizer:
-            # Fallback: simple extraction
-            skills = self.extract_skills(profile_text)
-            parsed = self.parse_resume(profile_text)
-            summary = f"Skills: {', '.join(skills[:5])}. "
+            return self._fallback_summaries(profile_texts)
+        
+        input_texts = [f"Summarize this candidate profile: {text[:500]}" for text in profile_texts]
+        summaries = [None] * len(input_texts)
+        
+        # Cache lookups (deterministic mode only); duplicates generate once
+        pending = {}
+        for i, input_text in enumerate(input_texts):
+            key = None
+            if deterministic:
+                key = feature_key(f"{max_length}\0{num_beams}\0{input_text}")
+                with self._summary_lock:
+                    cached = self._summary_cache.get(key)
+                    if cached is not None:
+                        self._summary_cache.move_to_end(key)
+                if cached is not None:
+                    summaries[i] = cached
+                    continue
+            pending.setdefault(key if deterministic else i, (input_text, []))[1].append(i)
+        
+        work = list(pending.items())
+        if not work:
+            return summaries
+        
+        # Tokenize once (or not at all when cached); each length bucket is
+        # only padded to its own longest input
+        cache = self._token_cache("summarizer")
+        encodings = cache.encode([input_text for _, (input_text, _) in work])
+        
+        def generate(batch: List[Dict[str, np.ndarray]]) -> List[str]:
+            with self._model_call("summarizer", len(batch)):
+                inputs = cache.pad(batch)
+                with torch.no_grad():
+                    if deterministic:
+                        outputs = self.summarizer_model.generate(**inputs, max_length=max_length, num_beams=num_beams, do_sample=False)
+                    else:
+                        outputs = self.summarizer_model.generate(**inputs, max_length=max_length, temperature=0.7, do_sample=True)
+                return self.summarizer_tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        
+        lengths = [len(encoding["input_ids"]) for encoding in encodings]
+        decoded = run_bucketed(encodings, generate, lengths, batch_size, self.max_batch_tokens)
+        for (key, (_, positions)), summary in zip(work, decoded):
+            for i in positions:
+                summaries[i] = summary
+            if deterministic:
+                with self._summary_lock:
+                    self._summary_cache[key] = summary
+                    while len(self._summary_cache) > self.summary_cache_size:
+                        self._summary_cache.popitem(last=False)
+        
+        return summaries
+    
+    def _fallback_summaries(self, profile_texts: List[str]) -> List[str]:
+        """Extraction-based summaries used when the summarizer is unavailable."""
+        summaries = []
+        for parsed in self.parse_resumes(profile_texts):
+            summary = f"Skills: {', '.join(parsed['skills'][:5])}. "
             if parsed['companies']:
                 summary += f"Experience at: {', '.join(parsed['companies'][:2])}."
-            return summary
+            summaries.append(summary)
+        return summaries
+    
+    def _async_executor(self) -> ThreadPoolExecutor:
+        """Executor the async methods run model calls on."""
+        with self._async_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.async_workers, thread_name_prefix="talent-finder")
+            return self._executor
+    
+    def _batcher(self, name, batch_fn) -> AsyncMicroBatcher:
+        """Micro-batcher for one kind of async request, created on first use."""
+        executor = self._async_executor()
+        with self._async_lock:
+            batcher = self._batchers.get(name)
+            if batcher is None:
+                batcher = self._batchers[name] = AsyncMicroBatcher(batch_fn, executor, max_batch=self.micro_batch_size, max_wait_ms=self.micro_batch_wait_ms)
+            return batcher
+    
+    async def _run_async(self, fn, *args, **kwargs):
+        """Run one blocking call on the async executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor(), functools.partial(fn, *args, **kwargs))
+    
+    async def amatch(self, candidate_profile: str, job_description: Union[str, JobQuery]) -> Dict:
+        """
+        Async match_candidate_to_job. Concurrent calls are batched into
+        one match_candidates_to_jobs call.
+        
+        Args:
+            candidate_profile: Candidate's resume/profile text
+            job_description: Job requirements/description, or a JobQuery
+        
+        Returns:
+            Match result dict (see match_candidate_to_job)
+        """
+        if isinstance(job_description, JobQuery):
+            # Fail this request alone rather than the batch it would join
+            self._as_job_query(job_description)
+        return await self._batcher("match", self.match_candidates_to_jobs).submit((candidate_profile, job_description))
+    
+    async def aparse_resume(self, resume_text: str) -> Dict:
+        """
+        Async parse_resume. Concurrent calls are batched into one
+        parse_resumes call.
         
-        input_text = f"Summarize this candidate profile: {profile_text[:500]}"
-        inputs = self.summarizer_tokenizer(input_text, return_tensors="pt", max_length=512, truncation=True)
+        Args:
+            resume_text: Raw resume text
         
-        with torch.no_grad():
-            outputs = self.summarizer_model.generate(
-                **inputs,
-                max_length=max_length,
-                temperature=0.7,
-                do_sample=True
-            )
+        Returns:
+            Dictionary with extracted information (see parse_resume)
+        """
+        return await self._batcher("parse", self.parse_resumes).submit(resume_text)
+    
+    async def asummarize_profile(self, profile_text: str, max_length: int = 100, deterministic: bool = False) -> str:
+        """
+        Async summarize_profile. Concurrent calls with the same settings
+        are batched into one summarize_profiles call.
         
-        summary = self.summarizer_tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return summary
-
+        Args:
+            profile_text: Candidate profile/resume text
+            max_length: Maximum length of summary
+            deterministic: Use greedy decoding instead of sampling
+        
+        Returns:
+            Summary text
+        """
+        batch_fn = functools.partial(self.summarize_profiles, max_length=max_length, deterministic=deterministic)
+        return await self._batcher(("summarize", max_length, deterministic), batch_fn).submit(profile_text)
+    
+    async def abuild_job_query(self, job_description: str) -> JobQuery:
+        """
+        Async build_job_query.
+        
+        Args:
+            job_description: Job requirements/description
+        
+        Returns:
+            JobQuery
+        """
+        return await self._run_async(self.build_job_query, job_description)
+    
+    async def atop_candidates(self, job_description: Union[str, JobQuery], candidate_profiles: List[str], top_k: int = 5, batch_size: int = 64, index: Optional[CandidateIndex] = None) -> List[Dict]:
+        """
+        Async find_top_candidates. Each call already scores its pool in
+        batches, so calls are not combined; they run on the async executor.
+        
+        Args:
+            job_description: Job requirements/description, or a JobQuery
+            candidate_profiles: List of candidate profile texts
+            top_k: Number of top candidates to return
+            batch_size: Number of candidate profiles encoded per forward pass
+            index: Optional CandidateIndex (see find_top_candidates)
+        
+        Returns:
+            List of top candidates with match scores (see find_top_candidates)
+        """
+        return await self._run_async(self.find_top_candidates, job_description, candidate_profiles, top_k=top_k, batch_size=batch_size, index=index)
+    
+    def close(self):
+        """Shut down the async executor and the embedding scheduler (both restart on next use) and checkpoint the embedding store."""
+        with self._async_lock:
+            executor, self._executor = self._executor, None
+            self._batchers = {}
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if self._embedding_batcher is not None:
+            self._embedding_batcher.close()
+        if self.embedding_store is not None:
+            self.embedding_store.close()
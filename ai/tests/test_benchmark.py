@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+import pytest
+
+from benchmark import APIS, StubSentenceModel, StubTokenizer, _current_rss_mb, install_stub_models, measure, run_benchmarks
+from talent_finder import TalentFinderAI
+from token_cache import TokenizationCache
+
+
+def test_stub_tokenizer_fits_the_tokenization_cache():
+    cache = TokenizationCache(StubTokenizer(), word_ids=True, add_special_tokens=False, return_offsets_mapping=True)
+    encoding = cache.encode(["Ada  Lovelace, London"])[0]
+    assert encoding["offset_mapping"].tolist() == [[0, 3], [5, 14], [15, 21]]
+    assert encoding["word_ids"].tolist() == [0, 1, 2]
+    
+    cache = TokenizationCache(StubTokenizer(), truncation=True, max_length=4)
+    batch = cache.pad(cache.encode(["one two three four five", "one"]))
+    assert batch["input_ids"].shape == (2, 4)
+    assert batch["attention_mask"].tolist() == [[1, 1, 1, 1], [1, 1, 1, 0]]
+
+
+def test_stub_model_embeds_cached_tokens_like_encode():
+    finder = TalentFinderAI(feature_cache_size=0)
+    install_stub_models(finder)
+    texts = ["Python and Kubernetes", "Senior Java engineer in London", ""]
+    vectors = finder._encode_texts(texts)
+    assert vectors.shape == (3, StubSentenceModel().dim)
+    np.testing.assert_allclose(vectors, StubSentenceModel().encode(texts), atol=1e-6)
+
+
+def test_stub_benchmark_runs_every_api():
+    finder = TalentFinderAI(feature_cache_size=0)
+    install_stub_models(finder)
+    results = run_benchmarks(finder, list(APIS), profiles=20, resume_words=80, jobs=2, repeat=2)
+    assert list(results) == list(APIS)
+    for api, result in results.items():
+        assert result["items"] > 0, api
+        assert result["p50_ms"] <= result["max_ms"]
+
+
+@pytest.mark.skipif(_current_rss_mb() is None, reason="needs /proc/self/statm")
+def test_memory_is_measured_per_call_not_per_process():
+    held = []
+    
+    def allocate():
+        held.append(np.ones(40 * 1024 * 1024 // 8))   # 40 MB, touched
+        time.sleep(0.05)
+        return 1
+    assert measure(allocate, repeat=2, warmup=0)["rss_peak_delta_mb"] >= 60
+    
+    # A later, cheap API does not inherit the earlier peak
+    assert measure(lambda: 1, repeat=2)["rss_peak_delta_mb"] < 5
+
+
+def test_clear_caches_empties_every_in_memory_cache():
+    finder = TalentFinderAI(feature_cache_size=100)
+    install_stub_models(finder)
+    finder.find_top_candidates("Python engineer", ["Python and AWS", "Java in London"], top_k=1)
+    finder.extract_entities(["Ada Lovelace, London"])
+    finder._summary_cache["key"] = "summary"
+    assert len(finder.feature_cache) and all(stats["entries"] for stats in finder.token_cache_stats().values())
+    
+    finder.clear_caches()
+    assert len(finder.feature_cache) == 0 and len(finder._summary_cache) == 0
+    assert all(stats["entries"] == 0 for stats in finder.token_cache_stats().values())
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_runs_are_cold_unless_warm(warm, monkeypatch):
+    finder = TalentFinderAI(feature_cache_size=100)
+    install_stub_models(finder)
+    events = []
+    clear_caches = finder.clear_caches
+    monkeypatch.setattr(finder, "clear_caches", lambda: events.append("clear") or clear_caches())
+    find_top_candidates = finder.find_top_candidates
+    monkeypatch.setattr(finder, "find_top_candidates", lambda *args, **kwargs: events.append("call") or find_top_candidates(*args, **kwargs))
+    
+    results = run_benchmarks(finder, ["find_top_candidates"], profiles=10, resume_words=40, jobs=3, repeat=3, warm=warm)
+    # One warmup and three timed calls
+    assert events == (["clear", "call", "call", "call", "call"] if warm else ["clear"] + ["clear", "call"] * 4)
+    assert results["find_top_candidates"]["cache"] == ("warm" if warm else "cold")
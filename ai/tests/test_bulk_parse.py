@@ -0,0 +1,58 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import bulk_parse
+from bulk_parse import BulkParser
+
+
+def fake_parse_chunk(texts, batch_size):
+    # Later chunks finish first, so ordering has to be restored
+    time.sleep(0.02 * (10 - min(int(texts[0]) // 3, 10)) / 10)
+    return [{"text": text} for text in texts]
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.setattr(bulk_parse, "_parse_chunk", fake_parse_chunk)
+    parser = BulkParser(workers=2, chunk_size=3, max_in_flight=2)
+    parser._pool.shutdown()
+    parser._pool = ThreadPoolExecutor(max_workers=4)
+    yield parser
+    parser.close()
+
+
+def test_ordered_results_keep_input_order(parser):
+    texts = [str(i) for i in range(20)]
+    results = list(parser.parse(texts))
+    assert [index for index, _ in results] == list(range(20))
+    assert all(parsed["text"] == texts[index] for index, parsed in results)
+
+
+def test_unordered_results_cover_every_input_once(parser):
+    results = list(parser.parse((str(i) for i in range(20)), ordered=False))
+    assert sorted(index for index, _ in results) == list(range(20))
+    assert all(parsed["text"] == str(index) for index, parsed in results)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_input_is_read_only_as_results_are_taken(parser, ordered):
+    read = []
+    
+    def texts():
+        for i in range(100):
+            read.append(i)
+            yield str(i)
+    
+    results = parser.parse(texts(), ordered=ordered)
+    next(results)
+    # No more than max_in_flight chunks are read before a result is taken
+    assert len(read) <= parser.max_in_flight * parser.chunk_size
+    results.close()
+    assert len(read) < 100
+
+
+def test_rejects_non_positive_settings():
+    with pytest.raises(ValueError):
+        BulkParser(workers=1, chunk_size=0)
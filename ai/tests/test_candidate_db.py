@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from candidate_db import CandidateDB
+from talent_finder import TalentFinderAI
+from test_ranking import bag_of_words
+
+
+@pytest.fixture
+def finder(monkeypatch):
+    finder = TalentFinderAI(feature_cache_size=0)
+    finder.encoded = []
+    
+    def encode(texts, batch_size=32):
+        finder.encoded.extend(texts)
+        return bag_of_words(texts)
+    
+    monkeypatch.setattr(finder, "encode", encode)
+    return finder
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "talentsearch.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE candidates (id INTEGER PRIMARY KEY, searchId INTEGER, title TEXT, skills TEXT, summary TEXT)")
+    conn.executemany(
+        "INSERT INTO candidates (id, searchId, title, skills, summary) VALUES (?, ?, 'Engineer', '[]', ?)",
+        [(i, 1 + i % 2, f"python aws candidate {i}") for i in range(1, 11)]
+    )
+    conn.commit()
+    conn.close()
+    db = CandidateDB(path)
+    yield db
+    db.close()
+
+
+def test_sync_embeds_only_new_and_edited_candidates(finder, db):
+    assert db.sync_embeddings(finder, batch_size=3) == {"embedded": 10, "unchanged": 0, "removed": 0}
+    assert len(finder.encoded) == 10
+    
+    finder.encoded.clear()
+    assert db.sync_embeddings(finder) == {"embedded": 0, "unchanged": 10, "removed": 0}
+    assert finder.encoded == []
+    
+    with db.conn:
+        db.conn.execute("UPDATE candidates SET summary = 'rust go' WHERE id = 4")
+        db.conn.execute("INSERT INTO candidates (id, searchId, title, skills, summary) VALUES (11, 1, 'Engineer', '[]', 'kubernetes')")
+    assert db.sync_embeddings(finder) == {"embedded": 2, "unchanged": 9, "removed": 0}
+    assert len(finder.encoded) == 2
+    assert any("rust go" in text for text in finder.encoded)
+    assert any("kubernetes" in text for text in finder.encoded)
+
+
+def test_sync_drops_embeddings_of_deleted_candidates(finder, db):
+    db.sync_embeddings(finder)
+    with db.conn:
+        db.conn.execute("DELETE FROM candidates WHERE id IN (2, 3)")
+    
+    # A single search's sync leaves other rows alone
+    assert db.sync_embeddings(finder, search_id=1) == {"embedded": 0, "unchanged": 4, "removed": 0}
+    assert db.sync_embeddings(finder) == {"embedded": 0, "unchanged": 8, "removed": 2}
+    ids, vectors = db.load_embeddings(finder.embedding_model_name, db.candidate_profiles())
+    assert sorted(ids) == [1, 4, 5, 6, 7, 8, 9, 10] and vectors.shape == (8, 64)
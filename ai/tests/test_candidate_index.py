@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+import candidate_index
+from candidate_index import CandidateIndex
+
+
+def clustered(n, dim=32, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.5 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def brute_force(vectors, query, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    return np.argsort(-scores, kind="stable")[:k].tolist()
+
+
+def test_flat_search_is_exact():
+    vectors = clustered(2000)
+    index = CandidateIndex(32)
+    index.add(range(2000), vectors)
+    for query in clustered(10, seed=1):
+        assert [candidate_id for candidate_id, _ in index.search(query, k=10)] == brute_force(vectors, query, 10)
+
+
+def test_ivf_recall_against_flat():
+    vectors = clustered(20000)
+    flat, ivf = CandidateIndex(32), CandidateIndex(32, backend="ivf", nprobe=16)
+    flat.add(range(20000), vectors)
+    ivf.add(range(20000), vectors)
+    assert ivf.is_trained
+    
+    found = 0
+    queries = clustered(50, seed=1)
+    for query in queries:
+        exact = {candidate_id for candidate_id, _ in flat.search(query, k=10)}
+        found += len(exact & {candidate_id for candidate_id, _ in ivf.search(query, k=10)})
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_incremental_adds_retrain_as_the_index_grows():
+    vectors = clustered(40000)
+    index = CandidateIndex(32, backend="ivf")
+    for start in range(0, 40000, 500):
+        index.add(range(start, start + 500), vectors[start:start + 500])
+    
+    assert len(index) == 40000
+    assert index.trained_size * index.retrain_factor >= len(index)
+    assert index.nlist >= int(np.sqrt(len(index) / index.retrain_factor))
+
+
+def test_fixed_nlist_is_kept_on_retrain():
+    index = CandidateIndex(32, backend="ivf", nlist=20, train_threshold=1000)
+    vectors = clustered(10000)
+    for start in range(0, 10000, 1000):
+        index.add(range(start, start + 1000), vectors[start:start + 1000])
+    assert index.trained_size > 1000
+    assert index.nlist == 20
+
+
+def test_cluster_assignment_in_row_blocks_matches_one_product(monkeypatch):
+    vectors = clustered(5000)
+    whole = CandidateIndex(32, backend="ivf", nlist=40)
+    whole.add(range(5000), vectors)
+    
+    monkeypatch.setattr(candidate_index, "ASSIGN_BLOCK_ROWS", 333)
+    blocked = CandidateIndex(32, backend="ivf", nlist=40)
+    blocked.add(range(5000), vectors)
+    
+    np.testing.assert_array_equal(blocked.centroids, whole.centroids)
+    assert blocked._locations == whole._locations
+    for query in clustered(5, seed=1):
+        assert blocked.search(query, k=10) == whole.search(query, k=10)
+
+
+def test_replace_and_remove():
+    vectors = clustered(3000)
+    index = CandidateIndex(32, backend="ivf", train_threshold=1000)
+    index.add(range(3000), vectors)
+    index.add([7], vectors[42:43])
+    assert len(index) == 3000
+    assert index.search(vectors[42], k=2)[0][1] == pytest.approx(1.0, abs=1e-5)
+    
+    assert index.remove([7, 8, 123456]) == 2
+    assert 7 not in index and 8 not in index
+    assert all(candidate_id not in (7, 8) for candidate_id, _ in index.search(vectors[42], k=50, nprobe=1000))
+
+
+def test_save_and_load(tmp_path):
+    vectors = clustered(5000)
+    index = CandidateIndex(32, backend="ivf", train_threshold=2000)
+    index.add(range(5000), vectors)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    
+    loaded = CandidateIndex.load(path)
+    assert len(loaded) == 5000
+    assert loaded.nlist == index.nlist and loaded.trained_size == index.trained_size
+    query = clustered(1, seed=3)[0]
+    assert loaded.search(query, k=10) == index.search(query, k=10)
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        CandidateIndex(32, backend="hnsw")
+    with pytest.raises(ValueError):
+        CandidateIndex(32, retrain_factor=1)
+    with pytest.raises(ValueError):
+        CandidateIndex(32).train()
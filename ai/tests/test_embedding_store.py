@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+import pytest
+
+from embedding_store import EmbeddingStore
+
+
+def vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def texts(n, prefix="text"):
+    return [f"{prefix} {i}" for i in range(n)]
+
+
+def test_round_trip_survives_reopen(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(texts(10), vectors(10))
+    
+    reopened = EmbeddingStore(str(tmp_path), "model")
+    cached = reopened.get_many(texts(10) + ["unknown"])
+    assert len(reopened) == 10
+    np.testing.assert_array_equal(np.stack(cached[:10]), vectors(10))
+    assert cached[10] is None
+    assert (reopened.hits, reopened.misses) == (10, 1)
+
+
+def test_whitespace_variants_share_a_key(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(["Python  developer\n"], vectors(1))
+    assert store.get_many([" Python developer"])[0] is not None
+
+
+def test_other_model_discards_store(tmp_path):
+    EmbeddingStore(str(tmp_path), "model").put_many(texts(3), vectors(3))
+    assert len(EmbeddingStore(str(tmp_path), "other-model")) == 0
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model", max_entries=3)
+    store.put_many(texts(3), vectors(3))
+    store.get_many(["text 0"])
+    store.put_many(["new"], vectors(1, seed=1))
+    
+    assert len(store) == 3
+    assert store.get_many(["text 1"])[0] is None
+    assert all(vector is not None for vector in store.get_many(["text 0", "text 2", "new"]))
+
+
+def test_overwrite_keeps_one_entry(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(["a"], vectors(1, seed=1))
+    store.put_many(["a"], vectors(1, seed=2))
+    
+    reopened = EmbeddingStore(str(tmp_path), "model")
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.get_many(["a"])[0], vectors(1, seed=2)[0])
+
+
+def test_smaller_bound_on_reopen_is_enforced(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model", max_entries=5000)
+    store.put_many(texts(2000), vectors(2000))
+    
+    reopened = EmbeddingStore(str(tmp_path), "model", max_entries=1000)
+    assert len(reopened) == 1000
+    # The most recently written entries are kept, moved into the shrunk matrix
+    np.testing.assert_array_equal(np.stack(reopened.get_many(texts(2000)[-1000:])), vectors(2000)[-1000:])
+    assert os.path.getsize(os.path.join(str(tmp_path), EmbeddingStore.MATRIX_FILE)) == 1000 * 8 * 4
+    
+    reopened.put_many(["one more"], vectors(1, seed=1))
+    assert len(reopened) == 1000
+    assert len(EmbeddingStore(str(tmp_path), "model", max_entries=1000)) == 1000
+
+
+def test_small_writes_append_to_the_log(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model", max_entries=100000)
+    store.put_many(texts(2000), vectors(2000))
+    store.put_many(["grow"], vectors(1))   # doubles the matrix, which checkpoints
+    index_path = os.path.join(str(tmp_path), EmbeddingStore.INDEX_FILE)
+    log_path = os.path.join(str(tmp_path), EmbeddingStore.LOG_FILE)
+    checkpoint = os.stat(index_path).st_mtime_ns
+    
+    for i in range(10):
+        store.put_many(texts(64, prefix=f"batch {i}"), vectors(64, seed=i))
+    assert os.stat(index_path).st_mtime_ns == checkpoint
+    assert os.path.exists(log_path)
+    
+    reopened = EmbeddingStore(str(tmp_path), "model", max_entries=100000)
+    assert len(reopened) == 2641
+    np.testing.assert_array_equal(np.stack(reopened.get_many(texts(64, prefix="batch 9"))), vectors(64, seed=9))
+    
+    reopened.close()
+    assert not os.path.exists(log_path)
+
+
+def test_torn_log_line_is_ignored(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(texts(1100), vectors(1100))
+    store.put_many(["last"], vectors(1, seed=1))
+    with open(os.path.join(str(tmp_path), EmbeddingStore.LOG_FILE), "a", encoding="utf-8") as f:
+        f.write("deadbeef")
+    
+    reopened = EmbeddingStore(str(tmp_path), "model")
+    assert len(reopened) == 1101
+    assert reopened.get_many(["last"])[0] is not None
+
+
+def test_crash_while_reusing_an_evicted_row_never_maps_it_to_another_vector(tmp_path, monkeypatch):
+    store = EmbeddingStore(str(tmp_path), "model", max_entries=3)
+    store.put_many(texts(3), vectors(3))
+    store.close()
+    
+    # Die after the vectors are written, before the new keys reach the log
+    append_log = store._append_log
+    
+    def crash_on_keys(lines):
+        lines = list(lines)
+        if not lines[0].startswith("- "):
+            raise KeyboardInterrupt
+        append_log(lines)
+    monkeypatch.setattr(store, "_append_log", crash_on_keys)
+    with pytest.raises(KeyboardInterrupt):
+        store.put_many(["new"], vectors(1, seed=1))
+    
+    reopened = EmbeddingStore(str(tmp_path), "model", max_entries=3)
+    cached = reopened.get_many(texts(3) + ["new"])
+    assert cached[0] is None and cached[3] is None
+    np.testing.assert_array_equal(np.stack(cached[1:3]), vectors(3)[1:])
+
+
+def test_clear(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(texts(3), vectors(3))
+    store.clear()
+    assert len(store) == 0
+    assert len(EmbeddingStore(str(tmp_path), "model")) == 0
+
+
+def test_rejects_bad_shapes(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    with pytest.raises(ValueError):
+        store.put_many(texts(2), vectors(3))
+    store.put_many(texts(2), vectors(2))
+    with pytest.raises(ValueError):
+        store.put_many(["x"], vectors(1, dim=4))
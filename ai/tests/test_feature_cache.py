@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from feature_cache import CandidateFeatures, FeatureCache, feature_key
+
+
+def with_embedding(text, dim=256):
+    return CandidateFeatures(feature_key(text), embedding=np.zeros(dim, dtype=np.float32))
+
+
+def test_lru_eviction_by_entries():
+    cache = FeatureCache(max_entries=3)
+    for text in ["a", "b", "c"]:
+        cache.get_or_create(text)
+    assert cache.get("a") is not None   # "b" is now least recently used
+    cache.get_or_create("d")
+    
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert all(cache.get(text) is not None for text in ["a", "c", "d"])
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_oldest_and_tracks_refreshed_sizes():
+    size = with_embedding("a").nbytes()
+    cache = FeatureCache(max_entries=100, max_bytes=3 * size)
+    for text in ["a", "b", "c"]:
+        cache.put(with_embedding(text))
+    assert cache.nbytes == 3 * size
+    
+    cache.put(with_embedding("d"))
+    assert cache.get("a") is None and len(cache) == 3
+    assert cache.nbytes <= 3 * size
+    
+    # Filling in a field re-measures the entry and can push out older ones
+    features = cache.get("d")
+    features.embedding = np.zeros(512, dtype=np.float32)
+    cache.put(features)
+    assert cache.get("b") is None
+    assert cache.nbytes == sum(entry[1] for entry in cache._entries.values()) <= 3 * size
+
+
+def test_a_single_entry_above_the_byte_bound_is_kept():
+    cache = FeatureCache(max_entries=10, max_bytes=16)
+    cache.put(with_embedding("big"))
+    assert cache.get("big") is not None
+
+
+def test_get_or_create_shares_one_entry_and_counts_hits():
+    cache = FeatureCache()
+    first = cache.get_or_create("python developer")
+    assert cache.get_or_create("python developer") is first
+    assert cache.get_or_create("python  developer") is not first   # exact text, no normalization
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_rejects_non_positive_max_entries():
+    with pytest.raises(ValueError):
+        FeatureCache(max_entries=0)
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from benchmark import generate_job, generate_resume, install_stub_models
+from talent_finder import TalentFinderAI
+
+
+@pytest.fixture
+def finder():
+    finder = TalentFinderAI(feature_cache_size=0)
+    install_stub_models(finder)
+    return finder
+
+
+def per_candidate_loop(finder, job, profiles, top_k):
+    # The original find_top_candidates: one match_candidate_to_job per profile, stable sort
+    results = []
+    for i, profile in enumerate(profiles):
+        match_result = finder.match_candidate_to_job(profile, job)
+        match_result["candidate_id"] = i
+        match_result["profile_preview"] = profile[:150] + "..." if len(profile) > 150 else profile
+        results.append(match_result)
+    results.sort(key=lambda x: x["overall_match_score"], reverse=True)
+    return results[:top_k]
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 40])
+def test_batched_ranking_matches_the_per_candidate_loop(finder, top_k):
+    rng = random.Random(0)
+    profiles = [generate_resume(rng, words=rng.choice([20, 60, 120])) for _ in range(20)]
+    profiles[7] = profiles[3]    # ties keep pool order
+    profiles[15] = profiles[3]
+    profiles.append("short profile")
+    job = generate_job(rng)
+    
+    expected = per_candidate_loop(finder, job, profiles, top_k)
+    for batch_size in (1, 4, 64):
+        assert finder.find_top_candidates(job, profiles, top_k=top_k, batch_size=batch_size) == expected
+    assert len(expected) == min(top_k, len(profiles))
+
+
+def test_empty_pool_and_non_positive_top_k(finder):
+    assert finder.find_top_candidates("Python engineer", [], top_k=5) == []
+    assert finder.find_top_candidates("Python engineer", ["Python"], top_k=0) == []
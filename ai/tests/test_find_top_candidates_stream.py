@@ -0,0 +1,58 @@
+import heapq
+
+import pytest
+
+import talent_finder
+from benchmark import install_stub_models
+from talent_finder import TalentFinderAI
+
+JOB = "Python engineer with Kubernetes and AWS"
+
+
+@pytest.fixture
+def finder():
+    finder = TalentFinderAI(feature_cache_size=0)
+    install_stub_models(finder)
+    return finder
+
+
+def test_ties_keep_stream_order(finder):
+    profiles = ["Python and AWS engineer", "Java developer"] * 5
+    results = finder.find_top_candidates_stream(JOB, profiles, top_k=4, batch_size=3)
+    assert [result["candidate_id"] for result in results] == [0, 2, 4, 6]
+    
+    pairs = [(100 - i, profile) for i, profile in enumerate(profiles)]
+    results = finder.find_top_candidates_stream(JOB, iter(pairs), top_k=3, batch_size=4)
+    assert [result["candidate_id"] for result in results] == [100, 98, 96]
+
+
+def test_heap_stays_bounded_and_the_stream_is_read_lazily(finder, monkeypatch):
+    largest = []
+    
+    class BoundedHeapq:
+        heapreplace = staticmethod(heapq.heapreplace)
+        
+        @staticmethod
+        def heappush(heap, entry):
+            heapq.heappush(heap, entry)
+            largest.append(len(heap))
+    monkeypatch.setattr(talent_finder, "heapq", BoundedHeapq)
+    
+    scored = []
+    candidate_features = finder.candidate_features
+    
+    def counting_features(texts, **kwargs):
+        scored.append(len(texts))
+        return candidate_features(texts, **kwargs)
+    monkeypatch.setattr(finder, "candidate_features", counting_features)
+    
+    def profiles():
+        for i in range(200):
+            # Never more than one batch read ahead of what has been scored
+            assert i - sum(scored) <= 8
+            yield f"Python engineer number {i} with AWS" if i % 7 == 0 else f"Sales associate {i}"
+    
+    results = finder.find_top_candidates_stream(JOB, profiles(), top_k=5, batch_size=8)
+    assert max(largest) == 5
+    assert len(results) == 5
+    assert all(result["candidate_id"] % 7 == 0 for result in results)
@@ -0,0 +1,77 @@
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from ingest import ResumeIngestor, decode_bytes, extract_text, normalize_text
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>
+    <w:p><w:r><w:t>Python</w:t></w:r><w:r><w:tab/><w:t>AWS</w:t></w:r></w:p>
+    <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Berlin</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+  </w:body>
+</w:document>"""
+
+
+def test_normalize_text():
+    raw = "\ufb01nance  team\u200b\r\n\r\n\r\n\fSenior   Engineer\u00ad"
+    assert normalize_text(raw) == "finance team\n\nSenior Engineer"
+
+
+def test_decode_bytes_fallbacks():
+    assert decode_bytes("\ufeffJos\u00e9".encode("utf-8")) == "Jos\u00e9"
+    assert decode_bytes("Jos\u00e9".encode("cp1252")) == "Jos\u00e9"
+
+
+def test_extract_docx(tmp_path):
+    path = tmp_path / "resume.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", DOCUMENT)
+    assert extract_text(str(path)) == "Jane Doe\nPython AWS\nBerlin"
+
+
+def test_extract_txt(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_bytes("Jane  Doe\r\nPython".encode("cp1252"))
+    assert extract_text(str(path)) == "Jane Doe\nPython"
+
+
+def test_unsupported_extension(tmp_path):
+    path = tmp_path / "resume.rtf"
+    path.write_text("x")
+    with pytest.raises(ValueError):
+        extract_text(str(path))
+
+
+class CountingFinder:
+    precision = "fp32"
+    skill_matcher = SimpleNamespace(taxonomy=SimpleNamespace(skills={}, exact_terms=[]))
+    
+    def __init__(self):
+        self.parsed = []
+    
+    def parse_resumes(self, texts, batch_size=8):
+        self.parsed.extend(texts)
+        return [{"text_length": len(text)} for text in texts]
+
+
+def test_identical_new_files_are_extracted_and_parsed_once(tmp_path):
+    uploads = tmp_path / "resumes"
+    uploads.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (uploads / name).write_text("Jane Doe\nPython")
+    (uploads / "d.txt").write_text("John Roe\nJava")
+    
+    finder = CountingFinder()
+    with ResumeIngestor(finder, cache_path=str(tmp_path / "ingest.db"), workers=1) as ingestor:
+        records = list(ingestor.ingest(str(uploads)))
+        stats = ingestor.last_stats
+    
+    assert sorted(finder.parsed) == ["Jane Doe\nPython", "John Roe\nJava"]
+    assert stats["extracted"] == 2 and stats["parsed"] == 2 and stats["files"] == 4
+    assert sorted(record["path"].rsplit("/", 1)[1] for record in records) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    copies = [record for record in records if record["text"] == "Jane Doe\nPython"]
+    assert all(record["parsed"] == {"text_length": 15} for record in copies)
+    assert [record["cached"] for record in copies] == [False, True, True]
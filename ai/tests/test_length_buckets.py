@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from benchmark import StubSentenceModel, install_stub_models
+from length_buckets import bucket_batches, padding_efficiency, run_bucketed
+from talent_finder import TalentFinderAI
+
+
+def random_lengths(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice([1, 5, 5, 12, 40, 128, 300]) for _ in range(n)]
+
+
+@pytest.mark.parametrize("batch_size,max_tokens", [(1, None), (4, None), (64, None), (8, 256), (64, 100)])
+def test_batches_cover_every_index_once(batch_size, max_tokens):
+    lengths = random_lengths(200)
+    batches = bucket_batches(lengths, batch_size, max_tokens)
+    assert sorted(i for batch in batches for i in batch) == list(range(200))
+    for batch in batches:
+        assert len(batch) <= batch_size
+        if max_tokens is not None and len(batch) > 1:
+            assert len(batch) * max(lengths[i] for i in batch) <= max_tokens
+
+
+def test_longest_first_and_ties_keep_input_order():
+    lengths = [3, 7, 3, 7, 1, 3]
+    assert bucket_batches(lengths, batch_size=2) == [[1, 3], [0, 2], [5, 4]]
+
+
+def test_item_longer_than_the_budget_gets_its_own_batch():
+    assert bucket_batches([500, 10, 10, 10], batch_size=8, max_tokens=20) == [[0], [1, 2], [3]]
+
+
+@pytest.mark.parametrize("batch_size,max_tokens", [(1, None), (3, None), (16, 200), (100, None)])
+def test_run_bucketed_restores_the_original_order(batch_size, max_tokens):
+    lengths = random_lengths(150, seed=1)
+    items = [f"item{i}" for i in range(150)]
+    calls = []
+    
+    def run_batch(batch):
+        calls.append(batch)
+        return [item.upper() for item in batch]
+    
+    assert run_bucketed(items, run_batch, lengths, batch_size, max_tokens) == [item.upper() for item in items]
+    assert sum(len(batch) for batch in calls) == 150
+    assert max(len(batch) for batch in calls) <= batch_size
+
+
+def test_bucketing_reduces_padding():
+    lengths = random_lengths(256, seed=2)
+    unsorted = [list(range(start, start + 32)) for start in range(0, 256, 32)]
+    assert padding_efficiency(lengths, bucket_batches(lengths, 32)) > padding_efficiency(lengths, unsorted)
+    assert padding_efficiency([], []) == 1.0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        bucket_batches([1, 2], batch_size=0)
+    with pytest.raises(ValueError):
+        bucket_batches([1, 2], batch_size=2, max_tokens=0)
+    with pytest.raises(ValueError):
+        run_bucketed(["a", "b"], list, [1], batch_size=2)
+    assert run_bucketed([], list, [], batch_size=2) == []
+
+
+def test_bucketed_embeddings_come_back_in_text_order():
+    finder = TalentFinderAI(feature_cache_size=0, max_batch_tokens=48)
+    install_stub_models(finder)
+    texts = [" ".join(["python"] * n + [f"word{n}"]) for n in (30, 1, 12, 0, 30, 5, 20, 2)]
+    np.testing.assert_allclose(finder._encode_texts(texts, batch_size=3), StubSentenceModel().encode(texts), atol=1e-6)
@@ -0,0 +1,176 @@
+import gc
+import time
+
+import pytest
+import torch
+
+from metrics import ForwardTimer, InMemorySink, Metrics, MetricsSink, PrometheusSink, timed
+from talent_finder import TalentFinderAI
+
+
+class ListSink(MetricsSink):
+    def __init__(self):
+        self.events = []
+    
+    def emit(self, event):
+        self.events.append(event)
+
+
+class Service:
+    def __init__(self, metrics):
+        self.metrics = metrics
+    
+    @timed(items=lambda text: 1)
+    def one(self, text):
+        return self.many([text])[0]
+    
+    @timed(items=lambda texts: len(texts))
+    def many(self, texts):
+        if not texts:
+            raise ValueError("texts must not be empty")
+        return [text.upper() for text in texts]
+
+
+def test_sinks_must_implement_emit():
+    with pytest.raises(TypeError):
+        MetricsSink()
+    
+    class Incomplete(MetricsSink):
+        pass
+    
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_nested_timed_calls_are_recorded_under_their_parent():
+    sink = ListSink()
+    service = Service(Metrics(sinks=[sink]))
+    assert service.one("a") == "A"
+    assert [(event["name"], event["labels"], event["items"]) for event in sink.events] == [
+        ("method", {"method": "many", "parent": "one"}, 1),
+        ("method", {"method": "one"}, 1)
+    ]
+    inner, outer = sink.events
+    assert inner["seconds"] <= outer["seconds"]
+    
+    with pytest.raises(ValueError):
+        service.many([])
+    assert service.many(["a", "b"]) == ["A", "B"]
+    assert [event["labels"] for event in sink.events[2:]] == [{"method": "many"}, {"method": "many"}]
+
+
+class Sleep(torch.nn.Module):
+    def forward(self, x):
+        time.sleep(0.05)
+        return x
+
+
+class EncoderDecoder(torch.nn.Module):
+    """Runs its encoder inside forward, like a seq2seq model called without encoder_outputs."""
+    
+    def __init__(self):
+        super().__init__()
+        self.encoder = Sleep()
+    
+    def get_encoder(self):
+        return self.encoder
+    
+    def forward(self, x):
+        return self.encoder(x)
+
+
+def test_forward_timer_counts_submodule_calls_once():
+    model = EncoderDecoder()
+    forward = ForwardTimer(model)
+    assert forward.modules == [model, model.encoder]
+    
+    with forward.measure() as measured:
+        model(torch.zeros(1))
+    assert 0.04 <= measured.seconds < 0.09
+    
+    # generate() runs the encoder directly
+    with forward.measure() as measured:
+        model.encoder(torch.zeros(1))
+    assert 0.04 <= measured.seconds < 0.09
+    
+    forward.remove()
+    with forward.measure() as measured:
+        model(torch.zeros(1))
+    assert measured.seconds == 0.0
+    assert not model._forward_hooks and not model.encoder._forward_pre_hooks
+
+
+def test_forward_timer_hooks_the_t5_encoder_and_decoder():
+    transformers = pytest.importorskip("transformers")
+    config = transformers.T5Config(vocab_size=32, d_model=8, d_kv=4, d_ff=16, num_layers=1, num_heads=2, decoder_start_token_id=0)
+    model = transformers.T5ForConditionalGeneration(config).eval()
+    forward = ForwardTimer(model)
+    assert forward.modules == [model, model.encoder, model.decoder]
+    
+    calls = []
+    model.encoder.register_forward_hook(lambda *args: calls.append("encoder"))
+    with forward.measure() as measured:
+        model.generate(torch.tensor([[3, 4, 5, 1]]), max_new_tokens=3, do_sample=False)
+    assert calls == ["encoder"] and measured.seconds > 0
+    forward.remove()
+
+
+def test_replacing_a_model_detaches_its_forward_timer():
+    finder = TalentFinderAI(feature_cache_size=0)
+    model = EncoderDecoder()
+    finder.similarity_model = model
+    forward = finder._forward_timer("similarity")
+    assert model._forward_hooks
+    
+    finder.similarity_model = EncoderDecoder()
+    assert not model._forward_hooks and not model.encoder._forward_hooks
+    assert finder._forward_timer("similarity") is not forward
+
+
+def test_default_sink_renders_prometheus_text():
+    metrics = Metrics()
+    metrics.record("forward", 0.5, items=3, model="ner")
+    metrics.record("forward", 0.25, items=1, model="ner")
+    metrics.observe("batch_size", 3, model="ner")
+    metrics.add_collector(lambda: [("cache_entries", {"cache": "features"}, 7)])
+    text = metrics.render_prometheus()
+    assert isinstance(metrics.sinks[0], InMemorySink)
+    for line in [
+        "# TYPE talent_finder_forward_seconds summary",
+        'talent_finder_forward_seconds_sum{model="ner"} 0.75',
+        'talent_finder_forward_seconds_count{model="ner"} 2',
+        'talent_finder_forward_items_total{model="ner"} 4',
+        'talent_finder_batch_size_count{model="ner"} 1',
+        'talent_finder_cache_entries{cache="features"} 7.0'
+    ]:
+        assert line in text.splitlines()
+    
+    assert Metrics(sinks=[ListSink()]).render_prometheus() == ""
+    prometheus = PrometheusSink(prefix="tf")
+    metrics = Metrics(sinks=[prometheus])
+    metrics.gauge("up", 1)
+    assert metrics.render_prometheus() == prometheus.render() == "# TYPE tf_up gauge\ntf_up 1.0\n"
+
+
+def test_finders_sharing_metrics_keep_their_gauges_apart():
+    metrics = Metrics()
+    first = TalentFinderAI(metrics=metrics, feature_cache_size=10)
+    second = TalentFinderAI(metrics=metrics, feature_cache_size=0)
+    first.feature_cache.get_or_create("python engineer")
+    gauges = metrics.snapshot()["gauges"]
+    finders = {series.split('finder="')[1].split('"')[0] for series in gauges}
+    assert len(finders) == 2
+    assert sum(value for series, value in gauges.items() if series.startswith('cache_entries{cache="features"')) == 1
+    
+    del first, second
+    gc.collect()
+    metrics.collect()
+    assert metrics._collectors == []
+
+
+def test_remove_collector():
+    metrics = Metrics()
+    collector = lambda: [("up", {}, 1)]   # noqa: E731
+    metrics.add_collector(collector, finder="a")
+    metrics.remove_collector(collector)
+    assert metrics.snapshot()["gauges"] == {}
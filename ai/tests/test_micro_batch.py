@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from micro_batch import AsyncMicroBatcher, MicroBatcher
+
+
+def double(items):
+    if any(item < 0 for item in items):
+        raise ValueError("negative item")
+    return [item * 2 for item in items]
+
+
+def test_micro_batcher_routes_results_to_each_caller():
+    calls = []
+    
+    def batch_fn(items):
+        calls.append(len(items))
+        return double(items)
+    
+    batcher = MicroBatcher(batch_fn, max_batch=64, max_wait_ms=50)
+    results = {}
+    
+    def call(i):
+        results[i] = batcher.run([i, i + 1000])
+    
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    
+    assert results == {i: [2 * i, 2 * (i + 1000)] for i in range(20)}
+    assert sum(calls) == 40 and len(calls) < 20
+
+
+def test_micro_batcher_failure_only_reaches_its_caller():
+    batcher = MicroBatcher(double, max_batch=64, max_wait_ms=50)
+    futures = [batcher.submit([1]), batcher.submit([-1]), batcher.submit([3])]
+    assert futures[0].result() == [2]
+    with pytest.raises(ValueError):
+        futures[1].result()
+    assert futures[2].result() == [6]
+    batcher.close()
+
+
+def test_micro_batcher_runs_full_batches_inline():
+    batcher = MicroBatcher(lambda items: [threading.current_thread().name] * len(items), max_batch=2, name="scheduler")
+    assert batcher.run([1, 2]) == [threading.current_thread().name] * 2
+    assert batcher.run([1]) == ["scheduler"]
+    batcher.close()
+
+
+def test_async_batcher_routes_and_isolates_failures():
+    calls = []
+    
+    def batch_fn(items):
+        calls.append(list(items))
+        return double(items)
+    
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            batcher = AsyncMicroBatcher(batch_fn, executor, max_batch=8, max_wait_ms=20)
+            return await asyncio.gather(*(batcher.submit(i) for i in [1, 2, -3, 4]), return_exceptions=True)
+    
+    results = asyncio.run(main())
+    assert results[:2] == [2, 4] and results[3] == 8
+    assert isinstance(results[2], ValueError)
+    # One batched call, then one call per item
+    assert calls[0] == [1, 2, -3, 4]
+    assert sorted(map(tuple, calls[1:])) == [(-3,), (1,), (2,), (4,)]
+
+
+def test_async_batcher_flushes_at_max_batch():
+    async def main():
+        batcher = AsyncMicroBatcher(double, max_batch=3, max_wait_ms=10000)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), timeout=5), batcher
+    
+    results, batcher = asyncio.run(main())
+    assert results == [0, 2, 4]
+    assert batcher.batches == 1 and batcher.mean_batch_size == 3
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        MicroBatcher(double, max_batch=0)
+    with pytest.raises(ValueError):
+        AsyncMicroBatcher(double, max_wait_ms=-1)
@@ -0,0 +1,70 @@
+import pytest
+import torch
+from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast, pipeline
+
+from benchmark import StubNER
+from talent_finder import TalentFinderAI
+
+NAMES = ["Ada", "Grace", "Alan", "Linus", "Guido", "Barbara", "Edsger", "Donald", "Margaret", "Ken"]
+
+
+@pytest.fixture
+def finder():
+    finder = TalentFinderAI(feature_cache_size=0)
+    finder.ner = StubNER()
+    finder.ner.tokenizer.model_max_length = 12   # 10 tokens per window
+    return finder
+
+
+def resume(words):
+    return " ".join(f"{NAMES[i % len(NAMES)]}{i}" if i % 3 == 0 else "worked" for i in range(words))
+
+
+def test_windows_overlap_and_cover_the_text(finder):
+    text = resume(45)
+    encoding = finder._token_cache("ner").encode([text])[0]
+    windows = finder._ner_windows(text, encoding, stride=4)
+    assert len(windows) > 1
+    assert windows[0][:3] == (0, windows[0][1], 0)
+    assert windows[-1][1] == len(text) and windows[-1][3] == len(encoding["input_ids"])
+    for (start, end, token_start, token_end), (next_start, _, next_token_start, _) in zip(windows, windows[1:]):
+        assert token_end - token_start <= 10
+        assert token_start < next_token_start < token_end   # overlapping, always advancing
+        assert text[start - 1:start].strip() == "" and text[end:end + 1].strip() == ""
+
+
+def test_each_entity_is_owned_by_exactly_one_window(finder):
+    texts = [resume(45), "Ada Lovelace", "", resume(7)]
+    results = finder.extract_entities(texts, batch_size=3, stride=4)
+    for text, entities in zip(texts, results):
+        expected = [word for word in text.split() if word[:1].isupper()]
+        assert [entity["word"] for entity in entities] == expected
+        assert all(text[entity["start"]:entity["end"]] == entity["word"] for entity in entities)
+
+
+def test_cached_encodings_match_the_pipeline_on_window_text(tmp_path):
+    words = ["ada", "grace", "london", "google", "worked", "at", "in", "the", "##s", "and"]
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words) + "\n")
+    labels = ["O", "B-PER", "I-PER", "B-ORG", "I-ORG"]
+    torch.manual_seed(0)
+    model = BertForTokenClassification(BertConfig(
+        vocab_size=len(words) + 5, hidden_size=16, num_hidden_layers=1, num_attention_heads=2, intermediate_size=32,
+        max_position_embeddings=16, num_labels=len(labels),
+        id2label=dict(enumerate(labels)), label2id={label: i for i, label in enumerate(labels)}
+    )).eval()
+    ner = pipeline("ner", model=model, tokenizer=BertTokenizerFast(str(vocab)), aggregation_strategy="simple")
+    
+    finder = TalentFinderAI(feature_cache_size=0)
+    finder.ner = ner
+    text = "Ada worked at Google in London and Graces worked at the Google " * 6
+    cached = finder.extract_entities([text, "Ada"], batch_size=4, stride=4)
+    assert finder._ner_special_tokens() == ([2], [3])
+    
+    finder._ner_special_tokens = lambda: None   # window text through the pipeline
+    expected = finder.extract_entities([text, "Ada"], batch_size=4, stride=4)
+    assert cached[0]
+    for entities, expected_entities in zip(cached, expected):
+        assert [(e["entity_group"], e["word"], e["start"], e["end"]) for e in entities] == \
+            [(e["entity_group"], e["word"], e["start"], e["end"]) for e in expected_entities]
+        assert [e["score"] for e in entities] == pytest.approx([e["score"] for e in expected_entities], abs=1e-5)
@@ -0,0 +1,192 @@
+import hashlib
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from candidate_db import CandidateDB
+from ranking_state import RankingState
+from talent_finder import TalentFinderAI
+
+WORDS = "python java kubernetes aws react sql docker leadership agile scrum rust go golang data ml terraform linux".split()
+JOB = "Senior Python engineer with AWS, Kubernetes and Docker"
+
+
+def bag_of_words(texts, batch_size=32):
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in text.lower().replace(",", " ").replace(".", " ").split():
+            vectors[row, int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16) % 64] += 1.0
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+@pytest.fixture
+def finder(monkeypatch):
+    finder = TalentFinderAI(feature_cache_size=0)
+    monkeypatch.setattr(finder, "_encode_model", bag_of_words)
+    return finder
+
+
+def profiles(n, seed=0):
+    rng = random.Random(seed)
+    return {i: " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))) for i in range(n)}
+
+
+def full_ranking(finder, pool, top_k):
+    ids = sorted(pool)
+    results = finder.score_candidates(JOB, [pool[i] for i in ids])
+    order = sorted(range(len(ids)), key=lambda i: (-results[i]["overall_match_score"], ids[i]))[:top_k]
+    return [(ids[i], pytest.approx(results[i]["overall_match_score"])) for i in order]
+
+
+def ranked(results):
+    return [(result["candidate_id"], result["overall_match_score"]) for result in results]
+
+
+def test_incremental_updates_match_a_full_ranking(finder):
+    pool = profiles(300)
+    state = RankingState("job", finder.embedding_model_name, top_k=10)
+    for start in range(0, 300, 70):
+        finder.update_ranking(state, JOB, {i: pool[i] for i in range(start, min(start + 70, 300))})
+    assert ranked(state.results) == full_ranking(finder, pool, 10)
+    assert state.pool_size == 300 and state.last_candidate_id == 299
+    assert not state.needs_rebuild
+
+
+def test_edited_candidate_outside_the_top_k_can_enter_it(finder):
+    pool = profiles(200)
+    state = RankingState("job", finder.embedding_model_name, top_k=5)
+    finder.update_ranking(state, JOB, pool)
+    outsider = next(i for i in range(200) if i not in {result["candidate_id"] for result in state.results})
+    
+    pool[outsider] = JOB
+    finder.update_ranking(state, JOB, {outsider: pool[outsider]})
+    assert state.results[0]["candidate_id"] == outsider
+    assert ranked(state.results) == full_ranking(finder, pool, 5)
+    assert not state.needs_rebuild
+
+
+def test_edited_member_that_rises_keeps_the_ranking_exact(finder):
+    pool = profiles(200)
+    state = RankingState("job", finder.embedding_model_name, top_k=5)
+    finder.update_ranking(state, JOB, pool)
+    member = state.results[-1]["candidate_id"]
+    
+    pool[member] = JOB + " and SQL"
+    finder.update_ranking(state, JOB, {member: pool[member]})
+    assert not state.needs_rebuild
+    assert ranked(state.results) == full_ranking(finder, pool, 5)
+
+
+def test_edited_member_that_drops_needs_a_rebuild(finder):
+    pool = profiles(200)
+    state = RankingState("job", finder.embedding_model_name, top_k=5)
+    finder.update_ranking(state, JOB, pool)
+    member = state.results[0]["candidate_id"]
+    
+    finder.update_ranking(state, JOB, {member: "Pastry chef"})
+    assert state.needs_rebuild
+    assert RankingState.from_json(state.to_json()).needs_rebuild
+
+
+def test_chunk_pooling_is_honored(monkeypatch):
+    finder = TalentFinderAI(feature_cache_size=0, chunk_pooling="max", chunk_words=4)
+    monkeypatch.setattr(finder, "_encode_model", bag_of_words)
+    pool = profiles(60)
+    state = RankingState("job", finder.embedding_model_name, top_k=5)
+    # Precomputed whole-profile embeddings do not apply to chunk scores
+    finder.update_ranking(state, JOB, pool, embeddings={i: np.zeros(64, dtype=np.float32) for i in pool})
+    assert ranked(state.results) == full_ranking(finder, pool, 5)
+
+
+def test_state_json_round_trip():
+    state = RankingState("job", "model", top_k=2, results=[{"candidate_id": 3, "overall_match_score": 0.9}], last_candidate_id=3, pool_size=4)
+    restored = RankingState.from_json(state.to_json())
+    assert (restored.results, restored.last_candidate_id, restored.pool_size, restored.watermark) == (state.results, 3, 4, None)
+    assert state.admits(0.1, 99)
+
+
+def make_db(path, pool):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE candidates (id INTEGER PRIMARY KEY AUTOINCREMENT, searchId INTEGER, title TEXT, skills TEXT, summary TEXT)")
+    conn.executemany("INSERT INTO candidates (id, searchId, title, skills, summary) VALUES (?, 1, 'Engineer', '[]', ?)", sorted(pool.items()))
+    conn.commit()
+    return conn
+
+
+def test_rank_search_handles_additions_edits_and_deletions(finder, tmp_path):
+    path = str(tmp_path / "talentsearch.db")
+    pool = {i + 1: text for i, text in profiles(120).items()}
+    conn = make_db(path, pool)
+    db = CandidateDB(path)
+    
+    def expected():
+        return ranked(db.rank_search(finder, JOB, search_id=1, top_k=5, rebuild=True))
+    
+    first = ranked(db.rank_search(finder, JOB, search_id=1, top_k=5))
+    assert first == expected()
+    
+    # An edit outside the stored top-k that belongs in it
+    outsider = next(i for i in pool if i not in {candidate_id for candidate_id, _ in first})
+    conn.execute("UPDATE candidates SET summary = ? WHERE id = ?", (JOB, outsider))
+    conn.commit()
+    incremental = ranked(db.rank_search(finder, JOB, search_id=1, top_k=5))
+    assert incremental[0][0] == outsider
+    assert incremental == expected()
+    
+    # A new candidate, then a deleted top-k member
+    conn.execute("INSERT INTO candidates (id, searchId, title, skills, summary) VALUES (500, 1, 'Engineer', '[]', 'python aws')")
+    conn.execute("DELETE FROM candidates WHERE id = ?", (outsider,))
+    conn.commit()
+    incremental = ranked(db.rank_search(finder, JOB, search_id=1, top_k=5))
+    assert outsider not in {candidate_id for candidate_id, _ in incremental}
+    assert incremental == expected()
+    db.close()
+
+
+def test_rank_search_reads_only_changed_candidates(finder, tmp_path, monkeypatch):
+    path = str(tmp_path / "talentsearch.db")
+    pool = {i + 1: text for i, text in profiles(200).items()}
+    conn = make_db(path, pool)
+    conn.execute("ALTER TABLE candidates ADD COLUMN contacted INTEGER DEFAULT 0")
+    conn.commit()
+    db = CandidateDB(path)
+    db.rank_search(finder, JOB, search_id=1, top_k=5)
+    
+    read = []
+    profile_text = db.profile_text
+    monkeypatch.setattr(db, "profile_text", lambda row: read.append(row["id"]) or profile_text(row))
+    conn.execute("UPDATE candidates SET summary = 'rust' WHERE id = 7")
+    conn.execute("UPDATE candidates SET contacted = 1 WHERE id = 8")
+    conn.execute("INSERT INTO candidates (id, searchId, title, skills, summary) VALUES (300, 1, 'Engineer', '[]', 'go')")
+    conn.commit()
+    db.rank_search(finder, JOB, search_id=1, top_k=5)
+    assert sorted(read) == [7, 300]
+    
+    read.clear()
+    assert db.rank_search(finder, JOB, search_id=1, top_k=5) and read == []
+    assert db.conn.execute("SELECT COUNT(*) FROM candidate_changes").fetchone()[0] == 0
+    db.close()
+
+
+def test_rank_search_follows_candidates_between_searches(finder, tmp_path):
+    path = str(tmp_path / "talentsearch.db")
+    pool = {i + 1: text for i, text in profiles(100).items()}
+    conn = make_db(path, pool)
+    db = CandidateDB(path)
+    first = db.rank_search(finder, JOB, search_id=1, top_k=5)
+    
+    member = first[0]["candidate_id"]
+    conn.execute("UPDATE candidates SET searchId = 2 WHERE id = ?", (member,))
+    conn.commit()
+    moved = ranked(db.rank_search(finder, JOB, search_id=1, top_k=5))
+    assert member not in {candidate_id for candidate_id, _ in moved}
+    assert moved == ranked(db.rank_search(finder, JOB, search_id=1, top_k=5, rebuild=True))
+    
+    conn.execute("UPDATE candidates SET searchId = 1 WHERE id = ?", (member,))
+    conn.commit()
+    assert ranked(db.rank_search(finder, JOB, search_id=1, top_k=5))[0][0] == member
+    state = RankingState.from_json(db.conn.execute("SELECT state FROM candidate_rankings").fetchone()[0])
+    assert state.pool_size == 100
+    db.close()
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from sections import SECTION_WEIGHTS, chunk_profile, split_sections
+from talent_finder import TalentFinderAI
+from test_ranking import bag_of_words
+
+RESUME = """Jane Doe, Berlin
+Summary
+Backend engineer building data platforms.
+Experience:
+Senior Engineer at Acme, Python services on AWS and Kubernetes
+Engineer at Initech, Java and SQL reporting pipelines
+Built a streaming ingestion system with Kafka and Go
+Skills
+Python, Go, Kubernetes, AWS, Terraform
+Education
+"""
+
+
+def test_short_profile_is_one_chunk_with_its_headings():
+    assert chunk_profile(RESUME, max_words=200) == [("other", RESUME)]
+    assert chunk_profile("Python developer", max_words=2) == [("other", "Python developer")]
+    assert chunk_profile("") == [("other", "")]
+
+
+def test_long_profile_is_split_by_section():
+    assert split_sections(RESUME) == [
+        ("other", "Jane Doe, Berlin"),
+        ("summary", "Summary\nBackend engineer building data platforms."),
+        ("experience", "Experience:\nSenior Engineer at Acme, Python services on AWS and Kubernetes\nEngineer at Initech, Java and SQL reporting pipelines\nBuilt a streaming ingestion system with Kafka and Go"),
+        ("skills", "Skills\nPython, Go, Kubernetes, AWS, Terraform")
+    ]
+    chunks = chunk_profile(RESUME, max_words=20)
+    assert [section for section, _ in chunks] == ["other", "summary", "experience", "experience", "skills"]
+    assert chunks[2][1].startswith("Experience:\nSenior Engineer")
+
+
+@pytest.mark.parametrize("max_words", [1, 3, 8, 20])
+def test_chunks_fit_and_keep_every_word_in_order(max_words):
+    chunks = chunk_profile(RESUME, max_words=max_words)
+    assert all(len(chunk.split()) <= max_words for _, chunk in chunks)
+    # Only the trailing heading without text is left out
+    assert " ".join(chunk for _, chunk in chunks).split() == RESUME.split()[:-1]
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        chunk_profile(RESUME, max_words=0)
+
+
+def pooled_by_hand(texts, job_embedding, pooling, chunk_words):
+    scores = []
+    for text in texts:
+        chunks = chunk_profile(text, chunk_words)
+        similarities = bag_of_words([chunk for _, chunk in chunks]) @ job_embedding
+        if pooling == "max":
+            scores.append(similarities.max())
+        else:
+            weights = np.array([SECTION_WEIGHTS[section] for section, _ in chunks])
+            scores.append((similarities * weights).sum() / weights.sum())
+    return np.array(scores)
+
+
+@pytest.mark.parametrize("pooling", ["max", "weighted"])
+def test_chunk_similarities_are_pooled_per_candidate(pooling, monkeypatch):
+    finder = TalentFinderAI(feature_cache_size=0, chunk_pooling=pooling, chunk_words=12)
+    monkeypatch.setattr(finder, "_encode_model", bag_of_words)
+    texts = [RESUME, "Go developer", RESUME.replace("Python", "Rust"), "Skills\nPython, AWS, Kubernetes"]
+    job_embedding = bag_of_words(["Python engineer with AWS and Kubernetes"])[0]
+    
+    features = finder.candidate_features(texts, chunks=True)
+    assert [len(item.chunk_sections) for item in features] == [len(chunk_profile(text, 12)) for text in texts]
+    scores = finder._similarity_scores(features, job_embedding)
+    np.testing.assert_allclose(scores, pooled_by_hand(texts, job_embedding, pooling, 12), rtol=1e-5)
+    # One-chunk candidates score exactly like their whole-profile embedding
+    np.testing.assert_allclose(scores[1], bag_of_words(["Go developer"])[0] @ job_embedding, rtol=1e-5)
@@ -0,0 +1,154 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from metrics import Metrics
+from server import MAX_BODY_BYTES, TalentFinderServer
+
+
+class FakeFinder:
+    """The TalentFinderAI surface the server uses, without models."""
+    
+    COMPONENTS = ("ner", "similarity", "summarizer")
+    
+    def __init__(self):
+        self.metrics = Metrics()
+    
+    def is_loaded(self, component):
+        return False
+    
+    def warmup(self, components=None):
+        pass
+    
+    def parse_resumes(self, texts):
+        if any(not text for text in texts):
+            raise RuntimeError("model failure")
+        return [{"skills": [], "text": text} for text in texts]
+    
+    def match_candidates_to_jobs(self, pairs):
+        return [{"overall_score": 0.5} for _ in pairs]
+    
+    def match_candidate_to_job(self, candidate, job):
+        return {"overall_score": 0.5}
+    
+    def find_top_candidates(self, job, candidates, top_k=5):
+        if not candidates:
+            raise ValueError("candidate_profiles must not be empty")
+        return [{"candidate_id": i} for i in range(min(top_k, len(candidates)))]
+    
+    def summarize_profiles(self, texts, max_length=100, deterministic=False):
+        return [text[:max_length] for text in texts]
+
+
+@pytest.fixture
+def server():
+    server = TalentFinderServer(("127.0.0.1", 0), FakeFinder())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, headers=None, connection=None):
+    connection = connection or http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    data = body if isinstance(body, (bytes, type(None))) else json.dumps(body).encode("utf-8")
+    connection.request(method, path, body=data, headers=headers or {})
+    response = connection.getresponse()
+    payload = response.read()
+    return response, json.loads(payload) if response.getheader("Content-Type") == "application/json" else payload
+
+
+def raw_request(server, path, content_length):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    connection.putrequest("POST", path)
+    connection.putheader("Content-Length", content_length)
+    connection.endheaders()
+    response = connection.getresponse()
+    return response, json.loads(response.read())
+
+
+def test_health_and_ready(server):
+    response, body = request(server, "GET", "/health")
+    assert response.status == 200 and body["status"] == "ok"
+    response, body = request(server, "GET", "/ready")
+    assert response.status == 503 and body["ready"] is False
+    server.warmup_in_background().join()
+    assert request(server, "GET", "/ready")[0].status == 200
+
+
+def test_parse_single_and_batch_on_one_connection(server):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    assert request(server, "POST", "/parse", {"text": "a"}, connection=connection)[1] == {"result": {"skills": [], "text": "a"}}
+    assert len(request(server, "POST", "/parse", {"texts": ["a", "b"]}, connection=connection)[1]["results"]) == 2
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"texts": "a"}, "'texts' must be a list"),
+    ({"texts": ["a", 1]}, "'texts' must be a list of strings"),
+    ({}, "'text' must be a str")
+])
+def test_bad_request_bodies(server, body, message):
+    response, payload = request(server, "POST", "/parse", body)
+    assert response.status == 400 and payload["error"].startswith(message)
+
+
+def test_invalid_json(server):
+    response, payload = request(server, "POST", "/parse", b"{not json")
+    assert response.status == 400 and payload["error"].startswith("Invalid JSON")
+    response, payload = request(server, "POST", "/parse", b"[1, 2]")
+    assert response.status == 400
+
+
+@pytest.mark.parametrize("path, body, message", [
+    ("/top-candidates", {"job": "x", "candidates": ["a"], "top_k": 0}, "'top_k' must be a positive integer"),
+    ("/top-candidates", {"job": "x", "candidates": ["a"], "top_k": True}, "'top_k' must be a positive integer"),
+    ("/summarize", {"text": "a", "max_length": True}, "'max_length' must be a positive integer"),
+    ("/summarize", {"text": "a", "deterministic": "yes"}, "'deterministic' must be a boolean")
+])
+def test_invalid_parameters_are_bad_requests(server, path, body, message):
+    response, payload = request(server, "POST", path, body)
+    assert response.status == 400 and payload["error"] == message
+
+
+def test_errors_raised_while_serving_are_500(server):
+    # A ValueError from the model or library code is a server fault, not bad input
+    response, payload = request(server, "POST", "/top-candidates", {"job": "x", "candidates": []})
+    assert response.status == 500 and payload["error"] == "ValueError: candidate_profiles must not be empty"
+    response, payload = request(server, "POST", "/parse", {"text": ""})
+    assert response.status == 500 and payload["error"] == "RuntimeError: model failure"
+
+
+def test_unknown_paths(server):
+    assert request(server, "GET", "/nope")[0].status == 404
+    assert request(server, "POST", "/nope", {"a": 1})[0].status == 404
+
+
+@pytest.mark.parametrize("content_length", ["-1", "abc"])
+def test_malformed_content_length_is_rejected(server, content_length):
+    response, payload = raw_request(server, "/parse", content_length)
+    assert response.status == 400 and payload["error"] == "Invalid Content-Length"
+    assert response.getheader("Connection") == "close"
+    
+    response, _ = raw_request(server, "/nope", content_length)
+    assert response.status == 404
+
+
+def test_body_too_large(server):
+    response, payload = raw_request(server, "/parse", str(MAX_BODY_BYTES + 1))
+    assert response.status == 413
+
+
+def test_metrics_render_the_finders_own_aggregates(server):
+    metrics = server.finder.metrics
+    metrics.record("forward", 0.25, items=4, model="ner")
+    response, body = request(server, "GET", "/metrics")
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("text/plain")
+    assert 'talent_finder_forward_seconds_count{model="ner"} 1' in body.decode("utf-8")
+    assert len(metrics.sinks) == 1
+    
+    response, body = request(server, "GET", "/metrics.json")
+    assert body["timers"]['forward{model="ner"}']["items"] == 4
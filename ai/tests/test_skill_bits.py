@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from skill_bits import SkillBitset
+from skill_matcher import SkillTaxonomy
+
+# 130 skills, so rows span three words and the last one is partly used
+NAMES = [f"Skill{i}" for i in range(130)]
+
+
+@pytest.fixture(scope="module")
+def bitset():
+    return SkillBitset(SkillTaxonomy({name: [] for name in NAMES}))
+
+
+def test_encode_sets_one_bit_per_known_skill(bitset):
+    bits = bitset.encode(["Skill0", "Skill63", "Skill64", "Skill129", "Unknown", "Skill0"])
+    assert bits.shape == (3,) and bits.dtype == np.dtype("<u8")
+    assert [int(word) for word in bits] == [1 | 1 << 63, 1, 1 << 1]
+    assert bitset.count(bits) == 4
+
+
+def test_decode_returns_taxonomy_order(bitset):
+    assert bitset.decode(bitset.encode(["Skill129", "Skill5", "Skill70"])) == ["Skill5", "Skill70", "Skill129"]
+
+
+def test_all_zero_rows_keep_their_place(bitset):
+    skill_lists = [[], ["Skill1", "Skill100"], [], [], ["Skill64"], []]
+    bits = bitset.encode_many(skill_lists)
+    assert bits.shape == (6, 3)
+    assert list(bitset.count(bits)) == [0, 2, 0, 0, 1, 0]
+    assert bitset.decode_many(bits) == skill_lists
+    assert bitset.decode_many(np.zeros((3, 3), dtype=np.uint64)) == [[], [], []]
+
+
+def test_empty_inputs(bitset):
+    assert bitset.encode_many([]).shape == (0, 3)
+    assert bitset.decode_many(bitset.encode_many([])) == []
+    assert bitset.decode(bitset.encode([])) == []
+
+
+def test_set_operations_match_python_sets(bitset):
+    rng = np.random.default_rng(0)
+    pool = [list(rng.choice(NAMES, size=rng.integers(0, 12), replace=False)) for _ in range(200)]
+    job = list(rng.choice(NAMES, size=8, replace=False))
+    pool_bits, job_bits = bitset.encode_many(pool), bitset.encode(job)
+    
+    order = {name: index for index, name in enumerate(NAMES)}
+    matched = [sorted(set(skills) & set(job), key=order.get) for skills in pool]
+    missing = [sorted(set(job) - set(skills), key=order.get) for skills in pool]
+    assert bitset.decode_many(pool_bits & job_bits) == matched
+    assert bitset.decode_many(job_bits & ~pool_bits) == missing
+    assert list(bitset.count(pool_bits & job_bits)) == [len(skills) for skills in matched]
+
+
+def test_covers(bitset):
+    assert bitset.covers(["Skill3", "Skill129"])
+    assert not bitset.covers(["Skill3", "skill3"])
+
+
+def test_popcount_fallback_for_older_numpy(bitset, monkeypatch):
+    bits = bitset.encode_many([[], NAMES, NAMES[60:70], ["Skill129"]])
+    expected = [0, 130, 10, 1]
+    assert list(bitset.count(bits)) == expected
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert list(bitset.count(bits)) == expected
@@ -0,0 +1,53 @@
+import pytest
+
+from skill_matcher import SkillMatcher, SkillTaxonomy
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher()
+
+
+def test_aliases_map_to_canonical_names(matcher):
+    assert matcher.extract("Python3, k8s and Amazon Web Services") == ["Python", "Kubernetes", "AWS"]
+
+
+def test_word_boundaries(matcher):
+    assert matcher.extract("javascript") == ["JavaScript"]
+    assert matcher.extract("maintained gitlab pipelines") == ["GitLab"]
+    assert matcher.extract("Rustic Ruby-ish code") == ["Ruby"]
+
+
+def test_leftmost_longest(matcher):
+    assert matcher.extract("deep learning and machine learning") == ["Deep Learning", "Machine Learning"]
+    mentions = matcher.find("Google Cloud Platform")
+    assert [(m["skill"], m["text"]) for m in mentions] == [("GCP", "Google Cloud Platform")]
+
+
+def test_offsets_refer_to_the_original_text(matcher):
+    text = "İstanbul team, Node.js and Postgres"
+    for mention in matcher.find(text):
+        assert text[mention["start"]:mention["end"]] == mention["text"]
+    assert matcher.extract(text) == ["Node.js", "PostgreSQL"]
+
+
+def test_ambiguous_short_aliases_are_case_sensitive(matcher):
+    assert matcher.extract("Ready to go, go to market, maintain ai and ml systems") == []
+    assert matcher.extract("Backend in Go and golang; AI and ML research") == ["Go", "AI", "Machine Learning"]
+
+
+def test_overlapping_mentions(matcher):
+    skills = {mention["skill"] for mention in SkillMatcher(SkillTaxonomy({"Learning": ["learning"], "Deep Learning": []})).find("deep learning", overlapping=True)}
+    assert skills == {"Learning", "Deep Learning"}
+
+
+def test_custom_taxonomy():
+    taxonomy = SkillTaxonomy({"C": [{"term": "C", "case_sensitive": True}], "Kotlin": ["kt"]})
+    matcher = SkillMatcher(taxonomy)
+    assert matcher.extract("C and Kotlin (kt), see c") == ["C", "Kotlin"]
+    assert taxonomy.canonical_names == ["C", "Kotlin"]
+
+
+def test_alias_conflicts_are_rejected():
+    with pytest.raises(ValueError):
+        SkillTaxonomy({"Go": ["golang"], "Golang": ["golang"]})
@@ -0,0 +1,77 @@
+import itertools
+
+import pytest
+import torch
+
+from benchmark import StubTokenizer, install_stub_models
+from talent_finder import TalentFinderAI
+
+
+class RecordingTokenizer(StubTokenizer):
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return [" ".join(str(token) for token in row) for row in outputs.tolist()]
+
+
+class RecordingGenerator:
+    """Echoes the input ids; sampling appends a fresh token per call."""
+    
+    def __init__(self):
+        self.calls = []
+        self._samples = itertools.count(100000)
+    
+    def generate(self, input_ids, attention_mask, max_length, do_sample, num_beams=1, temperature=None):
+        self.calls.append({"rows": len(input_ids), "do_sample": do_sample, "num_beams": num_beams, "max_length": max_length})
+        outputs = input_ids
+        if do_sample:
+            outputs = torch.cat([outputs, torch.tensor([[next(self._samples)] for _ in range(len(input_ids))])], dim=1)
+        return outputs
+
+
+@pytest.fixture
+def finder():
+    finder = TalentFinderAI(feature_cache_size=0, summary_cache_size=2)
+    install_stub_models(finder)
+    finder._models["summarizer"] = {"tokenizer": RecordingTokenizer(), "model": RecordingGenerator()}
+    return finder
+
+
+def test_deterministic_summaries_are_cached_and_duplicates_generate_once(finder):
+    model = finder.summarizer_model
+    texts = ["Python engineer", "Java developer", "Python engineer"]
+    first = finder.summarize_profiles(texts, batch_size=8)
+    assert first[0] == first[2] != first[1]
+    assert [call["rows"] for call in model.calls] == [2]
+    assert model.calls[0]["do_sample"] is False
+    
+    assert finder.summarize_profiles(texts) == first
+    assert len(model.calls) == 1
+    
+    # max_length and num_beams are part of the key
+    finder.summarize_profiles(texts[:1], max_length=50)
+    finder.summarize_profiles(texts[:1], num_beams=2)
+    assert [(call["max_length"], call["num_beams"]) for call in model.calls[1:]] == [(50, 1), (100, 2)]
+
+
+def test_summary_cache_is_bounded_lru(finder):
+    model = finder.summarizer_model
+    finder.summarize_profiles(["a"])
+    finder.summarize_profiles(["b"])
+    finder.summarize_profiles(["a"])          # refreshes "a"
+    finder.summarize_profiles(["c"])          # evicts "b"
+    assert len(model.calls) == 3
+    finder.summarize_profiles(["a", "c"])
+    assert len(model.calls) == 3
+    finder.summarize_profiles(["b"])
+    assert len(model.calls) == 4
+
+
+def test_summarize_profile_samples_by_default_and_never_caches(finder):
+    model = finder.summarizer_model
+    first = finder.summarize_profile("Python engineer")
+    second = finder.summarize_profile("Python engineer")
+    assert first != second
+    assert [call["do_sample"] for call in model.calls] == [True, True]
+    assert len(finder._summary_cache) == 0
+    
+    assert finder.summarize_profile("Python engineer", deterministic=True) == finder.summarize_profile("Python engineer", deterministic=True)
+    assert len(model.calls) == 3
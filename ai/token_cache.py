@@ -0,0 +1,173 @@
+"""
+Token Cache - Bounded per-model cache of tokenizer outputs.
+
+The same resume text is tokenized by the NER windowing, the similarity
+model and the summarizer every time it is seen. TokenizationCache keeps
+one tokenizer's outputs (input ids, attention mask, and optionally
+offsets and word ids) per text hash as compact int32 arrays in a
+thread-safe LRU. Misses are tokenized together in one call, which is the
+batch path of a fast (Rust) tokenizer. pad() assembles cached encodings
+into a padded batch without tokenizing again.
+
+TalentFinderAI keeps one cache per model, each with that model's
+tokenizer settings.
+
+Usage:
+    from token_cache import TokenizationCache
+    
+    cache = TokenizationCache(tokenizer, max_entries=10000, truncation=True, max_length=256)
+    encodings = cache.encode(texts)          # one dict of arrays per text
+    batch = cache.pad(encodings)             # {"input_ids": tensor, ...}
+    cache.stats()                            # {"hits": ..., "misses": ..., ...}
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+from feature_cache import feature_key
+
+
+class TokenizationCache:
+    """
+    LRU of one tokenizer's outputs, keyed by text hash.
+    
+    Example:
+        cache = TokenizationCache(ner_tokenizer, add_special_tokens=False, return_offsets_mapping=True, word_ids=True)
+        encoding = cache.encode([text])[0]
+        encoding["offset_mapping"]   # int32 array (tokens, 2)
+        encoding["word_ids"]         # int32 array (tokens,), -1 for special tokens
+    """
+    
+    def __init__(self, tokenizer, max_entries: int = 10000, word_ids: bool = False, **tokenizer_kwargs):
+        """
+        Create a cache for one tokenizer configuration.
+        
+        Args:
+            tokenizer: Hugging Face tokenizer; a fast tokenizer is required
+                for offsets and word ids
+            max_entries: Maximum number of cached texts; 0 disables caching
+                (texts are still tokenized in one batch call)
+            word_ids: Also store each token's word index
+            **tokenizer_kwargs: Passed to every tokenizer call (e.g.
+                truncation=True, max_length=512)
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        if word_ids and not tokenizer.is_fast:
+            raise ValueError("word_ids require a fast tokenizer")
+        
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self.word_ids = word_ids
+        self.tokenizer_kwargs = tokenizer_kwargs
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def encode(self, texts: List[str]) -> List[Dict[str, np.ndarray]]:
+        """
+        Tokenize texts, reusing cached encodings.
+        
+        Args:
+            texts: Texts to tokenize
+        
+        Returns:
+            One dict per text with the tokenizer's outputs as int32 arrays.
+            The arrays are shared with the cache and must not be modified.
+        """
+        keys = [feature_key(text) for text in texts]
+        encodings = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                encoding = self._entries.get(key)
+                if encoding is not None:
+                    self._entries.move_to_end(key)
+                    encodings[i] = encoding
+        
+        missing = {}   # key -> positions; duplicate texts are tokenized once
+        for i, (key, encoding) in enumerate(zip(keys, encodings)):
+            if encoding is None:
+                missing.setdefault(key, []).append(i)
+        
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            batch = self.tokenizer([texts[i] for i in first], verbose=False, **self.tokenizer_kwargs)
+            computed = []
+            for row in range(len(first)):
+                encoding = {name: np.asarray(values[row], dtype=np.int32) for name, values in batch.items()}
+                if self.word_ids:
+                    encoding["word_ids"] = np.array([-1 if word is None else word for word in batch.word_ids(row)], dtype=np.int32)
+                computed.append(encoding)
+            
+            for (key, positions), encoding in zip(missing.items(), computed):
+                for i in positions:
+                    encodings[i] = encoding
+            
+            if self.max_entries:
+                with self._lock:
+                    for key, encoding in zip(missing, computed):
+                        self._entries[key] = encoding
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        
+        with self._lock:
+            self.hits += len(texts) - sum(len(positions) for positions in missing.values())
+            self.misses += sum(len(positions) for positions in missing.values())
+        return encodings
+    
+    def pad(self, encodings: List[Dict[str, np.ndarray]], return_tensors: str = "pt") -> Dict:
+        """
+        Pad cached encodings into one model batch.
+        
+        Args:
+            encodings: Encodings from encode()
+            return_tensors: "pt" for torch tensors, "np" for int64 arrays
+        
+        Returns:
+            {input name: (batch, longest) tensor} for the tokenizer's model
+            input names, padded on the tokenizer's padding side
+        """
+        width = max(len(encoding["input_ids"]) for encoding in encodings)
+        left = self.tokenizer.padding_side == "left"
+        batch = {}
+        for name in self.tokenizer.model_input_names:
+            if name not in encodings[0]:
+                continue
+            fill = self.tokenizer.pad_token_id if name == "input_ids" else 0
+            values = np.full((len(encodings), width), fill, dtype=np.int64)
+            for row, encoding in enumerate(encodings):
+                length = len(encoding[name])
+                if left:
+                    values[row, width - length:] = encoding[name]
+                else:
+                    values[row, :length] = encoding[name]
+            batch[name] = torch.from_numpy(values) if return_tensors == "pt" else values
+        return batch
+    
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """
+        Cache counters.
+        
+        Returns:
+            {"entries", "hits", "misses", "hit_rate"}
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }